@@ -0,0 +1,266 @@
+"""Benchmarks of GUI callbacks and plotting for different problem sizes.
+
+Run the benchmarks and store a baseline::
+
+    python benchmark.py run --output baseline.json
+
+and compare a later run against the baseline::
+
+    python benchmark.py run --output current.json --compare baseline.json
+"""
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import gc
+import json
+import platform
+import tracemalloc
+from itertools import product
+from time import perf_counter
+
+import click
+import numpy as np
+import gvar as gv
+
+from lsqfitgui import FitGUI, plot_gvar
+from lsqfitgui.backend.sidebar import process_priors
+from lsqfitgui.frontend.content import DEFAULT_PLOTS, get_figures
+from lsqfitgui.frontend.dashboard import get_layout
+from lsqfitgui.util.synthetic import make_synthetic_fit
+from lsqfitgui.version import __version__
+
+SIZES = {
+    "n_params": [3, 10, 30],
+    "n_data": [20, 200],
+    "n_keys": [1, 8],
+}
+"""Problem sizes: number of prior entries, data points per key and data keys.
+
+Fits are created by :func:`lsqfitgui.util.synthetic.make_synthetic_fit`.
+"""
+
+QUICK_SIZES = {"n_params": [3, 10], "n_data": [20], "n_keys": [1, 4]}
+"""Problem sizes for quick runs."""
+
+
+def get_prior_inputs(fit, width: float) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Return sidebar prior ids and values which set all prior widths."""
+    ids, values = [], []
+    for key, val in fit.prior.items():
+        ids += [
+            {"type": "prior", "name": f"{key}-mean"},
+            {"type": "prior", "name": f"{key}-sdev"},
+        ]
+        values += [str(gv.mean(val)), str(width)]
+    return ids, values
+
+
+def setup_update_layout_callback(fit) -> Callable[[], Any]:
+    """Benchmark the GUI callback for prior changes (refit and new layout)."""
+    gui = FitGUI(fit)
+    inputs = [get_prior_inputs(fit, width) for width in (1.5, 2.5)]
+    state = {"n": 0}
+
+    def run():
+        state["n"] += 1
+        ids, values = inputs[state["n"] % 2]
+        return gui._update_layout_callback(ids, values, [])
+
+    return run
+
+
+def setup_process_priors(fit) -> Callable[[], Any]:
+    """Benchmark the refit for new prior form values."""
+    ids, values = get_prior_inputs(fit, 1.5)
+    prior_flat = {idx["name"]: val for idx, val in zip(ids, values)}
+    return lambda: process_priors(prior_flat, fit)
+
+
+def setup_get_layout(fit) -> Callable[[], Any]:
+    """Benchmark the layout (sidebar, function documentation, figures and summary)."""
+    return lambda: get_layout(fit, plots=DEFAULT_PLOTS)
+
+
+def setup_get_figures(fit) -> Callable[[], Any]:
+    """Benchmark the default figures."""
+    return lambda: get_figures(fit, DEFAULT_PLOTS)
+
+
+def setup_plot_gvar(fit) -> Callable[[], Any]:
+    """Benchmark plotting the data with error bars."""
+    return lambda: plot_gvar(fit.x, fit.y, kind="errorbars")
+
+
+BENCHMARKS: Dict[str, Callable[[Any], Callable[[], Any]]] = {
+    "update_layout_callback": setup_update_layout_callback,
+    "process_priors": setup_process_priors,
+    "get_layout": setup_get_layout,
+    "get_figures": setup_get_figures,
+    "plot_gvar": setup_plot_gvar,
+}
+"""Functions which prepare a benchmark for a fit and return the timed function."""
+
+
+def measure(run: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Return timings in seconds and the peak memory in bytes of a function.
+
+    The peak memory is measured by ``tracemalloc`` in an additional untimed run.
+    """
+    run()  # warm up
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        run()
+        timings.append(perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median": float(np.median(timings)),
+        "min": float(np.min(timings)),
+        "max": float(np.max(timings)),
+        "peak_memory": int(peak),
+    }
+
+
+def get_case_name(benchmark: str, size: Dict[str, int]) -> str:
+    """Return the identifier of a benchmark and problem size."""
+    return benchmark + "[" + ",".join(f"{key}={val}" for key, val in size.items()) + "]"
+
+
+def run_benchmarks(
+    sizes: Dict[str, List[int]],
+    benchmarks: Optional[List[str]] = None,
+    repeat: int = 5,
+) -> Dict[str, Any]:
+    """Run benchmarks for all combinations of problem sizes.
+
+    Arguments:
+        sizes: Values of ``n_params``, ``n_data`` and ``n_keys``.
+        benchmarks: Names of the benchmarks. Runs all benchmarks if not given.
+        repeat: Number of timed runs per case.
+    """
+    results = {}
+    for values in product(*sizes.values()):
+        size = dict(zip(sizes.keys(), values))
+        fit = make_synthetic_fit(**size)
+        for name in benchmarks or BENCHMARKS:
+            case = get_case_name(name, size)
+            results[case] = {
+                "benchmark": name,
+                "size": size,
+                **measure(BENCHMARKS[name](fit), repeat),
+            }
+            click.echo(
+                f"{case:<70} {1000 * results[case]['median']:10.2f} ms"
+                f" {results[case]['peak_memory'] / 1024 ** 2:8.2f} MiB"
+            )
+    return {
+        "meta": {
+            "lsqfitgui": __version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_threshold: float = 0.2,
+    memory_threshold: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Compare median timings and peak memory of cases present in both results.
+
+    Returns one entry per case with the ratios of current over baseline values and a
+    ``regression`` flag if a ratio exceeds one plus the respective threshold.
+    """
+    comparison = []
+    for case, result in current["results"].items():
+        reference = baseline["results"].get(case)
+        if reference is None:
+            continue
+        time_ratio = result["median"] / reference["median"]
+        memory_ratio = result["peak_memory"] / max(reference["peak_memory"], 1)
+        comparison.append(
+            {
+                "case": case,
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": time_ratio > 1 + time_threshold
+                or memory_ratio > 1 + memory_threshold,
+            }
+        )
+    return comparison
+
+
+def report_comparison(comparison: List[Dict[str, Any]]) -> bool:
+    """Print the comparison and return if any case regressed."""
+    for entry in comparison:
+        flag = "REGRESSION" if entry["regression"] else ""
+        click.echo(
+            f"{entry['case']:<70} time x{entry['time_ratio']:5.2f}"
+            f" memory x{entry['memory_ratio']:5.2f} {flag}"
+        )
+    return any(entry["regression"] for entry in comparison)
+
+
+@click.group()
+def main():
+    """Benchmark lsqfitgui callbacks and plotting."""
+
+
+@main.command()
+@click.option("--output", "-o", help="JSON file which stores the results.")
+@click.option("--compare", "baseline", help="JSON baseline to compare against.")
+@click.option(
+    "--benchmark", "-b", "benchmarks", multiple=True, type=click.Choice(BENCHMARKS)
+)
+@click.option("--repeat", "-r", default=5, type=int, help="Timed runs per case.")
+@click.option("--quick", is_flag=True, help="Only run small problem sizes.")
+@click.option("--time-threshold", default=0.2, type=float)
+@click.option("--memory-threshold", default=0.2, type=float)
+def run(output, baseline, benchmarks, repeat, quick, time_threshold, memory_threshold):
+    """Run the benchmarks and optionally compare against a baseline."""
+    results = run_benchmarks(
+        QUICK_SIZES if quick else SIZES, list(benchmarks) or None, repeat=repeat
+    )
+    if output:
+        with open(output, "w") as out:
+            json.dump(results, out, indent=2)
+    if baseline:
+        with open(baseline) as inp:
+            reference = json.load(inp)
+        comparison = compare_results(
+            reference, results, time_threshold, memory_threshold
+        )
+        if report_comparison(comparison):
+            raise SystemExit(1)
+
+
+@main.command()
+@click.argument("baseline")
+@click.argument("current")
+@click.option("--time-threshold", default=0.2, type=float)
+@click.option("--memory-threshold", default=0.2, type=float)
+def compare(baseline, current, time_threshold, memory_threshold):
+    """Compare two stored results and flag regressions."""
+    with open(baseline) as inp:
+        reference = json.load(inp)
+    with open(current) as inp:
+        results = json.load(inp)
+    comparison = compare_results(reference, results, time_threshold, memory_threshold)
+    if report_comparison(comparison):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+// Track prior inputs in the browser such that only changed inputs are sent to the
+// server (see lsqfitgui.frontend.widgets.prior_delta).
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    lsqfitgui: Object.assign({}, (window.dash_clientside || {}).lsqfitgui, {
+        trackPriorChanges: function (values, sync, ids, snapshot, delta) {
+            const noUpdate = window.dash_clientside.no_update;
+            const unchanged = values.map(() => noUpdate);
+            const names = ids.map((id) => id.name);
+            const triggered = window.dash_clientside.callback_context.triggered.map(
+                (trigger) => trigger.prop_id
+            );
+            const mounted =
+                snapshot !== null &&
+                snapshot !== undefined &&
+                names.length === snapshot.names.length &&
+                names.every((name, n) => name === snapshot.names[n]);
+
+            // New inputs were mounted: they display the values of the server.
+            if (!mounted) {
+                return [unchanged, { names: names, values: values }, noUpdate];
+            }
+
+            // The server updated the values of mounted inputs.
+            if (triggered.includes("prior-sync.data") && sync) {
+                const synced = names.map((name, n) =>
+                    name in sync.values ? sync.values[name] : values[n]
+                );
+                return [synced, { names: names, values: synced }, noUpdate];
+            }
+
+            const changes = {};
+            names.forEach((name, n) => {
+                if (values[n] !== snapshot.values[n]) {
+                    changes[name] = values[n];
+                }
+            });
+            if (Object.keys(changes).length === 0) {
+                return [unchanged, noUpdate, noUpdate];
+            }
+            return [
+                unchanged,
+                { names: names, values: values },
+                { n: ((delta && delta.n) || 0) + 1, changes: changes },
+            ];
+        },
+    }),
+});
@@ -0,0 +1,639 @@
+"""Decomposition of fits into independent sub-fits."""
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Callable, Any, Sequence
+
+from collections.abc import Mapping
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+from lsqfitgui.backend.sidebar import refit_with_prior
+
+POSTERIOR_FITTER = "lsqfitgui_posterior"
+"""Name of the ``lsqfit`` fitter which evaluates fits at the start values."""
+PROBE_SHIFT = 0.1
+"""Shift of the second probe point of :func:`get_prior_dependencies` in prior widths."""
+
+
+class FitBlock(NamedTuple):
+    """Data and prior keys of an independent sub-problem of a fit."""
+
+    data_keys: Tuple[Any, ...]
+    prior_keys: Tuple[Any, ...]
+
+
+class BlockFitFunction:
+    """Fit function of a sub-fit which evaluates the full fit function.
+
+    Parameters which are not part of the sub-fit are fixed to constant values and
+    only the data keys of the sub-fit are returned.
+    The class is picklable if the full fit function is.
+    """
+
+    def __init__(
+        self, fcn: Callable, data_keys: Tuple[Any, ...], fixed: Dict[Any, Any]
+    ):
+        """Initialize the sub-fit function.
+
+        Arguments:
+            fcn: The fit function of the full fit.
+            data_keys: The data keys of the sub-fit.
+            fixed: Values of all parameters of the full fit.
+        """
+        self.fcn = fcn
+        self.data_keys = data_keys
+        self.fixed = fixed
+
+    def __call__(self, x, p):
+        """Evaluate the full fit function and return the data keys of the sub-fit."""
+        params = dict(self.fixed)
+        params.update(p)
+        out = self.fcn(x, params)
+        return {key: out[key] for key in self.data_keys}
+
+
+class FitProblem:
+    """Data, prior and fit function of a fit which is not solved yet.
+
+    Fit setup functions can return fit problems instead of fits if the GUI decomposes
+    fits into blocks (see :func:`decompose_fit`).
+    In this case, only the sub-fits of the blocks are solved and the joint fit is never
+    computed.
+
+    Example:
+        Return the problem instead of the fit::
+
+            def generate_fit(n_exp=3):
+                ...
+                return FitProblem(data=(x, y), fcn=fcn, prior=prior)
+    """
+
+    def __init__(
+        self, data: Tuple[Any, Any], fcn: Callable, prior: gv.BufferDict, **kwargs
+    ):
+        """Initialize the fit problem.
+
+        Arguments:
+            data: Tuple of independent and dependent data. The dependent data must be
+                a dictionary of gvars.
+            fcn: The fit function.
+            prior: The prior.
+            **kwargs: Further arguments passed to ``lsqfit.nonlinear_fit`` for each sub-fit.
+        """
+        self.x, y = data
+        self.y = gv.BufferDict(y)
+        self.data = (self.x, self.y)
+        self.fcn = fcn
+        self.prior = gv.BufferDict(prior)
+        self.kwargs = kwargs
+
+    def fit(self) -> nonlinear_fit:
+        """Solve the joint fit."""
+        return nonlinear_fit(
+            data=self.data, fcn=self.fcn, prior=self.prior, **self.kwargs
+        )
+
+
+class PosteriorFitter:
+    """Fitter which does not minimize but evaluates the fit at the start values.
+
+    The fitter is registered in ``lsqfit.nonlinear_fit.FITTERS`` as
+    :data:`POSTERIOR_FITTER` only while sub-fits are seeded (see :func:`seed_blocks`).
+    Fits with this fitter provide the posterior (covariance from the Jacobian), the
+    ``chi2`` and the ``logGBF`` at ``p0``, e.g., for sub-fits seeded with the posterior
+    of a joint fit which already minimizes them.
+    """
+
+    def __init__(self, x0, n, f, tol=1e-8, maxit=0, **kwargs):
+        """Evaluate the whitened residuals `f` and their Jacobian at `x0`."""
+        fx = f(gv.valder(np.zeros(len(x0))) + x0)
+        self.x = np.array(x0, dtype=float)
+        self.f = f(self.x)
+        self.J = np.array([val.der for val in fx])
+        self.cov = np.linalg.pinv(self.J.T.dot(self.J), hermitian=True)
+        self.nit = 0
+        self.tol = tol
+        self.maxit = maxit
+        self.error = None
+        self.stopping_criterion = 0
+        self.results = None
+        self.description = "posterior of the joint fit"
+
+
+_POSTERIOR_FITTER_LOCK = Lock()
+
+
+@contextmanager
+def _use_posterior_fitter():
+    """Register the :class:`PosteriorFitter` in ``lsqfit`` within the context."""
+    with _POSTERIOR_FITTER_LOCK:
+        nonlinear_fit.FITTERS[POSTERIOR_FITTER] = PosteriorFitter
+        try:
+            yield
+        finally:
+            del nonlinear_fit.FITTERS[POSTERIOR_FITTER]
+
+
+def _find_root(parents: Dict[Any, Any], node: Any) -> Any:
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+    return node
+
+
+def _get_single_block(fit: nonlinear_fit) -> FitBlock:
+    return FitBlock(
+        data_keys=tuple(fit.y.keys()) if hasattr(fit.y, "keys") else (),
+        prior_keys=tuple(fit.prior.keys()) if hasattr(fit.prior, "keys") else (),
+    )
+
+
+def _get_reference_mean(fit: nonlinear_fit) -> gv.BufferDict:
+    """Return the posterior mean of fits and the prior mean of fit problems."""
+    palt = getattr(fit, "palt", None)
+    buf = gv.mean((fit.prior if palt is None else palt).buf)
+    return gv.BufferDict(fit.prior, buf=buf)
+
+
+def _get_fit_settings(fit: nonlinear_fit) -> Dict[str, Any]:
+    if isinstance(fit, FitProblem):
+        return dict(fit.kwargs)
+    return {"svdcut": fit.svdcut, "eps": fit.eps}
+
+
+def _get_correlated_data_keys(y: gv.BufferDict) -> List[Set[Any]]:
+    """Return sets of data keys which contain correlated data."""
+    data_keys = [key for key in y.keys() for _ in range(np.size(y[key]))]
+    return [
+        {data_keys[i] for i in idx}
+        for idx, _ in gv.evalcov_blocks(y.buf, compress=True)[1:]
+    ]
+
+
+def _get_probe_points(fit: nonlinear_fit) -> List[gv.BufferDict]:
+    pmean = _get_reference_mean(fit)
+    shifted = pmean.buf + PROBE_SHIFT * gv.sdev(fit.prior.buf)
+    return [pmean, gv.BufferDict(pmean, buf=shifted)]
+
+
+def get_prior_dependencies(fit: nonlinear_fit) -> Optional[Dict[Any, Set[Any]]]:
+    """Return the prior keys every data key of the fit depends on.
+
+    Dependencies are determined by evaluating the fit function where every parameter
+    is replaced by an independent gvar.
+    The function is probed at the posterior mean (prior mean for :class:`FitProblem`)
+    and at this mean shifted by :data:`PROBE_SHIFT` prior widths, such that
+    derivatives which vanish at a single point (e.g., ``a * b`` at ``b = 0``) do not
+    hide dependencies.
+    Dependencies with vanishing derivatives at both points are not detected.
+    Returns ``None`` if data, prior or fit function output are not dictionaries.
+    """
+    if not isinstance(fit.y, gv.BufferDict) or not isinstance(fit.prior, gv.BufferDict):
+        return None
+
+    dependencies = {key: set() for key in fit.y.keys()}
+    for pmean in _get_probe_points(fit):
+        probe = gv.BufferDict(pmean, buf=gv.gvar(pmean.buf, np.ones(pmean.buf.size)))
+        index_to_key = {}
+        for key in probe.keys():
+            for par in np.ravel(probe.buf[probe.slice(key)]):
+                index_to_key[par.internaldata[1].indices()[0]] = key
+
+        out = fit.fcn(fit.x, probe)
+        if not hasattr(out, "keys"):
+            return None
+
+        for key in fit.y.keys():
+            dependencies[key].update(
+                index_to_key[idx]
+                for val in np.ravel(out[key])
+                if isinstance(val, gv.GVar)
+                for idx in val.internaldata[1].indices()
+                if idx in index_to_key
+            )
+    return dependencies
+
+
+def get_fit_blocks(fit: nonlinear_fit) -> List[FitBlock]:
+    """Decompose the fit into blocks of independent data and prior keys.
+
+    Two keys belong to the same block if a data key depends on a prior key through
+    the fit function or if two data keys are correlated.
+    Prior keys are assumed to be uncorrelated.
+    Returns a single block containing all keys if the fit can not be decomposed,
+    e.g., if the data is not a dictionary or a prior key does not enter the fit function.
+    """
+    dependencies = get_prior_dependencies(fit)
+    if dependencies is None:
+        return [_get_single_block(fit)]
+
+    nodes = [("data", key) for key in fit.y.keys()] + [
+        ("prior", key) for key in fit.prior.keys()
+    ]
+    parents = {node: node for node in nodes}
+
+    def union(node1, node2):
+        parents[_find_root(parents, node1)] = _find_root(parents, node2)
+
+    for key, prior_keys in dependencies.items():
+        for prior_key in prior_keys:
+            union(("data", key), ("prior", prior_key))
+
+    for keys in _get_correlated_data_keys(fit.y):
+        first, *others = keys
+        for key in others:
+            union(("data", key), ("data", first))
+
+    groups = {}
+    for node in nodes:
+        groups.setdefault(_find_root(parents, node), []).append(node)
+
+    blocks = [
+        FitBlock(
+            data_keys=tuple(key for kind, key in group if kind == "data"),
+            prior_keys=tuple(key for kind, key in group if kind == "prior"),
+        )
+        for group in groups.values()
+    ]
+    if any(not block.data_keys or not block.prior_keys for block in blocks):
+        return [_get_single_block(fit)]
+    return blocks
+
+
+def get_blocks_from_groups(
+    fit: nonlinear_fit, groups: Sequence[Sequence[Any]]
+) -> List[FitBlock]:
+    """Create blocks from groups of data keys.
+
+    The prior keys of each block are the prior keys its data depends on.
+
+    Arguments:
+        fit: The fit (or :class:`FitProblem`).
+        groups: Groups of data keys. Each data key must be in exactly one group.
+
+    Raises:
+        ValueError: If groups do not cover all data keys, share prior keys or
+            contain correlated data, or if the fit can not be decomposed.
+    """
+    dependencies = get_prior_dependencies(fit)
+    if dependencies is None:
+        raise ValueError(
+            "Fits can only be decomposed if data, prior and fit function output"
+            " are dictionaries."
+        )
+
+    group_of_key = {key: n for n, group in enumerate(groups) for key in group}
+    if sorted(map(str, group_of_key)) != sorted(map(str, fit.y.keys())) or sum(
+        map(len, groups)
+    ) != len(fit.y):
+        raise ValueError("Each data key must be in exactly one group.")
+    for keys in _get_correlated_data_keys(fit.y):
+        if len({group_of_key[key] for key in keys}) > 1:
+            raise ValueError(
+                f"Correlated data keys {sorted(keys)} are in different groups."
+            )
+
+    group_of_prior_key = {}
+    for data_key, prior_keys in dependencies.items():
+        for key in prior_keys:
+            if (
+                group_of_prior_key.setdefault(key, group_of_key[data_key])
+                != group_of_key[data_key]
+            ):
+                raise ValueError(f"Prior key {key!r} is shared by multiple groups.")
+    if len(group_of_prior_key) != len(fit.prior):
+        raise ValueError("Each prior key must enter the fit function.")
+
+    return [
+        FitBlock(
+            data_keys=tuple(group),
+            prior_keys=tuple(
+                key for key in fit.prior.keys() if group_of_prior_key[key] == n
+            ),
+        )
+        for n, group in enumerate(groups)
+    ]
+
+
+def get_block_fit_kwargs(
+    fit: nonlinear_fit, block: FitBlock, prior: gv.BufferDict, **kwargs
+) -> Dict[str, Any]:
+    """Return the ``lsqfit.nonlinear_fit`` arguments of the sub-fit of a block.
+
+    Parameters of other blocks are fixed to the posterior mean of the fit
+    (prior mean for :class:`FitProblem`).
+
+    Arguments:
+        fit: The full fit (or :class:`FitProblem`) which provides data and fit function.
+        block: The block which specifies the data and prior keys of the sub-fit.
+        prior: A prior which contains (at least) the prior keys of the block.
+        **kwargs: Further arguments passed to ``lsqfit.nonlinear_fit``.
+    """
+    y = gv.BufferDict([(key, fit.y[key]) for key in block.data_keys])
+    sub_prior = gv.BufferDict([(key, prior[key]) for key in block.prior_keys])
+    fcn = BlockFitFunction(fit.fcn, block.data_keys, _get_reference_mean(fit))
+    for key, val in _get_fit_settings(fit).items():
+        kwargs.setdefault(key, val)
+    if isinstance(kwargs.get("p0"), Mapping):
+        kwargs["p0"] = {
+            key: kwargs["p0"][key] for key in block.prior_keys if key in kwargs["p0"]
+        }
+    return dict(data=(fit.x, y), fcn=fcn, prior=sub_prior, **kwargs)
+
+
+def fit_block(
+    fit: nonlinear_fit, block: FitBlock, prior: gv.BufferDict, **kwargs
+) -> nonlinear_fit:
+    """Fit the data of a block of the fit using the prior entries of the block.
+
+    See :func:`get_block_fit_kwargs` for the arguments.
+    """
+    return nonlinear_fit(**get_block_fit_kwargs(fit, block, prior, **kwargs))
+
+
+def _dump_fit_from_kwargs(payload: bytes) -> bytes:
+    return gv.dumps(nonlinear_fit(**gv.loads(payload)))
+
+
+def run_fits(
+    fit_kwargs: List[Dict[str, Any]], pool: Optional[Executor] = None
+) -> List[nonlinear_fit]:
+    """Run fits for a list of ``lsqfit.nonlinear_fit`` arguments.
+
+    Arguments:
+        fit_kwargs: The arguments of the fits.
+        pool: Executor which runs the fits, e.g., a ``ProcessPoolExecutor``.
+            Arguments and fits are pickled by ``gvar.dumps``; thus, the fit function
+            must be picklable. Fits run one after another in the current process if ``None``.
+    """
+    if pool is None:
+        return [nonlinear_fit(**kwargs) for kwargs in fit_kwargs]
+    futures = [
+        pool.submit(_dump_fit_from_kwargs, gv.dumps(kwargs)) for kwargs in fit_kwargs
+    ]
+    return [gv.loads(future.result()) for future in futures]
+
+
+class BlockFit(nonlinear_fit):
+    """Combination of independent sub-fits into the result of the full fit.
+
+    The object provides the attributes of the full fit used by the GUI
+    (e.g., ``p``, ``cov``, ``chi2``, ``fcn`` and ``data``) and can be used like
+    the full fit for plots.
+    The ``chi2``, ``dof`` and ``logGBF`` values are the sums over all sub-fits and
+    the posterior covariance is block diagonal.
+    """
+
+    def __init__(
+        self, fit: nonlinear_fit, blocks: List[FitBlock], subfits: List[nonlinear_fit]
+    ):
+        """Combine the sub-fits.
+
+        Arguments:
+            fit: The full fit which provides data, fit function and prior order.
+            blocks: The blocks of the full fit.
+            subfits: The fits of the blocks (same order as `blocks`).
+        """
+        self.blocks = blocks
+        """The blocks of data and prior keys."""
+        self.subfits = subfits
+        """The sub-fits of the blocks."""
+
+        self.fcn = fit.fcn
+        self.x = fit.x
+        self.y = fit.y
+        self.data = fit.data
+        for attr in ["models", "meta"]:
+            if hasattr(fit, attr):
+                setattr(self, attr, getattr(fit, attr))
+
+        block_of_key = {
+            key: subfit
+            for block, subfit in zip(blocks, subfits)
+            for key in block.prior_keys
+        }
+        keys = list(fit.prior.keys())
+        self.prior = gv.BufferDict(
+            [(key, block_of_key[key].prior[key]) for key in keys]
+        )
+        self.palt = gv.BufferDict([(key, block_of_key[key].palt[key]) for key in keys])
+        self._p = gv.BufferDict([(key, block_of_key[key].p[key]) for key in keys])
+        self.pmean = gv.mean(self.palt)
+        self.psdev = gv.sdev(self.palt)
+        self.p0 = self.pmean
+
+        self.cov = np.zeros((self.palt.buf.size, self.palt.buf.size))
+        for block, subfit in zip(blocks, subfits):
+            idx = np.concatenate(
+                [
+                    np.arange(self.palt.buf.size)[self.palt.slice(key)].ravel()
+                    for key in block.prior_keys
+                ]
+            )
+            self.cov[np.ix_(idx, idx)] = subfit.cov
+
+        self.chi2 = sum(subfit.chi2 for subfit in subfits)
+        self.dof = sum(subfit.dof for subfit in subfits)
+        self.Q = gv.gammaQ(self.dof / 2.0, self.chi2 / 2.0)
+        self.logGBF = (
+            None
+            if any(subfit.logGBF is None for subfit in subfits)
+            else sum(subfit.logGBF for subfit in subfits)
+        )
+        self.residuals = np.concatenate([subfit.residuals for subfit in subfits])
+        self.nit = max(subfit.nit for subfit in subfits)
+        self.time = sum(subfit.time for subfit in subfits)
+        self.svdn = sum(subfit.svdn for subfit in subfits)
+        self.error = None
+        self.description = ""
+
+        reference = subfits[0]
+        for attr in [
+            "svdcut",
+            "eps",
+            "noise",
+            "tol",
+            "maxit",
+            "fitter",
+            "fitterargs",
+            "stopping_criterion",
+            "linear",
+            "correction",
+            "nblocks",
+        ]:
+            setattr(self, attr, getattr(reference, attr, None))
+
+        # attributes which gvar.dumps removes from nonlinear_fit objects
+        self._chiv = self._chivw = self.pdf = self.dchi2 = None
+        self.yp_pdf = None
+
+
+def refit_blocks(
+    prior: gv.BufferDict, fit: nonlinear_fit, warm_start: bool = False
+) -> nonlinear_fit:
+    """Refit only the independent blocks of the fit which are affected by a new prior.
+
+    The first call decomposes the fit into blocks (see :func:`get_fit_blocks`) and
+    returns a :class:`BlockFit`.
+    Sub-fits of blocks without prior changes are not minimized but seeded with the
+    posterior of the joint fit (see :func:`seed_blocks`), and are reused by later
+    calls on the returned :class:`BlockFit`.
+    Fits which can not be decomposed are refitted as a whole; the refit remembers its
+    single block in the ``blocks`` attribute such that later calls on it do not
+    decompose the fit again.
+
+    Arguments:
+        prior: The new prior.
+        fit: The fit which provides data and fit function.
+        warm_start: Seed refits of affected blocks with the posterior and optimizer
+            state of their previous sub-fit.
+    """
+    if isinstance(fit, BlockFit):
+        blocks, subfits = fit.blocks, list(fit.subfits)
+    else:
+        blocks = getattr(fit, "blocks", None) or get_fit_blocks(fit)
+        if set(prior.keys()) != set(fit.prior.keys()):
+            return refit_with_prior(prior, fit, warm_start=warm_start)
+        if len(blocks) < 2:
+            new_fit = refit_with_prior(prior, fit, warm_start=warm_start)
+            new_fit.blocks = blocks
+            return new_fit
+        subfits = None
+
+    changed = {
+        key
+        for key in fit.prior.keys()
+        if np.any(gv.mean(prior[key]) != gv.mean(fit.prior[key]))
+        or np.any(gv.sdev(prior[key]) != gv.sdev(fit.prior[key]))
+    }
+    affected = [
+        n for n, block in enumerate(blocks) if changed.intersection(block.prior_keys)
+    ]
+    if subfits is None:
+        unaffected = [n for n in range(len(blocks)) if n not in affected]
+        seeds = seed_blocks(fit, [blocks[n] for n in unaffected])
+        subfits = [None] * len(blocks)
+        for n, seed in zip(unaffected, seeds):
+            subfits[n] = seed
+        for n in affected:
+            subfits[n] = fit_block(fit, blocks[n], prior, p0=_get_reference_mean(fit))
+    else:
+        for n in affected:
+            keys = blocks[n].prior_keys
+            sub_prior = gv.BufferDict([(key, prior[key]) for key in keys])
+            subfits[n] = refit_with_prior(sub_prior, subfits[n], warm_start=warm_start)
+
+    return BlockFit(fit, blocks, subfits)
+
+
+def fit_blocks(
+    fit: nonlinear_fit,
+    blocks: List[FitBlock],
+    prior: gv.BufferDict,
+    pool: Optional[Executor] = None,
+    warm_start: bool = False,
+) -> List[nonlinear_fit]:
+    """Fit all blocks of the fit.
+
+    Arguments:
+        fit: The full fit (or :class:`FitProblem`) which provides data and fit function.
+        blocks: The blocks of the fit.
+        prior: The prior of the full fit.
+        pool: Executor which runs the sub-fits (see :func:`run_fits`).
+        warm_start: Start sub-fits from the posterior mean of the full fit.
+    """
+    kwargs = {"p0": _get_reference_mean(fit)} if warm_start else {}
+    return run_fits(
+        [get_block_fit_kwargs(fit, block, prior, **kwargs) for block in blocks],
+        pool=pool,
+    )
+
+
+def seed_blocks(fit: nonlinear_fit, blocks: List[FitBlock]) -> List[nonlinear_fit]:
+    """Create sub-fits of blocks from the posterior of the joint fit without fitting.
+
+    The sub-fits are evaluated at the posterior mean of the joint fit with the
+    :class:`PosteriorFitter`, which agrees with fitted sub-fits since blocks are
+    independent.
+    Refits of the sub-fits (see :func:`lsqfitgui.backend.sidebar.refit_with_prior`)
+    use the fitter of the joint fit.
+
+    Arguments:
+        fit: The solved joint fit.
+        blocks: The blocks of the fit.
+    """
+    kwargs = {"p0": _get_reference_mean(fit), "fitter": POSTERIOR_FITTER}
+    with _use_posterior_fitter():
+        subfits = run_fits(
+            [get_block_fit_kwargs(fit, block, fit.prior, **kwargs) for block in blocks]
+        )
+    for subfit in subfits:
+        subfit.fitter = fit.fitter
+    return subfits
+
+
+def decompose_fit(
+    fit: nonlinear_fit,
+    groups: Optional[Sequence[Sequence[Any]]] = None,
+    pool: Optional[Executor] = None,
+) -> nonlinear_fit:
+    """Solve the fit as independent sub-fits and combine them into a :class:`BlockFit`.
+
+    Fits which are already solved seed the sub-fits with their posterior.
+    Fits which can not be decomposed are returned as they are
+    (fit problems are solved as a whole).
+
+    Arguments:
+        fit: The fit or :class:`FitProblem`.
+        groups: Groups of data keys which define the blocks (see
+            :func:`get_blocks_from_groups`). Detected automatically if ``None``
+            (see :func:`get_fit_blocks`).
+        pool: Executor which runs the sub-fits (see :func:`run_fits`).
+    """
+    if isinstance(fit, BlockFit):
+        return fit
+    blocks = (
+        get_fit_blocks(fit) if groups is None else get_blocks_from_groups(fit, groups)
+    )
+    if len(blocks) < 2:
+        return fit.fit() if isinstance(fit, FitProblem) else fit
+    warm_start = not isinstance(fit, FitProblem)
+    subfits = fit_blocks(fit, blocks, fit.prior, pool=pool, warm_start=warm_start)
+    return BlockFit(fit, blocks, subfits)
+
+
+class DecomposedFitSetup:
+    """Wrapper decomposing the fits returned by a fit setup function.
+
+    See :func:`decompose_fit`.
+    If the fit setup function returns a :class:`FitProblem`, the joint fit is never
+    solved.
+    """
+
+    def __init__(
+        self,
+        fit_setup_function: Callable,
+        groups: Optional[Sequence[Sequence[Any]]] = None,
+        pool: Optional[Executor] = None,
+    ):
+        """Initialize the wrapper.
+
+        Arguments:
+            fit_setup_function: Function which returns a non-linear fit object
+                or :class:`FitProblem`.
+            groups: Groups of data keys which define the blocks.
+                Detected automatically if ``None``.
+            pool: Executor which runs the sub-fits.
+        """
+        self.fit_setup_function = fit_setup_function
+        self.groups = groups
+        self.pool = pool
+
+    def __call__(self, **kwargs) -> nonlinear_fit:
+        """Run the fit setup function and decompose the returned fit."""
+        return decompose_fit(
+            self.fit_setup_function(**kwargs), groups=self.groups, pool=self.pool
+        )
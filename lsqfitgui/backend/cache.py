@@ -0,0 +1,183 @@
+"""Caching of fit objects for repeated GUI states."""
+from typing import Optional, Dict, Any, Callable, Hashable
+
+import hashlib
+from collections import OrderedDict
+from threading import RLock
+
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+
+def get_function_identity(fcn: Optional[Callable]) -> str:
+    """Return a string which identifies a function within the current process."""
+    if fcn is None:
+        return "None"
+    name = getattr(fcn, "__qualname__", None) or getattr(fcn, "__name__", None)
+    return f"{getattr(fcn, '__module__', None)}.{name}@{id(fcn)}"
+
+
+def get_fit_fingerprint(
+    setup: Optional[Dict[str, Any]] = None,
+    prior: Optional[gv.BufferDict] = None,
+    fcn: Optional[Callable] = None,
+) -> str:
+    """Compute a hash which identifies a fit by its meta setup, prior and function.
+
+    Arguments:
+        setup: The meta setup (``fit_setup_kwargs``) of the fit.
+        prior: The prior of the fit. Only means, standard deviations and the
+            structure (keys and shapes) enter the fingerprint.
+        fcn: The function which generates the fit (fit function or fit setup function).
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(repr(sorted((setup or {}).items(), key=str)).encode())
+    if prior is not None:
+        prior = gv.BufferDict(prior)
+        structure = [(key, np.shape(val)) for key, val in prior.items()]
+        fingerprint.update(repr(structure).encode())
+        fingerprint.update(np.ascontiguousarray(gv.mean(prior.buf), dtype=float))
+        fingerprint.update(np.ascontiguousarray(gv.sdev(prior.buf), dtype=float))
+    fingerprint.update(get_function_identity(fcn).encode())
+    return fingerprint.hexdigest()
+
+
+def estimate_fit_memory(fit: nonlinear_fit) -> int:
+    """Estimate the memory footprint of a fit object in bytes.
+
+    Counts the numpy arrays stored on the fit and the derivatives of the posterior
+    with respect to the data and prior (a value and an index per entry).
+    """
+    nbytes = sum(
+        val.nbytes for val in vars(fit).values() if isinstance(val, np.ndarray)
+    )
+    n_params = np.size(fit.pmean.buf if hasattr(fit.pmean, "buf") else fit.pmean)
+    n_primary = np.size(fit.y.buf if hasattr(fit.y, "buf") else fit.y)
+    if fit.prior is not None:
+        n_primary += n_params
+    return int(nbytes + 16 * n_params * n_primary)
+
+
+class FitCache:
+    """Bounded cache of fit objects with least-recently-used eviction.
+
+    Entries are evicted once either the number of entries exceeds `max_size` or
+    the estimated memory of all entries exceeds `max_memory`.
+    The most recently added fit is always kept.
+    The cache can be shared between threads.
+
+    Example:
+        Store and look up fits by fingerprint::
+
+            cache = FitCache(max_size=16, max_memory=500 * 1024 ** 2)
+            key = get_fit_fingerprint(setup={"n_exp": 3}, prior=fit.prior, fcn=fit.fcn)
+            cache[key] = fit
+            assert cache.get(key) is fit
+    """
+
+    def __init__(self, max_size: int = 32, max_memory: Optional[int] = None):
+        """Initialize the cache.
+
+        Arguments:
+            max_size: Maximal number of stored fits.
+            max_memory: Maximal estimated memory of stored fits in bytes.
+                No limit if ``None``.
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be at least one.")
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.hits = 0
+        """Number of successful lookups."""
+        self.misses = 0
+        """Number of unsuccessful lookups."""
+        self.evictions = 0
+        """Number of entries removed because of the size or memory limits."""
+        self.totals = {"hits": 0, "misses": 0, "evictions": 0}
+        """Counters since the creation of the cache, which :meth:`clear` keeps."""
+        self._fits = OrderedDict()
+        self._memory = {}
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        """Return number of stored fits."""
+        return len(self._fits)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if key is stored without changing the order or counters."""
+        return key in self._fits
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[nonlinear_fit]:
+        """Look up fit and mark it as most recently used."""
+        with self._lock:
+            if key in self._fits:
+                self.hits += 1
+                self.totals["hits"] += 1
+                self._fits.move_to_end(key)
+                return self._fits[key]
+            self.misses += 1
+            self.totals["misses"] += 1
+            return default
+
+    def __setitem__(self, key: Hashable, fit: nonlinear_fit):
+        """Store fit and evict least recently used fits if needed."""
+        memory = estimate_fit_memory(fit)
+        with self._lock:
+            self._fits[key] = fit
+            self._fits.move_to_end(key)
+            self._memory[key] = memory
+            while len(self._fits) > 1 and (
+                len(self._fits) > self.max_size
+                or (self.max_memory is not None and self.memory > self.max_memory)
+            ):
+                old_key, _ = self._fits.popitem(last=False)
+                self._memory.pop(old_key)
+                self.evictions += 1
+                self.totals["evictions"] += 1
+
+    @property
+    def memory(self) -> int:
+        """Return the estimated memory of all stored fits in bytes."""
+        with self._lock:
+            return sum(self._memory.values())
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of hits over all lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters and sizes of the cache."""
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "memory": self.memory,
+            "max_memory": self.max_memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            **{f"total_{key}": val for key, val in self.totals.items()},
+        }
+
+    def clear(self):
+        """Remove all fits and reset counters (except for :attr:`totals`)."""
+        with self._lock:
+            self._fits.clear()
+            self._memory.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+def cache_fit_by_prior(
+    fit_cache: FitCache, fit: nonlinear_fit, setup: Optional[Dict[str, Any]] = None
+):
+    """Store fit in cache such that prior updates resetting to its prior find it.
+
+    Arguments:
+        fit_cache: The cache.
+        fit: The fit.
+        setup: The values of the meta form elements (not the full fit setup kwargs).
+    """
+    fit_cache[get_fit_fingerprint(setup=setup, prior=fit.prior, fcn=fit.fcn)] = fit
@@ -0,0 +1,128 @@
+"""Background execution of fits."""
+from typing import Callable, Optional, Tuple, Any
+
+import pickle
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from threading import Lock
+
+from gvar import dumps, loads
+from lsqfit import nonlinear_fit
+
+
+class LatestTaskExecutor:
+    """Run tasks in a background thread where newer tasks supersede older ones.
+
+    Tasks are executed one after another.
+    Submitting a new task cancels the previously submitted task if it did not start yet;
+    results of superseded tasks which are already running are discarded.
+    Thus, only the latest submitted state is guaranteed to be computed.
+
+    Example:
+        Submit tasks and poll for the latest result::
+
+            executor = LatestTaskExecutor()
+            executor.submit(fit_function, prior_1)
+            executor.submit(fit_function, prior_2)  # cancels prior_1 if not started
+            done, result, error = executor.poll()
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """Initialize the thread pool."""
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lsqfitgui"
+        )
+        self._future: Optional[Future] = None
+        self._lock = Lock()
+        self.n_submitted = 0
+        """Number of submitted tasks."""
+        self.n_cancelled = 0
+        """Number of superseded tasks which were cancelled before they started."""
+
+    def submit(self, fcn: Callable, *args, **kwargs) -> Future:
+        """Submit a new task and cancel the previous one if it is still pending."""
+        with self._lock:
+            if self._future is not None and self._future.cancel():
+                self.n_cancelled += 1
+            self._future = self._pool.submit(fcn, *args, **kwargs)
+            self.n_submitted += 1
+            return self._future
+
+    @property
+    def busy(self) -> bool:
+        """Return if the latest task is pending or running."""
+        return self._future is not None and not self._future.done()
+
+    def poll(self) -> Tuple[bool, Any, Optional[BaseException]]:
+        """Return if the latest task finished, its result and its exception."""
+        future = self._future
+        if future is None or not future.done():
+            return False, None, None
+        exception = future.exception()
+        return True, None if exception else future.result(), exception
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the thread pool."""
+        self._pool.shutdown(wait=wait)
+
+
+def _dump_fit_from_setup(fit_setup_function: Callable, kwargs) -> bytes:
+    fit = fit_setup_function(**kwargs)
+    try:
+        pickle.dumps(fit.fcn)
+    except Exception as error:
+        raise ValueError(
+            "The fit function must be picklable to run the fit setup in a process pool."
+        ) from error
+    return dumps(fit)
+
+
+class ProcessFitSetup:
+    """Wrapper running a fit setup function in a pool of worker processes.
+
+    The fit is created in a worker process and returned to the calling process
+    pickled by ``gvar.dumps``.
+    Thus, the fit setup function, its keyword arguments and the fit function of the
+    returned fit must be picklable (e.g., defined on module level).
+    Calls from different threads run in parallel on different processes.
+
+    Example:
+        Run the fit setup in two worker processes::
+
+            fit_setup_function = ProcessFitSetup(generate_fit, max_workers=2)
+            fit = fit_setup_function(n_exp=3)
+    """
+
+    def __init__(self, fit_setup_function: Callable, max_workers: Optional[int] = None):
+        """Initialize the process pool.
+
+        Arguments:
+            fit_setup_function: Function which returns a non-linear fit object.
+            max_workers: Number of worker processes. Defaults to the number of CPUs.
+        """
+        self.fit_setup_function = fit_setup_function
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = Lock()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Return the process pool which is started on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def submit(self, **kwargs) -> Future:
+        """Submit the fit setup to the pool and return the future of the pickled fit."""
+        return self.pool.submit(_dump_fit_from_setup, self.fit_setup_function, kwargs)
+
+    def __call__(self, **kwargs) -> nonlinear_fit:
+        """Run the fit setup function in a worker process and return the fit."""
+        return loads(self.submit(**kwargs).result())
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the process pool."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
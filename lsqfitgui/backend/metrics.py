@@ -0,0 +1,282 @@
+"""Server metrics in the Prometheus text format."""
+from typing import Optional, Callable, Dict, List, Tuple
+
+import os
+import re
+import sys
+import json
+from collections import defaultdict
+from threading import Lock
+from time import monotonic
+
+from flask import Flask, Response, request
+
+from lsqfitgui.backend.cache import FitCache
+from lsqfitgui.util.timing import StageTimer
+
+CALLBACK_PATH = "/_dash-update-component"
+FIT_STAGES = ("refit", "fit setup")
+OUTPUT_PREFIX_BYTES = 1 << 16
+"""Number of bytes at the start of callback requests searched for the output id."""
+
+_OUTPUT_PATTERN = re.compile(rb'"output"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+
+def get_process_memory() -> Optional[int]:
+    """Return the resident memory of the current process in bytes.
+
+    Returns the peak resident memory if the current value is not available and
+    ``None`` if neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as inp:
+            return int(inp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def get_callback_output(body: bytes) -> str:
+    """Return the output id of a Dash callback request body without parsing it.
+
+    The renderer sends the output id as the first item of the body; thus, only the
+    first :data:`OUTPUT_PREFIX_BYTES` are searched. Returns ``"unknown"`` if the id
+    is not found.
+    """
+    match = _OUTPUT_PATTERN.search(body[:OUTPUT_PREFIX_BYTES])
+    if match is None:
+        return "unknown"
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return "unknown"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_metric(
+    name: str,
+    kind: str,
+    description: str,
+    samples: List[Tuple[Dict[str, str], float]],
+) -> List[str]:
+    """Format samples of a metric.
+
+    Labels may contain the item ``"__suffix__"`` which is appended to the sample name
+    (e.g., ``"_sum"`` and ``"_count"`` of summaries).
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        labels = dict(labels)
+        suffix = labels.pop("__suffix__", "")
+        label_str = ",".join(
+            f'{key}="{_escape(str(val))}"' for key, val in labels.items()
+        )
+        lines.append(
+            f"{name}{suffix}" + (f"{{{label_str}}}" if label_str else "") + f" {value}"
+        )
+    return lines
+
+
+def _get_summary_samples(
+    values: Dict[str, List[float]], label: str
+) -> List[Tuple[Dict[str, str], float]]:
+    """Return sum and count samples of summaries given by ``{label: [count, sum]}``."""
+    return [
+        ({"__suffix__": suffix, label: key}, val[n])
+        for key, val in values.items()
+        for suffix, n in [("_sum", 1), ("_count", 0)]
+    ]
+
+
+class ServerMetrics:
+    """Collect request metrics of a Dash (Flask) server and expose them on a route.
+
+    Counts callback requests by their outputs, records request and response sizes
+    of callbacks, counts active sessions (clients which sent callbacks within the
+    `session_timeout`) and reports fit durations of the `timer`, fit cache counters
+    and the process memory.
+
+    Example:
+        Register the route on the server of a dash app::
+
+            metrics = ServerMetrics(timer=gui.timer, get_fit_cache=lambda: gui.fit_cache)
+            metrics.register(app.server)
+    """
+
+    def __init__(
+        self,
+        timer: Optional[StageTimer] = None,
+        get_fit_cache: Optional[Callable[[], Optional[FitCache]]] = None,
+        session_timeout: float = 300.0,
+    ):
+        """Initialize the metrics.
+
+        Arguments:
+            timer: Timer of layout update stages which provides fit durations.
+            get_fit_cache: Function which returns the current fit cache.
+            session_timeout: Seconds after the last callback of a client until the
+                session is not active anymore.
+        """
+        self.timer = timer
+        self.get_fit_cache = get_fit_cache
+        self.session_timeout = session_timeout
+        self.callbacks: Dict[str, int] = defaultdict(int)
+        """Number of callback requests by callback output."""
+        self.callback_errors: Dict[str, int] = defaultdict(int)
+        """Number of callback requests with error status by callback output."""
+        self.request_bytes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        """Number of requests and total request size by callback output."""
+        self.response_bytes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        """Number of responses and total response size by callback output."""
+        self._sessions: Dict[Tuple[str, str], float] = {}
+        self._lock = Lock()
+
+    @property
+    def active_sessions(self) -> int:
+        """Return the number of clients which sent callbacks within the timeout."""
+        now = monotonic()
+        with self._lock:
+            self._sessions = {
+                client: last
+                for client, last in self._sessions.items()
+                if now - last < self.session_timeout
+            }
+            return len(self._sessions)
+
+    def _before_request(self):
+        if request.path != CALLBACK_PATH:
+            return
+        output = get_callback_output(request.get_data(cache=True))
+        request.environ["lsqfitgui.output"] = output
+        client = (request.remote_addr or "", request.user_agent.string or "")
+        with self._lock:
+            self.callbacks[output] += 1
+            self.request_bytes[output][0] += 1
+            self.request_bytes[output][1] += request.content_length or 0
+            self._sessions[client] = monotonic()
+
+    def _after_request(self, response: Response) -> Response:
+        output = request.environ.get("lsqfitgui.output")
+        if output is None:
+            return response
+        size = (
+            response.content_length
+            if response.content_length is not None
+            else len(response.get_data())
+        )
+        with self._lock:
+            self.response_bytes[output][0] += 1
+            self.response_bytes[output][1] += size
+            self.callback_errors[output] += response.status_code >= 400
+        return response
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+        with self._lock:
+            callbacks = dict(self.callbacks)
+            errors = dict(self.callback_errors)
+            request_bytes = {key: list(val) for key, val in self.request_bytes.items()}
+            response_bytes = {
+                key: list(val) for key, val in self.response_bytes.items()
+            }
+
+        lines = _format_metric(
+            "lsqfitgui_callbacks_total",
+            "counter",
+            "Number of callback requests by callback output.",
+            [({"output": key}, val) for key, val in callbacks.items()],
+        )
+        lines += _format_metric(
+            "lsqfitgui_callback_errors_total",
+            "counter",
+            "Number of callback requests with error status by callback output.",
+            [({"output": key}, val) for key, val in errors.items()],
+        )
+        for name, sizes, description in [
+            ("request", request_bytes, "Size of callback requests"),
+            ("response", response_bytes, "Size of callback responses"),
+        ]:
+            lines += _format_metric(
+                f"lsqfitgui_callback_{name}_bytes",
+                "summary",
+                f"{description} in bytes.",
+                _get_summary_samples(sizes, "output"),
+            )
+
+        if self.timer is not None:
+            totals = self.timer.get_totals()
+            lines += _format_metric(
+                "lsqfitgui_stage_seconds",
+                "summary",
+                "Duration of layout update stages in seconds.",
+                _get_summary_samples(totals, "stage"),
+            )
+            lines += _format_metric(
+                "lsqfitgui_fit_seconds",
+                "summary",
+                "Duration of fits (refits and fit setups) in seconds.",
+                _get_summary_samples(
+                    {key: val for key, val in totals.items() if key in FIT_STAGES},
+                    "stage",
+                ),
+            )
+
+        fit_cache = self.get_fit_cache() if self.get_fit_cache is not None else None
+        if fit_cache is not None:
+            stats = fit_cache.stats()
+            for key in ["hits", "misses", "evictions"]:
+                lines += _format_metric(
+                    f"lsqfitgui_fit_cache_{key}_total",
+                    "counter",
+                    f"Number of fit cache {key}.",
+                    [({}, stats[f"total_{key}"])],
+                )
+            lines += _format_metric(
+                "lsqfitgui_fit_cache_hit_rate",
+                "gauge",
+                "Fraction of fit cache lookups which were hits.",
+                [({}, stats["hit_rate"])],
+            )
+            lines += _format_metric(
+                "lsqfitgui_fit_cache_size",
+                "gauge",
+                "Number of fits in the fit cache.",
+                [({}, stats["size"])],
+            )
+
+        lines += _format_metric(
+            "lsqfitgui_active_sessions",
+            "gauge",
+            "Number of clients which sent callbacks within the session timeout.",
+            [({}, self.active_sessions)],
+        )
+        memory = get_process_memory()
+        if memory is not None:
+            lines += _format_metric(
+                "lsqfitgui_process_resident_memory_bytes",
+                "gauge",
+                "Resident memory of the server process in bytes.",
+                [({}, memory)],
+            )
+        return "\n".join(lines) + "\n"
+
+    def register(self, server: Flask, path: str = "/metrics"):
+        """Add the request hooks and the metrics route to the Flask server."""
+        server.before_request(self._before_request)
+        server.after_request(self._after_request)
+        server.add_url_rule(
+            path,
+            endpoint="lsqfitgui_metrics",
+            view_func=lambda: Response(
+                self.render(), mimetype="text/plain; version=0.0.4"
+            ),
+        )
@@ -0,0 +1,180 @@
+"""Speculative computation of fits for neighbouring meta values."""
+from typing import Callable, Dict, Any, List, Optional
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+
+from lsqfitgui.backend.cache import FitCache, get_fit_fingerprint, cache_fit_by_prior
+from lsqfitgui.backend.sidebar import round_meta_value
+
+
+def _get_option_values(options: List[Any]) -> List[Any]:
+    return [opt["value"] if isinstance(opt, dict) else opt for opt in options]
+
+
+def _is_in_bounds(value: Any, config: Dict[str, Any]) -> bool:
+    return (config.get("min") is None or value >= config["min"]) and (
+        config.get("max") is None or value <= config["max"]
+    )
+
+
+def get_neighbouring_setups(
+    setup: Dict[str, Any], meta_config: List[Dict[str, Any]], depth: int = 1
+) -> List[Dict[str, Any]]:
+    """Return fit setups which differ from the setup in a single meta value.
+
+    Numeric meta values (with a ``step``) are shifted by up to `depth` steps in both
+    directions while staying within the ``min`` and ``max`` bounds (see
+    :func:`lsqfitgui.backend.sidebar.round_meta_value` for float steps).
+    Meta values with ``options`` are replaced by up to `depth` options before and
+    after the current option.
+    Setups are ordered by their distance to the input setup.
+
+    Arguments:
+        setup: The fit setup kwargs.
+        meta_config: Configuration of the meta form elements.
+        depth: Maximal number of steps away from the current values.
+    """
+    neighbours = {}
+    for config in meta_config:
+        name = config["name"]
+        value = setup.get(name)
+        if value is None:
+            continue
+
+        if "options" in config:
+            options = _get_option_values(config["options"])
+            if value not in options:
+                continue
+            idx = options.index(value)
+            candidates = {
+                distance: [
+                    options[idx + sign * distance]
+                    for sign in (1, -1)
+                    if 0 <= idx + sign * distance < len(options)
+                ]
+                for distance in range(1, depth + 1)
+            }
+        elif config.get("step") is not None:
+            step = config["step"]
+            candidates = {
+                distance: [
+                    val
+                    for val in (
+                        round_meta_value(value + sign * distance * step)
+                        for sign in (1, -1)
+                    )
+                    if _is_in_bounds(val, config)
+                ]
+                for distance in range(1, depth + 1)
+            }
+        else:
+            continue
+
+        for distance, values in candidates.items():
+            neighbours.setdefault(distance, [])
+            neighbours[distance] += [{**setup, name: val} for val in values]
+
+    return [setup for distance in sorted(neighbours) for setup in neighbours[distance]]
+
+
+class MetaPrefetcher:
+    """Precompute fits for meta values adjacent to the current setup.
+
+    Fits are computed by a pool of worker threads and stored in the fit cache such that
+    :func:`lsqfitgui.frontend.dashboard.update_layout_from_meta` finds them.
+    If the fit setup function runs in a process pool
+    (see :class:`lsqfitgui.backend.executor.ProcessFitSetup`), the fits are computed
+    on multiple cores.
+    The number of workers bounds the CPU resources used for prefetching.
+    Prefetches for earlier setups which did not start yet are cancelled once
+    a new setup is prefetched.
+    """
+
+    def __init__(
+        self,
+        fit_setup_function: Callable,
+        fit_cache: FitCache,
+        meta_config: List[Dict[str, Any]],
+        depth: int = 1,
+        max_workers: int = 1,
+    ):
+        """Initialize the prefetcher.
+
+        Arguments:
+            fit_setup_function: Function which returns a non-linear fit object.
+            fit_cache: Cache which stores the prefetched fits.
+            meta_config: Configuration of the meta form elements.
+            depth: Maximal number of steps away from the current meta values.
+            max_workers: Number of worker threads computing fits.
+        """
+        self.fit_setup_function = fit_setup_function
+        self.fit_cache = fit_cache
+        self.meta_config = meta_config
+        self.depth = depth
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lsqfitgui-prefetch"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._lock = Lock()
+        self.n_prefetched = 0
+        """Number of fits computed by the prefetcher."""
+        self.n_failed = 0
+        """Number of neighbouring setups for which the fit setup function failed."""
+
+    def _get_key(self, setup: Dict[str, Any]) -> str:
+        return get_fit_fingerprint(setup=setup, fcn=self.fit_setup_function)
+
+    def _compute(self, setup: Dict[str, Any], key: str):
+        try:
+            fit = self.fit_setup_function(**setup)
+        except Exception:
+            with self._lock:
+                self.n_failed += 1
+            raise
+        self.fit_cache[key] = fit
+        meta_values = {config["name"]: setup[config["name"]] for config in self.meta_config}
+        cache_fit_by_prior(self.fit_cache, fit, meta_values)
+        with self._lock:
+            self.n_prefetched += 1
+
+    def prefetch(self, setup: Dict[str, Any]) -> List[Future]:
+        """Submit fits for setups neighbouring the input setup which are not cached."""
+        with self._lock:
+            for key, future in list(self._futures.items()):
+                if future.done() or future.cancel():
+                    self._futures.pop(key)
+
+            futures = []
+            for neighbour in get_neighbouring_setups(
+                setup, self.meta_config, depth=self.depth
+            ):
+                key = self._get_key(neighbour)
+                if key in self.fit_cache or key in self._futures:
+                    continue
+                self._futures[key] = self._pool.submit(self._compute, neighbour, key)
+                futures.append(self._futures[key])
+            return futures
+
+    def wait(self, setup: Dict[str, Any], timeout: Optional[float] = None):
+        """Wait until the prefetch of the setup finished if it is running.
+
+        Prefetches of the setup which did not start yet are cancelled such that the
+        caller computes the fit instead of waiting for other prefetches.
+        """
+        key = self._get_key(setup)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.done():
+                return
+            if future.cancel():
+                self._futures.pop(key)
+                return
+        wait([future], timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Cancel pending prefetches and shut down the thread pool."""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,77 @@
+"""Linear-response approximation of refits for new priors."""
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+
+PREVIEW_LABEL = "Linear-response preview (approximate; exact refit pending)"
+"""Label which marks approximate fit results."""
+
+
+class LinearResponsePreview(nonlinear_fit):
+    r"""Approximation of the fit for a new prior based on the posterior of an existing fit.
+
+    The fit model is linearized around the posterior of the existing fit.
+    For uncorrelated priors with means :math:`\mu` and standard deviations :math:`\sigma`,
+    the new posterior covariance :math:`C'` and mean :math:`m'` follow from the existing
+    posterior :math:`(m, C)` by
+
+    .. math::
+
+        C'^{-1} = C^{-1} + \mathrm{diag}(1/\sigma'^2 - 1/\sigma^2)\,, \quad
+        m' = C' \left[C^{-1} m + \mu' / \sigma'^2 - \mu / \sigma^2\right]\,.
+
+    This is exact for fit functions which are linear in the parameters.
+    The ``chi2``, ``Q`` and ``logGBF`` values are approximated by the same expansion.
+    The object can be used like the original fit for plots but is labeled as a preview.
+
+    Arguments:
+        fit: The existing fit.
+        prior: The new prior. Must have the same structure as the prior of the fit.
+    """
+
+    def __init__(self, fit: nonlinear_fit, prior: gv.BufferDict):  # noqa: D107
+        self.__dict__.update(fit.__dict__)
+        self.reference_fit = fit
+        """The fit which was used to compute the approximation."""
+
+        prior = gv.BufferDict(prior)
+        mu, mu_new = gv.mean(fit.prior.buf), gv.mean(prior.buf)
+        var, var_new = gv.var(fit.prior.buf), gv.var(prior.buf)
+
+        mean = np.asarray(gv.mean(fit.palt.buf), dtype=float)
+        precision = np.linalg.inv(fit.cov)
+        precision_new = precision + np.diag(1 / var_new - 1 / var)
+        cov_new = np.linalg.inv(precision_new)
+        mean_new = cov_new @ (precision @ mean + mu_new / var_new - mu / var)
+
+        # chi2 of the data expanded around the old posterior mean
+        dp = mean_new - mean
+        chi2_data = (
+            fit.chi2
+            - np.sum((mean - mu) ** 2 / var)
+            - 2 * np.sum((mean - mu) / var * dp)
+            + dp @ (precision - np.diag(1 / var)) @ dp
+        )
+        self.chi2 = chi2_data + np.sum((mean_new - mu_new) ** 2 / var_new)
+        self.Q = gv.gammaQ(self.dof / 2.0, self.chi2 / 2.0)
+        if fit.logGBF is not None:
+            self.logGBF = fit.logGBF + 0.5 * (
+                np.linalg.slogdet(cov_new)[1]
+                - np.linalg.slogdet(fit.cov)[1]
+                - np.sum(np.log(var_new / var))
+                - (self.chi2 - fit.chi2)
+            )
+
+        self.prior = prior
+        self.cov = cov_new
+        self.palt = gv.BufferDict(fit.palt, buf=gv.gvar(mean_new, cov_new))
+        self._p = self.palt
+        self.pmean = gv.mean(self.palt)
+        self.psdev = gv.sdev(self.palt)
+        self.nit = 0
+        self.time = 0.0
+
+    def format(self, *args, **kwargs) -> str:
+        """Format the fit output with a label which marks it as approximate."""
+        return PREVIEW_LABEL + "\n\n" + super().format(*args, **kwargs)
@@ -1,30 +1,185 @@
 """Functions for parsing sidebar form values into python objects."""
-import re
+from typing import Dict, Any, List, Tuple
+
+from functools import lru_cache
+
+import numpy as np
 import gvar as gv
 from lsqfit import nonlinear_fit
 
+from lsqfitgui.util.models import MultiFitterFit, refit_multi_fitter_fit
+
+
+def has_same_structure(gvars1: gv.BufferDict, gvars2: gv.BufferDict) -> bool:
+    """Check if two BufferDicts have the same keys and shapes."""
+    return list(gvars1.keys()) == list(gvars2.keys()) and all(
+        np.shape(gvars1[key]) == np.shape(gvars2[key]) for key in gvars1
+    )
+
+
+def get_warm_start_kwargs(fit: nonlinear_fit, prior: gv.BufferDict) -> Dict[str, Any]:
+    """Collect optimizer state of a fit which can be reused when refitting a new prior.
 
-def process_priors(prior_flat, initial_fit):
-    """Process prior input array into fit object."""
-    if any(
-        [float(val) <= 0 for key, val in prior_flat.items() if key.endswith("sdev")]
+    The posterior mean seeds the new fit and fitter settings are copied over.
+    If the prior standard deviations did not change, the processed data and prior
+    distribution (including the data SVD cut) are reused as well.
+
+    Arguments:
+        fit: The previous fit.
+        prior: The prior of the new fit. Must have the same structure as the old prior.
+    """
+    kwargs = dict(fit.fitterargs)
+    kwargs.update(
+        p0=fit.pmean,
+        svdcut=fit.svdcut,
+        eps=fit.eps,
+        fitter=fit.fitter,
+        noise=fit.noise,
+    )
+    if getattr(fit, "yp_pdf", None) is not None and np.array_equal(
+        gv.sdev(prior.buf), gv.sdev(fit.prior.buf)
     ):
+        kwargs["data"] = (fit.x, fit.y)
+        kwargs["_yp_pdf"] = fit.yp_pdf
+    return kwargs
+
+
+def get_prior_structure(prior: gv.BufferDict) -> Tuple[Tuple[str, Tuple[int]], ...]:
+    """Return the keys and shapes of the prior as a hashable object."""
+    return tuple((key, np.shape(val)) for key, val in prior.items())
+
+
+class PriorIndex:
+    """Map of sidebar prior input names to slots in flat prior mean and sdev arrays.
+
+    Array valued priors are represented by inputs ``{key}__array_{n}-mean`` and
+    ``{key}__array_{n}-sdev``; scalar priors by ``{key}-mean`` and ``{key}-sdev``.
+    """
+
+    def __init__(self, structure: Tuple[Tuple[str, Tuple[int]], ...]):
+        """Create index for prior structure (see :func:`get_prior_structure`)."""
+        self.structure = structure
+        self.slots: Dict[str, Tuple[int, int]] = {}
+        """Map of input names to (kind, flat position) where kind 0 is mean and 1 sdev."""
+        position = 0
+        for key, shape in structure:
+            if shape:
+                names = [f"{key}__array_{n}" for n in range(int(np.prod(shape)))]
+            else:
+                names = [key]
+            for name in names:
+                self.slots[f"{name}-mean"] = (0, position)
+                self.slots[f"{name}-sdev"] = (1, position)
+                position += 1
+        self.size = position
+        """Number of entries in the flat prior."""
+
+    def encode(self, prior: gv.BufferDict) -> List[str]:
+        """Return the input values of a prior ordered like the slots."""
+        flat = (gv.mean(prior.buf), gv.sdev(prior.buf))
+        return [str(flat[kind][position]) for kind, position in self.slots.values()]
+
+    def decode(self, names: List[str], values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse input values into flat prior mean and sdev arrays.
+
+        Raises:
+            ValueError: If values are not numbers, inputs are missing or unknown,
+                or standard deviations are not positive.
+        """
+        try:
+            slots = [self.slots[name] for name in names]
+        except KeyError as error:
+            raise ValueError(f"Unknown prior input {error}.") from error
+        kinds, positions = np.array(slots, dtype=int).reshape(-1, 2).T
+        try:
+            values = np.asarray(values, dtype=float)
+        except (TypeError, ValueError) as error:
+            raise ValueError("Prior values must be numbers.") from error
+
+        flat = np.full((2, self.size), np.nan)
+        flat[kinds, positions] = values
+        return _check_flat_prior(flat)
+
+    def update(self, flat: np.ndarray, changes: Dict[str, Any]) -> np.ndarray:
+        """Return a copy of flat prior means and sdevs with changed input values.
+
+        Only changed values are parsed. Values which are not numbers are stored as
+        ``nan`` and rejected by :func:`get_prior_from_flat`; unknown inputs are ignored.
+
+        Arguments:
+            flat: Array of flat prior means and sdevs of shape ``(2, size)``
+                (see :func:`get_flat_prior`).
+            changes: Changed input values by input name.
+        """
+        flat = flat.copy()
+        for name, value in changes.items():
+            slot = self.slots.get(name)
+            if slot is None:
+                continue
+            try:
+                flat[slot] = float(value)
+            except (TypeError, ValueError):
+                flat[slot] = np.nan
+        return flat
+
+
+def _check_flat_prior(flat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if np.isnan(flat).any():
+        raise ValueError("Prior values are missing or not numbers.")
+    if (flat[1] <= 0).any():
         raise ValueError("Standard deviations must be larger than zero.")
+    return flat[0], flat[1]
 
-    prior = {}
-    for key, val in initial_fit.prior.items():
-        if hasattr(val, "__len__"):
-            nmax = len(
-                [k for k in prior_flat if re.match(f"{key}__array_[0-9]+-mean", k)]
-            )
-            prior[key] = gv.gvar(
-                [prior_flat[f"{key}__array_{n}-mean"] for n in range(nmax)],
-                [prior_flat[f"{key}__array_{n}-sdev"] for n in range(nmax)],
-            )
-        else:
-            prior[key] = gv.gvar(prior_flat[f"{key}-mean"], prior_flat[f"{key}-sdev"])
-
-    fit = nonlinear_fit(initial_fit.data, initial_fit.fcn, prior)
+
+@lru_cache(maxsize=32)
+def get_prior_index(structure: Tuple[Tuple[str, Tuple[int]], ...]) -> PriorIndex:
+    """Return the (cached) prior index for the prior structure."""
+    return PriorIndex(structure)
+
+
+def parse_priors(prior_flat, prior_template: gv.BufferDict) -> gv.BufferDict:
+    """Parse flat prior form values into a prior with the structure of the template."""
+    index = get_prior_index(get_prior_structure(prior_template))
+    mean, sdev = index.decode(list(prior_flat.keys()), list(prior_flat.values()))
+    return gv.BufferDict(prior_template, buf=gv.gvar(mean, sdev))
+
+
+def get_flat_prior(prior: gv.BufferDict) -> np.ndarray:
+    """Return flat prior means and sdevs as an array of shape ``(2, size)``."""
+    return np.array([gv.mean(prior.buf), gv.sdev(prior.buf)], dtype=float)
+
+
+def get_prior_from_flat(
+    flat: np.ndarray, prior_template: gv.BufferDict
+) -> gv.BufferDict:
+    """Create a prior with the structure of the template from flat means and sdevs.
+
+    Raises:
+        ValueError: If values are not numbers or standard deviations are not positive.
+    """
+    mean, sdev = _check_flat_prior(flat)
+    return gv.BufferDict(prior_template, buf=gv.gvar(mean, sdev))
+
+
+def refit_with_prior(
+    prior: gv.BufferDict, initial_fit: nonlinear_fit, warm_start: bool = False
+) -> nonlinear_fit:
+    """Refit the data of the initial fit with a new prior.
+
+    Arguments:
+        prior: The new prior.
+        initial_fit: The fit which provides data and fit function.
+        warm_start: Seed the new fit with the posterior and optimizer state of
+            the `initial_fit`.
+    """
+    if isinstance(initial_fit, MultiFitterFit):
+        return refit_multi_fitter_fit(prior, initial_fit, warm_start=warm_start)
+
+    kwargs = {"data": initial_fit.data}
+    if warm_start and has_same_structure(prior, initial_fit.prior):
+        kwargs.update(get_warm_start_kwargs(initial_fit, prior))
+
+    fit = nonlinear_fit(fcn=initial_fit.fcn, prior=prior, **kwargs)
 
     for attr in ["models", "meta"]:
         if hasattr(initial_fit, attr):
@@ -33,6 +188,34 @@ def process_priors(prior_flat, initial_fit):
     return fit
 
 
+def process_priors(prior_flat, initial_fit, warm_start: bool = False):
+    """Process prior input array into fit object.
+
+    Arguments:
+        prior_flat: Flat dictionary of prior form values.
+        initial_fit: The fit which provides data, fit function and prior structure.
+        warm_start: Seed the new fit with the posterior and optimizer state of
+            the `initial_fit`.
+    """
+    prior = parse_priors(prior_flat, initial_fit.prior)
+    return refit_with_prior(prior, initial_fit, warm_start=warm_start)
+
+
+def round_meta_value(value: Any) -> Any:
+    """Round float meta values to 12 digits.
+
+    Values computed from steps (e.g., ``0.1 + 0.2``) then match the exact decimals of
+    typed form values such that fits of both have the same fingerprint.
+    """
+    return round(value, 12) if isinstance(value, float) else value
+
+
 def process_meta(meta_array, meta_config):
     """Parse meta form input into dictionary shape using meta config name values."""
     return {config["name"]: val for config, val in zip(meta_config, meta_array)}
+
+
+def get_fit_setup(meta_array, meta_config, fit_setup_kwargs) -> Dict[str, Any]:
+    """Update the fit setup kwargs by meta form input."""
+    meta_values = process_meta(meta_array, meta_config)
+    return {key: meta_values.get(key) or val for key, val in fit_setup_kwargs.items()}
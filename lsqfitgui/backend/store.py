@@ -0,0 +1,376 @@
+"""Compact on-disk storage of fits with memory-mapped arrays.
+
+A fit store is a directory which contains the means, standard deviations and
+covariance blocks of the prior, the posterior and the data as ``.npy``/``.npz`` files
+next to a small ``metadata.json`` file (fit function reference, meta setup and fit
+statistics).
+In contrast to pickled fits (``gvar.dump``), no derivative data of gvars is stored.
+Arrays are opened memory-mapped such that large fits can be inspected without
+reading them completely.
+
+Example:
+    Store a fit and open it again::
+
+        save_fit_store(fit, "fit-store", setup={"n_exp": 3})
+        store = FitStore("fit-store")
+        store.summary["chi2"]
+        fit = store.load_fit()
+"""
+from typing import Optional, Dict, Any, Callable, Tuple, Iterator
+
+import os
+import sys
+import json
+import importlib
+
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+from lsqfitgui.util.function import parse_function
+
+STORE_VERSION = 1
+GROUPS = ("prior", "p", "y")
+SUMMARY_KEYS = ("chi2", "dof", "Q", "logGBF", "nit", "svdn", "time")
+SETTINGS_KEYS = ("svdcut", "eps", "tol", "noise", "fitter", "description")
+
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy values to JSON compatible values."""
+    if isinstance(value, dict):
+        return {str(key): _to_json(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_json(val) for val in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def get_function_reference(fcn: Optional[Callable]) -> Optional[str]:
+    """Return a ``module:name`` reference which can be imported later.
+
+    Functions defined in scripts (``__main__``) are referenced by the path of the
+    script (``script.py:name``, see :func:`lsqfitgui.util.function.parse_function`).
+    Returns ``None`` for functions which can not be referenced, e.g., lambdas or
+    local functions.
+    """
+    module = getattr(fcn, "__module__", None)
+    name = getattr(fcn, "__qualname__", None)
+    if module is None or name is None or "<" in name:
+        return None
+    if module == "__main__":
+        path = getattr(sys.modules["__main__"], "__file__", None)
+        return None if path is None else f"{os.path.abspath(path)}:{name}"
+    return f"{module}:{name}"
+
+
+def resolve_function_reference(reference: Optional[str]) -> Optional[Callable]:
+    """Import the function of a reference created by :func:`get_function_reference`.
+
+    Returns ``None`` if the function can not be imported.
+    """
+    if reference is None:
+        return None
+    module, name = reference.rsplit(":", 1)
+    if module.endswith(".py"):
+        return parse_function(reference)
+    try:
+        obj = importlib.import_module(module)
+        for attr in name.split("."):
+            obj = getattr(obj, attr)
+        return obj
+    except Exception:
+        return None
+
+
+def _get_layout(values: Any) -> Dict[str, Any]:
+    if hasattr(values, "keys"):
+        for key in values.keys():
+            if not isinstance(key, str):
+                raise ValueError(f"Fit stores only support string keys. Got {key!r}.")
+        return {"keys": [[key, list(np.shape(val))] for key, val in values.items()]}
+    return {"shape": list(np.shape(values))}
+
+
+def _get_buffer(values: Any) -> np.ndarray:
+    if hasattr(values, "keys"):
+        return gv.BufferDict(values).buf
+    return np.ravel(values)
+
+
+def _save_group(directory: str, name: str, values: Any) -> Dict[str, Any]:
+    """Store mean, sdev and covariance blocks of gvars and return their layout."""
+    buf = _get_buffer(values)
+    np.save(os.path.join(directory, f"{name}_mean.npy"), gv.mean(buf))
+    np.save(os.path.join(directory, f"{name}_sdev.npy"), gv.sdev(buf))
+
+    blocks = gv.evalcov_blocks(buf, compress=True)[1:]
+    np.savez(
+        os.path.join(directory, f"{name}_blocks.npz"),
+        index=np.concatenate([idx for idx, _ in blocks] or [np.zeros(0, dtype=int)]),
+        sizes=np.array([len(idx) for idx, _ in blocks], dtype=int),
+    )
+    np.save(
+        os.path.join(directory, f"{name}_cov.npy"),
+        np.concatenate([np.ravel(cov) for _, cov in blocks] or [np.zeros(0)]),
+    )
+    return _get_layout(values)
+
+
+def save_fit_store(
+    fit: nonlinear_fit,
+    directory: str,
+    setup: Optional[Dict[str, Any]] = None,
+    fcn_reference: Optional[str] = None,
+):
+    """Store the prior, posterior and data of a fit in a fit store directory.
+
+    Correlations within the prior, the posterior and the data are stored as
+    covariance blocks.
+    Correlations between these groups (e.g., between posterior and data) are not
+    stored.
+    The independent data (``fit.x``) is stored as a pickle file.
+
+    Arguments:
+        fit: The fit to store.
+        directory: The directory of the store. Created if it does not exist.
+        setup: The meta setup (``fit_setup_kwargs``) of the fit. Must be JSON
+            serializable.
+        fcn_reference: Reference of the fit function in the form ``module:name`` or
+            ``script.py:name``. Determined from the fit function if not given.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    layout = {
+        name: _save_group(directory, name, values)
+        for name, values in zip(GROUPS, (fit.prior, fit.p, fit.y))
+    }
+    gv.dump(fit.x, os.path.join(directory, "x.p"))
+
+    fitterargs = getattr(fit, "fitterargs", None) or {}
+    try:
+        json.dumps(_to_json(fitterargs))
+    except TypeError:
+        fitterargs = {}
+
+    metadata = {
+        "version": STORE_VERSION,
+        "fcn": fcn_reference or get_function_reference(getattr(fit, "fcn", None)),
+        "setup": _to_json(setup or {}),
+        "meta": _to_json(getattr(fit, "meta", None)),
+        "layout": layout,
+        "summary": {key: _to_json(getattr(fit, key, None)) for key in SUMMARY_KEYS},
+        "settings": {key: _to_json(getattr(fit, key, None)) for key in SETTINGS_KEYS},
+        "fitterargs": _to_json(fitterargs),
+    }
+    with open(os.path.join(directory, "metadata.json"), "w") as out:
+        json.dump(metadata, out, indent=2)
+
+
+def is_fit_store(path: str) -> bool:
+    """Return if the path is a fit store directory."""
+    return os.path.isfile(os.path.join(path, "metadata.json"))
+
+
+class FitStore:
+    """Read access to a fit store created by :func:`save_fit_store`.
+
+    Only the metadata is read on initialization.
+    Arrays are opened memory-mapped when accessed and gvars are only created by
+    :meth:`get_gvars` and :meth:`load_fit`.
+    """
+
+    def __init__(self, directory: str):
+        """Open the fit store.
+
+        Arguments:
+            directory: The directory of the store.
+        """
+        if not is_fit_store(directory):
+            raise ValueError(f"Directory {directory!r} is not a fit store.")
+        self.directory = directory
+        with open(os.path.join(directory, "metadata.json")) as inp:
+            self.metadata = json.load(inp)
+            """Content of the ``metadata.json`` file."""
+        if self.metadata.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Unsupported fit store version {self.metadata.get('version')!r}."
+            )
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """Return the fit statistics (``chi2``, ``dof``, ``Q``, ``logGBF``, ...)."""
+        return self.metadata["summary"]
+
+    @property
+    def setup(self) -> Dict[str, Any]:
+        """Return the meta setup of the fit."""
+        return self.metadata["setup"]
+
+    @property
+    def fcn_reference(self) -> Optional[str]:
+        """Return the reference of the fit function."""
+        return self.metadata["fcn"]
+
+    def _path(self, name: str, kind: str, ext: str = "npy") -> str:
+        if name not in GROUPS:
+            raise KeyError(f"Unknown group {name!r}. Choose one of {GROUPS}.")
+        return os.path.join(self.directory, f"{name}_{kind}.{ext}")
+
+    def _as_layout(self, name: str, buf: np.ndarray) -> Any:
+        layout = self.metadata["layout"][name]
+        if "shape" in layout:
+            return np.reshape(buf, layout["shape"])
+        template = gv.BufferDict()
+        for key, shape in layout["keys"]:
+            template[key] = np.zeros(shape)
+        return gv.BufferDict(template, buf=buf)
+
+    def get_mean_buffer(self, name: str) -> np.ndarray:
+        """Return the memory-mapped flat means of ``prior``, ``p`` or ``y``."""
+        return np.load(self._path(name, "mean"), mmap_mode="r")
+
+    def get_sdev_buffer(self, name: str) -> np.ndarray:
+        """Return the memory-mapped flat standard deviations of a group."""
+        return np.load(self._path(name, "sdev"), mmap_mode="r")
+
+    def get_mean(self, name: str) -> Any:
+        """Return the means of a group in the shape of the stored values."""
+        return self._as_layout(name, np.array(self.get_mean_buffer(name)))
+
+    def get_sdev(self, name: str) -> Any:
+        """Return the standard deviations of a group in the shape of the stored values."""
+        return self._as_layout(name, np.array(self.get_sdev_buffer(name)))
+
+    def iter_cov_blocks(self, name: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Iterate over indices and (memory-mapped) covariances of correlated blocks.
+
+        Indices refer to the flat buffers of the group. Values which are not part of
+        any block are uncorrelated.
+        """
+        with np.load(self._path(name, "blocks", "npz")) as blocks:
+            index, sizes = blocks["index"], blocks["sizes"]
+        cov = np.load(self._path(name, "cov"), mmap_mode="r")
+        indices = np.split(index, np.cumsum(sizes)[:-1])
+        for idx, size, stop in zip(indices, sizes, np.cumsum(sizes**2)):
+            yield idx, cov[slice(stop - size**2, stop)].reshape(size, size)
+
+    def get_gvars(self, name: str) -> Any:
+        """Create gvars of a group from means and covariance blocks."""
+        mean = np.array(self.get_mean_buffer(name))
+        sdev = np.array(self.get_sdev_buffer(name))
+        buf = np.empty(mean.size, dtype=object)
+        uncorrelated = np.ones(mean.size, dtype=bool)
+        for idx, cov in self.iter_cov_blocks(name):
+            buf[idx] = gv.gvar(mean[idx], np.array(cov))
+            uncorrelated[idx] = False
+        buf[uncorrelated] = gv.gvar(mean[uncorrelated], sdev[uncorrelated])
+        return self._as_layout(name, np.array(buf.tolist(), dtype=object))
+
+    def get_cov(self, name: str) -> np.ndarray:
+        """Return the covariance matrix of the flat buffer of a group.
+
+        The matrix is assembled from the standard deviations and the stored covariance
+        blocks without creating gvars.
+        """
+        cov = np.diag(np.array(self.get_sdev_buffer(name)) ** 2)
+        for idx, block in self.iter_cov_blocks(name):
+            cov[np.ix_(idx, idx)] = block
+        return cov
+
+    def get_x(self) -> Any:
+        """Return the independent data of the fit."""
+        return gv.load(os.path.join(self.directory, "x.p"))
+
+    def load_fit(self, fcn: Optional[Callable] = None) -> "StoredFit":
+        """Create a fit object from the store without refitting.
+
+        Arguments:
+            fcn: The fit function. Imported from the stored reference if not given.
+        """
+        return StoredFit(
+            self, fcn=fcn or resolve_function_reference(self.fcn_reference)
+        )
+
+
+def _lazy_attribute(name: str, load: Callable[[Any], Any]) -> property:
+    """Return a property which loads the attribute from the store on first access."""
+
+    def get(self):
+        if name not in self._loaded:
+            self._loaded[name] = load(self)
+        return self._loaded[name]
+
+    def set(self, value):
+        self._loaded[name] = value
+
+    return property(get, set, doc=f"Return ``{name}`` (loaded on first access).")
+
+
+class StoredFit(nonlinear_fit):
+    """Fit loaded from a :class:`FitStore`.
+
+    The object provides the attributes of the fit used by the GUI (e.g., ``p``,
+    ``cov``, ``chi2``, ``fcn`` and ``data``) and can be refitted with new priors.
+    Gvars are created from the stored covariance blocks and are therefore not
+    correlated with gvars of other fits.
+    Data, prior and posterior are read from the memory-mapped store on first access;
+    thus, opening large fits only reads the metadata and the independent data.
+    """
+
+    def __init__(self, store: FitStore, fcn: Optional[Callable] = None):
+        """Create the fit.
+
+        Arguments:
+            store: The fit store.
+            fcn: The fit function (``None`` if unknown).
+        """
+        self._loaded = {}
+        self.store = store
+        """The fit store of the fit."""
+        self.fcn = fcn
+        self.x = store.get_x()
+        if store.metadata["meta"] is not None:
+            self.meta = store.metadata["meta"]
+
+        for key, val in store.summary.items():
+            setattr(self, key, val)
+        for key, val in store.metadata["settings"].items():
+            setattr(self, key, tuple(val) if isinstance(val, list) else val)
+        self.fitterargs = store.metadata["fitterargs"]
+        self.error = None
+        self.residuals = None
+        self.stopping_criterion = None
+        self.linear = []
+        self.correction = None
+        self.nblocks = None
+
+        # attributes which gvar.dumps removes from nonlinear_fit objects
+        self._chiv = self._chivw = self.pdf = self.dchi2 = None
+        self.yp_pdf = None
+
+    y = _lazy_attribute("y", lambda self: self.store.get_gvars("y"))
+    data = _lazy_attribute("data", lambda self: (self.x, self.y))
+    prior = _lazy_attribute("prior", lambda self: self.store.get_gvars("prior"))
+    palt = _lazy_attribute("palt", lambda self: self.store.get_gvars("p"))
+    _p = _lazy_attribute("_p", lambda self: self.palt)
+    pmean = _lazy_attribute("pmean", lambda self: self.store.get_mean("p"))
+    psdev = _lazy_attribute("psdev", lambda self: self.store.get_sdev("p"))
+    p0 = _lazy_attribute("p0", lambda self: self.pmean)
+    cov = _lazy_attribute("cov", lambda self: self.store.get_cov("p"))
+
+
+def open_fit(path: str, fcn: Optional[Callable] = None) -> nonlinear_fit:
+    """Open a fit from a fit store directory or a pickle file (``gvar.load``).
+
+    Arguments:
+        path: Path to the fit store directory or the pickle file.
+        fcn: Fit function which replaces the stored fit function.
+    """
+    if os.path.isdir(path):
+        return FitStore(path).load_fit(fcn=fcn)
+
+    fit = gv.load(path)
+    if fcn is not None:
+        fit.fcn = fcn
+    return fit
@@ -0,0 +1,263 @@
+"""Computation of fits for all combinations of meta values."""
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from functools import partial
+from itertools import product
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, RLock
+
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+from lsqfitgui.backend.cache import get_fit_fingerprint
+from lsqfitgui.backend.executor import ProcessFitSetup
+from lsqfitgui.backend.store import get_function_reference
+from lsqfitgui.backend.sidebar import round_meta_value
+
+
+def get_meta_values(config: Dict[str, Any], value: Any = None) -> List[Any]:
+    """Return all values of a meta form element.
+
+    Elements with ``options`` take all option values.
+    Numeric elements with ``min``, ``max`` and ``step`` take all values from ``min``
+    to ``max`` (included) in steps of ``step``.
+    Other elements only take their current value.
+
+    Arguments:
+        config: Configuration of the meta form element.
+        value: The current value of the element.
+    """
+    if "options" in config:
+        return [
+            opt["value"] if isinstance(opt, dict) else opt for opt in config["options"]
+        ]
+    elif all(config.get(key) is not None for key in ("min", "max", "step")):
+        start, stop, step = config["min"], config["max"], config["step"]
+        n_steps = int(np.floor((stop - start) / step + 1e-9))
+        return [round_meta_value(start + n * step) for n in range(n_steps + 1)]
+    return [value]
+
+
+def get_meta_grid(
+    meta_config: List[Dict[str, Any]], fit_setup_kwargs: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Return fit setups for all combinations of meta values.
+
+    Arguments:
+        meta_config: Configuration of the meta form elements.
+        fit_setup_kwargs: The fit setup kwargs which provide values of arguments which
+            are not part of the meta config (and current values of meta elements
+            without ranges).
+    """
+    names = [config["name"] for config in meta_config]
+    values = [
+        get_meta_values(config, fit_setup_kwargs.get(config["name"]))
+        for config in meta_config
+    ]
+    return [{**fit_setup_kwargs, **dict(zip(names, vals))} for vals in product(*values)]
+
+
+class MetaSweep:
+    """Compute fits for all combinations of meta values (the meta grid).
+
+    Fits are kept in the :attr:`results` of the sweep, which
+    :func:`lsqfitgui.frontend.dashboard.update_layout_from_meta` consults before the fit
+    cache (see :meth:`get`); thus, results are not evicted by the fit cache.
+    If `processes` is positive (or the fit setup function is a
+    :class:`lsqfitgui.backend.executor.ProcessFitSetup`), fits are computed in a
+    process pool; otherwise, they are computed in a background thread.
+    Results can be stored in a file and loaded in later sessions.
+
+    Example:
+        Compute the grid and wait for the results::
+
+            sweep = MetaSweep(generate_fit, meta_config, processes=4)
+            sweep.start({"n_exp": 3})
+            sweep.wait()
+            sweep.dump("sweep.p")
+    """
+
+    def __init__(
+        self,
+        fit_setup_function: Callable,
+        meta_config: List[Dict[str, Any]],
+        processes: int = 0,
+    ):
+        """Initialize the sweep.
+
+        Arguments:
+            fit_setup_function: Function which returns a non-linear fit object.
+            meta_config: Configuration of the meta form elements.
+            processes: Number of worker processes. Runs in a thread if zero.
+        """
+        self.fit_setup_function = fit_setup_function
+        self.meta_config = meta_config
+        if isinstance(fit_setup_function, ProcessFitSetup):
+            self._process_setup = fit_setup_function
+        elif processes > 0:
+            self._process_setup = ProcessFitSetup(
+                fit_setup_function, max_workers=processes
+            )
+        else:
+            self._process_setup = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lsqfitgui-sweep"
+        )
+        self._futures: List[Future] = []
+        self._lock = Condition(RLock())
+        self._generation = 0
+        self._pending = 0
+        self.results: Dict[str, Tuple[Dict[str, Any], nonlinear_fit]] = {}
+        """Setups and fits of computed grid points by fingerprint of their setup."""
+        self.n_total = 0
+        """Number of grid points of the latest sweep."""
+        self.n_done = 0
+        """Number of finished grid points (including cached and failed points)."""
+        self.n_failed = 0
+        """Number of grid points for which the fit setup function failed."""
+
+    @property
+    def fit_setup_reference(self) -> str:
+        """Return a reference which identifies the fit setup function across sessions.
+
+        Stored by :meth:`dump` and checked by :meth:`load`.
+        """
+        fcn = self.fit_setup_function
+        if isinstance(fcn, ProcessFitSetup):
+            fcn = fcn.fit_setup_function
+        reference = get_function_reference(fcn)
+        if reference is None:
+            reference = f"{getattr(fcn, '__module__', None)}:{fcn.__qualname__}"
+        return reference
+
+    def _store(self, setup: Dict[str, Any], fit: nonlinear_fit):
+        self.results[get_fit_fingerprint(setup=setup)] = (setup, fit)
+
+    def get(self, setup: Dict[str, Any]) -> Optional[nonlinear_fit]:
+        """Return the fit of a grid point or ``None`` if it was not computed."""
+        result = self.results.get(get_fit_fingerprint(setup=setup))
+        return result[1] if result is not None else None
+
+    def _finish(
+        self,
+        generation: int,
+        setup: Dict[str, Any],
+        callback: Optional[Callable],
+        future: Future,
+    ):
+        cancelled = future.cancelled()
+        error = None if cancelled else future.exception()
+        fit = None if cancelled or error is not None else future.result()
+        if isinstance(fit, bytes):
+            fit = gv.loads(fit)
+
+        with self._lock:
+            if fit is not None:
+                self._store(setup, fit)
+            if generation != self._generation:
+                return
+            self._pending -= 1
+            self.n_done += not cancelled
+            self.n_failed += error is not None
+            self._lock.notify_all()
+        if callback is not None and not cancelled:
+            callback(self.n_done, self.n_total)
+
+    def start(
+        self, fit_setup_kwargs: Dict[str, Any], callback: Optional[Callable] = None
+    ) -> List[Future]:
+        """Submit fits for all grid points which are not computed yet.
+
+        Cancels pending fits of previous sweeps.
+
+        Arguments:
+            fit_setup_kwargs: The fit setup kwargs which provide values of arguments
+                which are not part of the meta config.
+            callback: Function called with the number of finished and total grid points
+                after each fit.
+        """
+        self.cancel()
+        grid = get_meta_grid(self.meta_config, fit_setup_kwargs)
+
+        with self._lock:
+            self._generation += 1
+            self.n_total, self.n_done, self.n_failed = len(grid), 0, 0
+            self._pending = 0
+            self._futures = []
+            for setup in grid:
+                if get_fit_fingerprint(setup=setup) in self.results:
+                    self.n_done += 1
+                    continue
+                if self._process_setup is not None:
+                    future = self._process_setup.submit(**setup)
+                else:
+                    future = self._pool.submit(self.fit_setup_function, **setup)
+                self._pending += 1
+                future.add_done_callback(
+                    partial(self._finish, self._generation, setup, callback)
+                )
+                self._futures.append(future)
+            return list(self._futures)
+
+    @property
+    def running(self) -> bool:
+        """Return if fits of the latest sweep are pending or running."""
+        return self._pending > 0
+
+    @property
+    def progress(self) -> float:
+        """Return the fraction of finished grid points of the latest sweep."""
+        return self.n_done / self.n_total if self.n_total else 1.0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all fits of the latest sweep finished and return if they did."""
+        with self._lock:
+            return self._lock.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def cancel(self):
+        """Cancel pending fits of the latest sweep."""
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+
+    def dump(self, path: str):
+        """Store the computed fits in a file using ``gvar.dump``.
+
+        The fit functions of the fits must be picklable.
+        The file also stores the :attr:`fit_setup_reference` of the sweep.
+        """
+        with self._lock:
+            results = dict(self.results)
+        gv.dump(
+            {"fit_setup_function": self.fit_setup_reference, "results": results}, path
+        )
+
+    def load(self, path: str):
+        """Load fits stored by :meth:`dump` into the results.
+
+        Loaded fits are not recomputed by :meth:`start`.
+
+        Raises:
+            ValueError: If the fits were computed by a different fit setup function.
+        """
+        data = gv.load(path)
+        reference = data.get("fit_setup_function")
+        if reference != self.fit_setup_reference:
+            raise ValueError(
+                f"Sweep file {path!r} was computed by fit setup function {reference!r},"
+                f" not {self.fit_setup_reference!r}."
+            )
+        with self._lock:
+            for setup, fit in data["results"].values():
+                self._store(setup, fit)
+
+    def shutdown(self, wait: bool = True):
+        """Cancel pending fits and shut down the thread and process pools."""
+        self.cancel()
+        self._pool.shutdown(wait=wait)
+        if (
+            self._process_setup is not None
+            and self._process_setup is not self.fit_setup_function
+        ):
+            self._process_setup.shutdown(wait=wait)
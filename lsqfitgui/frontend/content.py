@@ -1,16 +1,28 @@
 """Submodule providing GUI content."""
-from typing import Optional, Dict, Callable, List, Any
+from typing import Optional, Dict, Callable, List, Any, Tuple
 
 from inspect import getsource
+from threading import Lock
 
-from dash import html, dcc
-from dash.dependencies import Input, Output, State
+from dash import html, dcc, no_update
+from dash.dependencies import ALL, Input, Output, State
 import dash_bootstrap_components as dbc
 
 from lsqfitgui.plot.fit import plot_fit, plot_residuals
 from lsqfitgui.plot.uncertainty import plot_gvar
-from lsqfitgui.util.function import parse_function_expression
+from lsqfitgui.util.function import (
+    get_function_expression,
+    is_function_expression_pending,
+)
 from lsqfitgui.util.versions import get_entrypoint_string, get_version_string
+from lsqfitgui.util.timing import StageTimer, timed
+
+
+FUNCTION_EXPRESSION_INTERVAL = 500
+"""Milliseconds between checks whether a pending function expression was parsed."""
+
+FUNCTION_EXPRESSION_MAX_INTERVALS = 120
+"""Number of checks for a pending function expression before polling stops."""
 
 
 def document_function(
@@ -18,7 +30,12 @@ def document_function(
     parameters: Optional[Dict] = None,
     x_dict_keys: Optional[List[str]] = None,
 ) -> List[html.Base]:
-    """Documents the function."""
+    """Documents the function.
+
+    If the latex expression of the function is not parsed in time, the documentation
+    contains an enabled ``function-expression-interval`` which triggers a refresh
+    (see :data:`FUNCTION_EXPRESSION_CALLBACK_ARGS`).
+    """
     documentation = []
     if fcn is None:
         return None
@@ -42,10 +59,20 @@ def document_function(
         html.Pre(get_entrypoint_string() + "\n" + get_version_string())
     )
 
+    pending = False
     if parameters:
-        tex = parse_function_expression(fcn, parameters, x_dict_keys=x_dict_keys)
+        tex = get_function_expression(fcn, parameters, x_dict_keys=x_dict_keys)
         if tex:
             documentation.append(html.P(fr"$${tex}$$"))
+        pending = is_function_expression_pending(fcn, parameters, x_dict_keys)
+    documentation.append(
+        dcc.Interval(
+            id="function-expression-interval",
+            interval=FUNCTION_EXPRESSION_INTERVAL,
+            max_intervals=FUNCTION_EXPRESSION_MAX_INTERVALS,
+            disabled=not pending,
+        )
+    )
 
     if hasattr(fcn, "__doc__") and fcn.__doc__:
         documentation.append(html.Pre(html.Code(fcn.__doc__)))
@@ -106,42 +133,186 @@ DEFAULT_PLOTS = [
 """Plots which are added to the GUI by default."""
 
 
+def get_figure(fit, data: Dict[str, Any]):
+    """Create the figure of a plot config (see :attr:`lsqfitgui.FitGUI.plots`)."""
+    kwargs = data.get("kwargs", {})
+    fcn = data.get("fcn")
+    static_data = data.get("static_plot_gvar", {})
+
+    fig = None
+    if fcn is not None:
+        fig = fcn(fit, **kwargs)
+    if static_data:
+        fig = plot_gvar(**static_data, fig=fig)
+    if fig is None:
+        raise ValueError(f"Could not infer figure from {data}")
+    return fig
+
+
 def get_figures(fit, plots: Optional[List[Dict[str, Any]]] = None):
     """Infers the figures to be plotted from the most recent fit and plot config."""
-    plots = plots or []
-    figure_data = []
-    for n, data in enumerate(plots):
-        kwargs = data.get("kwargs", {})
-        fcn = data.get("fcn")
-        static_data = data.get("static_plot_gvar", {})
-
-        fig = None
-        if fcn is not None:
-            fig = fcn(fit, **kwargs)
-        if static_data:
-            fig = plot_gvar(**static_data, fig=fig)
-        if fig is None:
-            raise ValueError(f"Could not infer figure from {data}")
-
-        figure_data.append(
-            {
-                "label": data.get("name", f"Figure {n}"),
-                "tab-value": f"figure-{n}",
-                "figure": fig,
-                "description": data.get("description"),
-            }
+    return [
+        {**get_plot_tab(data, n), "figure": get_figure(fit, data)}
+        for n, data in enumerate(plots or [])
+    ]
+
+
+def get_plot_tab(data: Dict[str, Any], n: int) -> Dict[str, Any]:
+    """Return label, tab value and description of the tab of the `n`-th plot."""
+    return {
+        "label": data.get("name", f"Figure {n}"),
+        "tab-value": f"figure-{n}",
+        "description": data.get("description"),
+    }
+
+
+def get_plot_index(tab_value: Optional[str]) -> Optional[int]:
+    """Return the index of the plot displayed in a tab of ``content-tabs``.
+
+    Returns ``None`` for tabs which do not display plots.
+    """
+    if tab_value and tab_value.startswith("figure-"):
+        return int(tab_value[len("figure-"):])
+    return None
+
+
+class FigureCache:
+    """Figures of the plots of a fit which are created once requested.
+
+    Only the figure of the active tab is created when the fit changes; figures of
+    other tabs are created once their tab is selected and cached until the fit changes.
+
+    Example:
+        Create the figures of the content for the selected tab::
+
+            cache = FigureCache()
+            cache.active = get_plot_index("figure-1")
+            figures = cache.get_figures(fit, plots)
+    """
+
+    def __init__(self):
+        """Initialize the cache with the first plot being active."""
+        self.active: Optional[int] = 0
+        """Index of the plot displayed in the active tab (``None`` for other tabs)."""
+        self._fit = None
+        self._figures: Dict[int, Any] = {}
+        self._lock = Lock()
+
+    def get_figure(self, fit, plots: List[Dict[str, Any]], n: int):
+        """Return the (cached) figure of the `n`-th plot for the fit.
+
+        Fits are identified by the fit object; fits returned by the fit cache for the
+        same fingerprint share their figures.
+        """
+        with self._lock:
+            if fit is not self._fit:
+                self._fit, self._figures = fit, {}
+            figures = self._figures
+        if n not in figures:
+            figures[n] = get_figure(fit, plots[n])
+        return figures[n]
+
+    def get_figures(
+        self, fit, plots: Optional[List[Dict[str, Any]]] = None, default: Any = None
+    ) -> List[Any]:
+        """Return the figure of the active plot and `default` for the other plots."""
+        return [
+            self.get_figure(fit, plots, n) if n == self.active else default
+            for n in range(len(plots or []))
+        ]
+
+
+FIT_CONTENT_NAMES = ("documentation", "summary", "details")
+"""Names of the ``fit-content`` elements of the default content in layout order."""
+
+
+def _get_x_dict_keys(fit) -> Optional[List[str]]:
+    return list(fit.x.keys()) if isinstance(fit.x, dict) else None
+
+
+def get_fit_documentation(fit) -> List[html.Base]:
+    """Document the fit function for the parameters of the fit."""
+    return document_function(fit.fcn, fit.p, x_dict_keys=_get_x_dict_keys(fit))
+
+
+def get_pending_fit_documentation(fit) -> Any:
+    """Return the fit documentation once the function expression is parsed.
+
+    Returns ``no_update`` while the expression is still parsed.
+    """
+    if is_function_expression_pending(fit.fcn, fit.p, _get_x_dict_keys(fit)):
+        return no_update
+    return get_fit_documentation(fit)
+
+
+def get_fit_strings(fit) -> Tuple[str, str]:
+    """Return the summary and the details of the fit."""
+    return str(fit), str(fit.format(maxline=True))
+
+
+def get_content_update(
+    fit,
+    plots: Optional[List[Dict[str, Any]]] = None,
+    timer: Optional[StageTimer] = None,
+    documentation: bool = True,
+    figure_cache: Optional[FigureCache] = None,
+) -> Tuple[List[Any], List[Any]]:
+    """Return the children of the ``fit-content`` elements and the figures for a fit.
+
+    The values update the elements of :func:`get_content` without recreating them
+    (see :data:`CONTENT_OUTPUTS`).
+    If `documentation` is false, the function documentation is not updated; it only
+    depends on the fit function and the structure of the parameters.
+    If a `figure_cache` is provided, only the figure of the active tab is updated.
+    """
+    with timed(timer, "figures"):
+        figures = (
+            figure_cache.get_figures(fit, plots, default=no_update)
+            if figure_cache is not None
+            else [data["figure"] for data in get_figures(fit, plots)]
         )
-    return figure_data
+    if documentation:
+        with timed(timer, "function documentation"):
+            fit_documentation = get_fit_documentation(fit)
+    else:
+        fit_documentation = no_update
+    with timed(timer, "fit format"):
+        fit_string, fit_details = get_fit_strings(fit)
+    return [fit_documentation, fit_string, fit_details], figures
 
 
 def get_content(
-    fit, name: str = "Lsqfit GUI", plots: Optional[List[Dict[str, Any]]] = None,
+    fit,
+    name: str = "Lsqfit GUI",
+    plots: Optional[List[Dict[str, Any]]] = None,
+    timer: Optional[StageTimer] = None,
+    figure_cache: Optional[FigureCache] = None,
 ):
     """Create default content block for fit object.
 
     This includes the plots for the data, residuals and details.
+    Elements which depend on the fit have ids such that they can be updated by
+    :data:`CONTENT_OUTPUTS`.
+    If a `timer` is provided, the durations of the function documentation, the
+    figures and the fit summary are recorded.
+    If a `figure_cache` is provided, only the figure of its active tab is created
+    (see :data:`CONTENT_TABS_CALLBACK_ARGS`).
     """
-    figure_data = get_figures(fit, plots)
+    plots = plots or []
+    with timed(timer, "figures"):
+        figures = (
+            figure_cache.get_figures(fit, plots)
+            if figure_cache is not None
+            else [data["figure"] for data in get_figures(fit, plots)]
+        )
+    figure_data = [
+        {**get_plot_tab(data, n), "figure": figure}
+        for n, (data, figure) in enumerate(zip(plots, figures))
+    ]
+    with timed(timer, "function documentation"):
+        documentation = get_fit_documentation(fit)
+    with timed(timer, "fit format"):
+        fit_string, fit_details = get_fit_strings(fit)
     content = html.Div(
         children=[
             html.H1(children=name),
@@ -150,16 +321,13 @@ def get_content(
                     [
                         html.H4("Fit function"),
                         html.Div(
-                            document_function(
-                                fit.fcn,
-                                fit.p,
-                                x_dict_keys=list(fit.x.keys())
-                                if isinstance(fit.x, dict)
-                                else None,
-                            )
+                            documentation,
+                            id={"type": "fit-content", "name": "documentation"},
                         ),
                         html.H4("Fit parameters"),
-                        html.Pre(str(fit)),
+                        html.Pre(
+                            fit_string, id={"type": "fit-content", "name": "summary"}
+                        ),
                     ],
                     className="col",
                 ),
@@ -168,7 +336,12 @@ def get_content(
             dcc.Tabs(
                 [
                     dcc.Tab(
-                        children=[dcc.Graph(figure=data["figure"])]
+                        children=[
+                            dcc.Graph(
+                                figure=data["figure"],
+                                id={"type": "fit-figure", "index": n},
+                            )
+                        ]
                         + (
                             [html.P(data["description"])]
                             if data.get("description")
@@ -177,11 +350,16 @@ def get_content(
                         label=data["label"],
                         value=data["tab-value"],
                     )
-                    for data in figure_data
+                    for n, data in enumerate(figure_data)
                 ]
                 + [
                     dcc.Tab(
-                        children=[html.Pre(str(fit.format(maxline=True)))],
+                        children=[
+                            html.Pre(
+                                fit_details,
+                                id={"type": "fit-content", "name": "details"},
+                            )
+                        ],
                         label="Details",
                         value="tab-details",
                     )
@@ -195,3 +373,34 @@ def get_content(
         ]
     )
     return content
+
+
+CONTENT_OUTPUTS = [
+    Output({"type": "fit-content", "name": ALL}, "children"),
+    Output({"type": "fit-figure", "index": ALL}, "figure"),
+]
+"""Outputs of the fit dependent elements of the default content.
+
+Values are provided by :func:`get_content_update`; wildcard outputs match no elements
+if the default content is not rendered.
+"""
+
+FUNCTION_EXPRESSION_CALLBACK_ARGS = (
+    Output(
+        {"type": "fit-content", "name": "documentation"},
+        "children",
+        allow_duplicate=True,
+    ),
+    Input("function-expression-interval", "n_intervals"),
+)
+"""Arguments of the callback which refreshes the documentation once the function
+expression is parsed (see :func:`get_pending_fit_documentation`)."""
+
+CONTENT_TABS_CALLBACK_ARGS = (
+    Output({"type": "fit-figure", "index": ALL}, "figure", allow_duplicate=True),
+    Input("content-tabs", "value"),
+)
+"""Arguments of the callback which creates the figure of a selected tab.
+
+The callback also runs on page load to restore the figure of a persisted tab.
+"""
@@ -2,28 +2,66 @@
 from typing import Optional, Dict, Any, Callable, List
 from os import path
 
-from dash import html
-from dash.dependencies import Input, Output
+from dash import html, dcc, no_update
+from dash.dependencies import Input, Output, State
+
+import dash_bootstrap_components as dbc
 
 from dash_bootstrap_components.themes import BOOTSTRAP
 
+import numpy as np
 from lsqfit import nonlinear_fit
 
 from lsqfitgui.frontend.sidebar import (
     get_sidebar,
+    use_prior_table,
     SIDEBAR_PRIOR_IDS_INPUT,
     SIDEBAR_PRIOR_VALUES_INPUT,
     SIDEBAR_META_INPUT,
+    PRIOR_TABLE_INPUT,
+    PRIOR_TABLE_STATE,
 )
 from lsqfitgui.frontend.sidebar import (  # noqa
     SAVE_FIT_CALLBACK_ARGS,
     EXPORT_PRIOR_CALLBACK_ARGS,
+    PRIOR_TABLE_CALLBACK_ARGS,
     toggle_prior_widget,
+    toggle_export_prior_widget,
+    get_prior_rows,
+    get_prior_inputs,
+    get_prior_page,
 )
 
-from lsqfitgui.frontend.content import get_content
-from lsqfitgui.frontend.content import FCN_SOURCE_CALLBACK, DEFAULT_PLOTS  # noqa
-from lsqfitgui.backend.sidebar import process_priors, process_meta
+from lsqfitgui.frontend.widgets.prior_delta import PRIOR_DELTA_INPUT, PRIOR_SYNC_OUTPUT
+
+from lsqfitgui.frontend.content import (
+    get_content,
+    get_content_update,
+    FigureCache,
+    CONTENT_OUTPUTS,
+    FIT_CONTENT_NAMES,
+)
+from lsqfitgui.frontend.content import (  # noqa
+    FCN_SOURCE_CALLBACK,
+    CONTENT_TABS_CALLBACK_ARGS,
+    FUNCTION_EXPRESSION_CALLBACK_ARGS,
+    DEFAULT_PLOTS,
+    get_plot_index,
+    get_pending_fit_documentation,
+)
+from lsqfitgui.backend.sidebar import (
+    get_prior_index,
+    get_prior_structure,
+    get_prior_from_flat,
+    parse_priors,
+    refit_with_prior,
+    process_meta,
+    get_fit_setup,
+)
+from lsqfitgui.backend.cache import FitCache, get_fit_fingerprint, cache_fit_by_prior
+from lsqfitgui.backend.blocks import refit_blocks
+from lsqfitgui.backend.sweep import MetaSweep
+from lsqfitgui.util.timing import StageTimer, timed
 
 
 def get_layout(
@@ -34,6 +72,8 @@ def get_layout(
     use_default_content: Optional[bool] = True,
     get_additional_content: Optional[Callable[[nonlinear_fit], html.Base]] = None,
     plots: Optional[List[Dict[str, Any]]] = None,
+    timer: Optional[StageTimer] = None,
+    figure_cache: Optional[FigureCache] = None,
 ) -> html.Div:
     """Create sidebar and content given fit and config values.
 
@@ -44,12 +84,22 @@ def get_layout(
         use_default_content: Render default GUI elements or not.
         get_additional_content: Function to return additional html content given a fit.
             This should be used for customizations.
+        timer: Records the durations of creating the sidebar and content.
+        figure_cache: Only create the figure of the active tab (see
+            :class:`lsqfitgui.frontend.content.FigureCache`).
     """
-    sidebar = get_sidebar(fit.prior, meta_config=meta_config, meta_values=meta_values)
-    sidebar.className = "sticky-top bg-light p-4"
-
-    content = get_content(fit, name=name, plots=plots) if use_default_content else None
-    additional_content = get_additional_content(fit) if get_additional_content else None
+    sidebar = _get_sidebar(fit, meta_config, meta_values, timer)
+    content = (
+        get_content(
+            fit, name=name, plots=plots, timer=timer, figure_cache=figure_cache
+        )
+        if use_default_content
+        else None
+    )
+    with timed(timer, "additional content"):
+        additional_content = (
+            get_additional_content(fit) if get_additional_content else None
+        )
 
     layout = html.Div(
         children=html.Div(
@@ -60,7 +110,10 @@ def get_layout(
                     id="sticky-sidebar",
                 ),
                 html.Div(
-                    children=[content, additional_content],
+                    children=[
+                        content,
+                        html.Div(additional_content, id="additional-content"),
+                    ],
                     className="col-xs-12 col-sm-6 col-md-7 col-xl-8 col-xxl-9",
                 ),
             ],
@@ -72,6 +125,123 @@ def get_layout(
     return layout
 
 
+def _get_sidebar(fit, meta_config, meta_values, timer) -> html.Div:
+    with timed(timer, "sidebar"):
+        sidebar = get_sidebar(
+            fit.prior, meta_config=meta_config, meta_values=meta_values
+        )
+    sidebar.className = "sticky-top bg-light p-4"
+    return sidebar
+
+
+def get_layout_update(
+    fit: nonlinear_fit,
+    meta_config: Optional[Dict[str, Any]] = None,
+    meta_values: Optional[Dict[str, Any]] = None,
+    use_default_content: Optional[bool] = True,
+    get_additional_content: Optional[Callable[[nonlinear_fit], html.Base]] = None,
+    plots: Optional[List[Dict[str, Any]]] = None,
+    timer: Optional[StageTimer] = None,
+    sidebar: bool = True,
+    prior_inputs: Optional[List[str]] = None,
+    figure_cache: Optional[FigureCache] = None,
+) -> List[Any]:
+    """Create the values of :data:`UPDATE_LAYOUT_OUTPUTS` for a new fit.
+
+    Instead of recreating the layout of :func:`get_layout`, only elements which depend
+    on the fit are updated. Elements which did not change are ``no_update``.
+    The sidebar stays mounted unless its prior inputs do not match the structure of the
+    prior; otherwise, the values of the prior inputs are updated in place.
+    The prior table of large priors only contains the current page and is recreated if
+    the prior inputs are updated.
+
+    Arguments:
+        fit: The lsqfit object which should be rendered.
+        meta_config: Meta information for the sidebar setup.
+        meta_values: Current values of the meta configuration.
+        use_default_content: Render default GUI elements or not.
+        get_additional_content: Function to return additional html content given a fit.
+        plots: Plots of the default content.
+        timer: Records the durations of creating the updated elements.
+        sidebar: Update the values of the prior inputs and the function documentation.
+            Both only change with the meta setup.
+        prior_inputs: Names of the prior inputs mounted in the browser or represented
+            by the prior table. Defaults to the inputs of the fit prior.
+        figure_cache: Only update the figure of the active tab (see
+            :class:`lsqfitgui.frontend.content.FigureCache`).
+    """
+    index = get_prior_index(get_prior_structure(fit.prior))
+    names = list(index.slots)
+    prior_inputs = names if prior_inputs is None else list(prior_inputs)
+    prior_values = [no_update] * get_n_prior_value_inputs(prior_inputs)
+    if prior_inputs != names or (sidebar and use_prior_table(index.size)):
+        sidebar_children = _get_sidebar(fit, meta_config, meta_values, timer)
+    else:
+        sidebar_children = no_update
+        if sidebar:
+            prior_values = index.encode(fit.prior)
+
+    content, figures = (
+        get_content_update(
+            fit,
+            plots=plots,
+            timer=timer,
+            documentation=sidebar,
+            figure_cache=figure_cache,
+        )
+        if use_default_content
+        else ([], [])
+    )
+    with timed(timer, "additional content"):
+        additional_content = (
+            get_additional_content(fit) if get_additional_content else no_update
+        )
+
+    return [
+        sidebar_children,
+        prior_values,
+        content,
+        figures,
+        additional_content,
+    ]
+
+
+def get_empty_layout_update(
+    use_default_content: Optional[bool] = True,
+    plots: Optional[List[Dict[str, Any]]] = None,
+    n_prior_inputs: int = 0,
+) -> List[Any]:
+    """Return values of :data:`UPDATE_LAYOUT_OUTPUTS` which do not change the layout.
+
+    Wildcard outputs require one ``no_update`` per element of the default content and
+    per mounted prior input.
+    """
+    n_content = len(FIT_CONTENT_NAMES) if use_default_content else 0
+    n_figures = len(plots or []) if use_default_content else 0
+    return [
+        no_update,
+        [no_update] * n_prior_inputs,
+        [no_update] * n_content,
+        [no_update] * n_figures,
+        no_update,
+    ]
+
+
+def get_n_prior_value_inputs(prior_inputs: List[str]) -> int:
+    """Return the number of mounted prior value inputs given the names of the inputs.
+
+    Prior inputs of priors which are edited in the prior table are not mounted.
+    """
+    return 0 if use_prior_table(len(prior_inputs) // 2) else len(prior_inputs)
+
+
+def get_updated_values(values: Any) -> Any:
+    """Remove ``no_update`` from (nested lists of) callback output values."""
+    if isinstance(values, (list, tuple)):
+        return [get_updated_values(val) for val in values if val is not no_update]
+    return values
+
+
 EXTERNAL_STYLESHEETS = [
     BOOTSTRAP,
     "https://cdn.jsdelivr.net/npm/katex@0.13.18/dist/katex.min.css",
@@ -85,16 +255,104 @@ MATHJAX_CDN = (
 EXTERNAL_SCRIPTS = [{"type": "text/javascript", "src": MATHJAX_CDN}]
 ASSETS = path.abspath(path.join(path.dirname(path.dirname(__file__)), "assets"))
 
+UPDATE_LAYOUT_OUTPUTS = (
+    [Output("sticky-sidebar", "children"), Output(*SIDEBAR_PRIOR_VALUES_INPUT)]
+    + CONTENT_OUTPUTS
+    + [Output("additional-content", "children")]
+)
+"""Outputs of elements which depend on the fit (see :func:`get_layout_update`)."""
+
 UPDATE_LAYOUT_CALLBACK_ARGS = (
-    Output("body", "children"),
+    UPDATE_LAYOUT_OUTPUTS,
     [
         Input(*SIDEBAR_PRIOR_IDS_INPUT),
         Input(*SIDEBAR_PRIOR_VALUES_INPUT),
         Input(*SIDEBAR_META_INPUT),
+        Input(*PRIOR_TABLE_INPUT),
+    ],
+    [State(*PRIOR_TABLE_STATE)],
+)
+
+UPDATE_LAYOUT_BACKGROUND_CALLBACK_ARGS = (
+    UPDATE_LAYOUT_OUTPUTS
+    + [
+        Output("fit-status", "children"),
+        Output("fit-status-interval", "disabled"),
+    ],
+    [
+        Input(*SIDEBAR_PRIOR_IDS_INPUT),
+        Input(*SIDEBAR_PRIOR_VALUES_INPUT),
+        Input(*SIDEBAR_META_INPUT),
+        Input("fit-status-interval", "n_intervals"),
+        Input(*PRIOR_TABLE_INPUT),
+    ],
+    [State(*PRIOR_TABLE_STATE)],
+)
+
+UPDATE_LAYOUT_DELTA_OUTPUTS = (
+    [Output("sticky-sidebar", "children"), Output(*PRIOR_SYNC_OUTPUT)]
+    + CONTENT_OUTPUTS
+    + [Output("additional-content", "children")]
+)
+"""Outputs of :data:`UPDATE_LAYOUT_OUTPUTS` where prior inputs are updated by a store.
+
+See :mod:`lsqfitgui.frontend.widgets.prior_delta`.
+"""
+
+UPDATE_LAYOUT_DELTA_CALLBACK_ARGS = (
+    UPDATE_LAYOUT_DELTA_OUTPUTS,
+    [
+        Input(*PRIOR_DELTA_INPUT),
+        Input(*SIDEBAR_META_INPUT),
+        Input(*PRIOR_TABLE_INPUT),
+    ],
+    [State(*PRIOR_TABLE_STATE)],
+)
+
+UPDATE_LAYOUT_BACKGROUND_DELTA_CALLBACK_ARGS = (
+    UPDATE_LAYOUT_DELTA_OUTPUTS
+    + [
+        Output("fit-status", "children"),
+        Output("fit-status-interval", "disabled"),
+    ],
+    [
+        Input(*PRIOR_DELTA_INPUT),
+        Input(*SIDEBAR_META_INPUT),
+        Input("fit-status-interval", "n_intervals"),
+        Input(*PRIOR_TABLE_INPUT),
     ],
+    [State(*PRIOR_TABLE_STATE)],
 )
 
 
+def get_fit_status_widgets(interval: int = 250) -> List[html.Base]:
+    """Create status badge and polling interval for fits running in the background.
+
+    Arguments:
+        interval: Time in milliseconds between polls for fit results.
+    """
+    return [
+        html.Div(id="fit-status", className="position-fixed top-0 end-0 m-3"),
+        dcc.Interval(id="fit-status-interval", interval=interval, disabled=True),
+    ]
+
+
+def get_fit_status(
+    error: Optional[BaseException] = None, preview: bool = False
+) -> html.Base:
+    """Return badge indicating a running fit or an error of the last fit.
+
+    Arguments:
+        error: The error raised by the last fit.
+        preview: Indicate that the displayed results are an approximate preview.
+    """
+    if error is not None:
+        return dbc.Badge(f"Fit failed: {error}", color="danger")
+    elif preview:
+        return dbc.Badge("Approximate preview, fitting...", color="info")
+    return dbc.Badge("Fitting...", color="warning", className="text-dark")
+
+
 def update_layout_from_prior(
     prior,
     initial_fit,
@@ -104,23 +362,62 @@ def update_layout_from_prior(
     use_default_content: Optional[bool] = True,
     get_additional_content: Optional[Callable] = None,
     plots: Optional[List[Dict[str, Any]]] = None,
+    warm_start: bool = False,
+    fit_cache: Optional[FitCache] = None,
+    incremental_refit: bool = False,
+    timer: Optional[StageTimer] = None,
+    partial: bool = False,
+    prior_inputs: Optional[List[str]] = None,
+    figure_cache: Optional[FigureCache] = None,
 ):
     """Parse prior form input values to create new layout.
 
     Creates new fit object for new prior and calls get_layout.
+    The `prior` are the flat prior form values or an array of flat prior means and
+    standard deviations (see :func:`lsqfitgui.backend.sidebar.get_flat_prior`), which
+    is not parsed again.
+    If `warm_start` is true, the new fit is seeded by the posterior of `initial_fit`.
+    If a `fit_cache` is provided, fits are looked up by their meta setup, prior
+    and fit function before refitting.
+    If `incremental_refit` is true, only independent blocks of the fit which are
+    affected by the prior change are refitted.
+    If a `timer` is provided, the durations of all stages are recorded.
+    If a `figure_cache` is provided, only the figure of the active tab is created.
+    If `partial` is true, the values of :data:`UPDATE_LAYOUT_OUTPUTS` are returned
+    instead of the layout (see :func:`get_layout_update`; `prior_inputs` are the names
+    of the mounted prior inputs).
     """
     setup = process_meta(setup, meta_config) if setup else None
-    new_fit = process_priors(prior, initial_fit)
+    with timed(timer, "parse priors"):
+        new_prior = (
+            get_prior_from_flat(prior, initial_fit.prior)
+            if isinstance(prior, np.ndarray)
+            else parse_priors(prior, initial_fit.prior)
+        )
+    with timed(timer, "cache lookup"):
+        key = get_fit_fingerprint(setup=setup, prior=new_prior, fcn=initial_fit.fcn)
+        new_fit = fit_cache.get(key) if fit_cache is not None else None
+    if new_fit is None:
+        refit = refit_blocks if incremental_refit else refit_with_prior
+        with timed(timer, "refit"):
+            new_fit = refit(new_prior, initial_fit, warm_start=warm_start)
+        if fit_cache is not None:
+            fit_cache[key] = new_fit
+    kwargs = dict(
+        meta_config=meta_config,
+        meta_values=setup,
+        use_default_content=use_default_content,
+        get_additional_content=get_additional_content,
+        plots=plots,
+        timer=timer,
+        figure_cache=figure_cache,
+    )
     return (
-        get_layout(
-            new_fit,
-            name=name,
-            meta_config=meta_config,
-            meta_values=setup,
-            use_default_content=use_default_content,
-            get_additional_content=get_additional_content,
-            plots=plots,
-        ),
+        get_layout_update(
+            new_fit, sidebar=False, prior_inputs=prior_inputs, **kwargs
+        )
+        if partial
+        else get_layout(new_fit, name=name, **kwargs),
         new_fit,
     )
 
@@ -134,24 +431,50 @@ def update_layout_from_meta(
     use_default_content: Optional[bool] = True,
     get_additional_content: Optional[Callable] = None,
     plots: Optional[List[Dict[str, Any]]] = None,
+    fit_cache: Optional[FitCache] = None,
+    timer: Optional[StageTimer] = None,
+    partial: bool = False,
+    prior_inputs: Optional[List[str]] = None,
+    figure_cache: Optional[FigureCache] = None,
+    meta_sweep: Optional[MetaSweep] = None,
 ):
     """Parse meta form input values to create new layout.
 
     Creates new fit object for new meta data and prior (using fit_setup_function)
     and calls get_layout.
+    If a `meta_sweep` or a `fit_cache` is provided, fits are looked up by their setup
+    in the sweep results and the cache before calling the fit_setup_function.
+    If a `timer` is provided, the durations of all stages are recorded.
+    If a `figure_cache` is provided, only the figure of the active tab is created.
+    If `partial` is true, the values of :data:`UPDATE_LAYOUT_OUTPUTS` are returned
+    instead of the layout (see :func:`get_layout_update`; `prior_inputs` are the names
+    of the mounted prior inputs).
     """
-    setup = process_meta(inp, meta_config)
-    setup = {key: setup.get(key) or val for key, val in fit_setup_kwargs.items()}
-    new_fit = fit_setup_function(**setup)
+    meta_values = process_meta(inp, meta_config)
+    setup = get_fit_setup(inp, meta_config, fit_setup_kwargs)
+    with timed(timer, "cache lookup"):
+        key = get_fit_fingerprint(setup=setup, fcn=fit_setup_function)
+        new_fit = meta_sweep.get(setup) if meta_sweep is not None else None
+        if new_fit is None and fit_cache is not None:
+            new_fit = fit_cache.get(key)
+    if new_fit is None:
+        with timed(timer, "fit setup"):
+            new_fit = fit_setup_function(**setup)
+        if fit_cache is not None:
+            fit_cache[key] = new_fit
+            cache_fit_by_prior(fit_cache, new_fit, meta_values or None)
+    kwargs = dict(
+        meta_config=meta_config,
+        meta_values=setup,
+        use_default_content=use_default_content,
+        get_additional_content=get_additional_content,
+        plots=plots,
+        timer=timer,
+        figure_cache=figure_cache,
+    )
     return (
-        get_layout(
-            new_fit,
-            name=name,
-            meta_config=meta_config,
-            meta_values=setup,
-            use_default_content=use_default_content,
-            get_additional_content=get_additional_content,
-            plots=plots,
-        ),
+        get_layout_update(new_fit, prior_inputs=prior_inputs, **kwargs)
+        if partial
+        else get_layout(new_fit, name=name, **kwargs),
         new_fit,
     )
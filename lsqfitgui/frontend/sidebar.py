@@ -8,10 +8,25 @@ from dash.dependencies import ALL, Input, Output
 
 import dash_bootstrap_components as dbc
 
+from lsqfitgui.backend.sidebar import get_prior_index, get_prior_structure
+from lsqfitgui.frontend.widgets.prior_table import (  # noqa
+    get_prior_table_widget,
+    get_prior_rows,
+    get_prior_inputs,
+    get_prior_page,
+    use_prior_table,
+    PRIOR_TABLE_CALLBACK_ARGS,
+    PRIOR_TABLE_INPUT,
+    PRIOR_TABLE_STATE,
+)
 from lsqfitgui.frontend.widgets.export_prior import (  # noqa
     get_export_prior_widget,
+    get_export_prior_strings,
     EXPORT_PRIOR_CALLBACK_ARGS,
+    EXPORT_PRIOR_OUTPUTS,
+    EXPORT_PRIOR_FORMATS,
     toggle_prior_widget,
+    toggle_export_prior_widget,
 )
 
 SIDEBAR_STYLE = {"overflow-y": "auto", "height": "100vh"}
@@ -45,7 +60,15 @@ def get_sidebar(
     meta_config: Optional[Dict] = None,
     meta_values: Optional[Dict] = None,
 ):
-    """Create sidebar."""
+    """Create sidebar.
+
+    Also builds the index which maps prior inputs to prior entries
+    (see :func:`lsqfitgui.backend.sidebar.get_prior_index`) for this prior structure.
+    Priors with many entries are edited in a paginated table
+    (see :func:`lsqfitgui.frontend.widgets.prior_table.use_prior_table`).
+    """
+    index = get_prior_index(get_prior_structure(elements))
+
     if meta_config is not None:
         meta_elements = [html.H4("Meta")]
         for config in meta_config:
@@ -74,6 +97,38 @@ def get_sidebar(
     else:
         meta_elements = []
 
+    return html.Div(
+        children=meta_elements
+        + [
+            html.H4("Priors"),
+            get_prior_table_widget(elements)
+            if use_prior_table(index.size)
+            else get_prior_form(elements),
+            html.Hr(),
+            html.Div(
+                [
+                    get_export_prior_widget(),
+                    html.Span(
+                        [
+                            html.Button(
+                                "Save fit",
+                                id="save-fit-btn",
+                                className="btn btn-outline-success",
+                            ),
+                            dcc.Download(id="save-fit"),
+                        ],
+                        className="ms-2",
+                    ),
+                ],
+                className="text-end",
+            ),
+        ],
+        style=SIDEBAR_STYLE,
+    )
+
+
+def get_prior_form(elements: Dict[str, GVar]) -> dbc.Form:
+    """Create form with one mean and one sdev input per prior entry."""
     table_rows = []
     for key, val in elements.items():
         if hasattr(val, "__len__"):
@@ -104,44 +159,17 @@ def get_sidebar(
             ]
             table_rows.append(html.Tr(row_content))
 
-    return html.Div(
-        children=meta_elements
-        + [
-            html.H4("Priors"),
-            dbc.Form(
-                dbc.Table(
-                    [
-                        html.Thead(
-                            html.Tr([html.Th("name"), html.Th("mean"), html.Th("sdev")])
-                        ),
-                        html.Tbody(table_rows),
-                    ],
-                    borderless=True,
-                    responsive=False,
-                    className="table-sm",
-                ),
-                id="prior-form",
-            ),
-            html.Hr(),
-            html.Div(
-                [
-                    get_export_prior_widget(elements),
-                    html.Span(
-                        [
-                            html.Button(
-                                "Save fit",
-                                id="save-fit-btn",
-                                className="btn btn-outline-success",
-                            ),
-                            dcc.Download(id="save-fit"),
-                        ],
-                        className="ms-2",
-                    ),
-                ],
-                className="text-end",
-            ),
-        ],
-        style=SIDEBAR_STYLE,
+    return dbc.Form(
+        dbc.Table(
+            [
+                html.Thead(html.Tr([html.Th("name"), html.Th("mean"), html.Th("sdev")])),
+                html.Tbody(table_rows),
+            ],
+            borderless=True,
+            responsive=False,
+            className="table-sm",
+        ),
+        id="prior-form",
     )
 
 
@@ -1,5 +1,5 @@
 """Widget for exporting priors."""
-from typing import Dict
+from typing import Dict, List, Any, Optional
 
 import json
 import yaml
@@ -7,7 +7,7 @@ import yaml
 from numpy import ndarray
 from gvar import GVar, gdumps, BufferDict
 
-from dash import html
+from dash import html, no_update
 from dash.dependencies import Input, Output, State
 
 import dash_bootstrap_components as dbc
@@ -48,12 +48,32 @@ def gv_dict_to_yaml(gv_dict, gv_as_string: bool = True, **kwargs):
     return yaml.dump(output, **kwargs)
 
 
-def get_export_prior_widget(prior: Dict[str, GVar]) -> html.Div:
-    """Create a modal which contains copyable strings for exporting the prior."""
+EXPORT_PRIOR_FORMATS = ("json", "gdumps", "yaml")
+"""Formats of the exported prior."""
+
+
+def get_export_prior_strings(prior: Dict[str, GVar]) -> Dict[str, str]:
+    """Return the prior as strings in the export formats."""
     prior = {str(key): val for key, val in prior.items()}
-    prior_json = json.dumps(prior, indent=4, cls=GVarEncoder)
-    prior_gdumps = gdumps(prior, method="json")
-    prior_yaml = gv_dict_to_yaml(prior, indent=4)
+    return {
+        "json": json.dumps(prior, indent=4, cls=GVarEncoder),
+        "gdumps": gdumps(prior, method="json"),
+        "yaml": gv_dict_to_yaml(prior, indent=4),
+    }
+
+
+def get_export_prior_widget(prior: Optional[Dict[str, GVar]] = None) -> html.Div:
+    """Create a modal which contains copyable strings for exporting the prior.
+
+    The strings are the children of the ``export-prior-{format}`` elements.
+    If no prior is given, the strings are filled in once the modal opens
+    (see :func:`toggle_export_prior_widget`).
+    """
+    strings = (
+        get_export_prior_strings(prior)
+        if prior is not None
+        else dict.fromkeys(EXPORT_PRIOR_FORMATS, "")
+    )
     modal = html.Span(
         [
             html.Button(
@@ -70,23 +90,14 @@ def get_export_prior_widget(prior: Dict[str, GVar]) -> html.Div:
                             [
                                 dbc.Tab(
                                     html.Pre(
-                                        html.Code(prior_json), className="bg-light p-4",
-                                    ),
-                                    label="json",
-                                ),
-                                dbc.Tab(
-                                    html.Pre(
-                                        html.Code(prior_gdumps),
+                                        html.Code(
+                                            strings[fmt], id=f"export-prior-{fmt}"
+                                        ),
                                         className="bg-light p-4",
                                     ),
-                                    label="gdumps",
-                                ),
-                                dbc.Tab(
-                                    html.Pre(
-                                        html.Code(prior_yaml), className="bg-light p-4",
-                                    ),
-                                    label="yaml",
-                                ),
+                                    label=fmt,
+                                )
+                                for fmt in EXPORT_PRIOR_FORMATS
                             ]
                         )
                     ),
@@ -116,8 +127,22 @@ def toggle_prior_widget(n1, n2, is_open):
     return is_open
 
 
+def toggle_export_prior_widget(
+    prior: Dict[str, GVar], n1, n2, is_open
+) -> List[Any]:
+    """Return modal state and, if the modal opens, the export strings of the prior."""
+    is_open = toggle_prior_widget(n1, n2, is_open)
+    strings = get_export_prior_strings(prior) if is_open else {}
+    return [is_open] + [strings.get(fmt, no_update) for fmt in EXPORT_PRIOR_FORMATS]
+
+
+EXPORT_PRIOR_OUTPUTS = [
+    Output(f"export-prior-{fmt}", "children") for fmt in EXPORT_PRIOR_FORMATS
+]
+"""Outputs of the export strings, ordered like :data:`EXPORT_PRIOR_FORMATS`."""
+
 EXPORT_PRIOR_CALLBACK_ARGS = (
-    Output("prior-modal", "is_open"),
+    [Output("prior-modal", "is_open")] + EXPORT_PRIOR_OUTPUTS,
     [Input("export-prior-button", "n_clicks"), Input("close-prior-button", "n_clicks")],
     [State("prior-modal", "is_open")],
 )
@@ -0,0 +1,70 @@
+"""Stores which send only changed prior inputs to the server.
+
+A clientside callback (``assets/prior-delta.js``) compares the prior inputs with a
+snapshot in the browser and writes changed inputs to the ``prior-delta`` store, which
+triggers the layout update instead of the values of all prior inputs.
+Values of mounted prior inputs are updated by the server through the ``prior-sync``
+store.
+"""
+from typing import Dict, List, Any, Optional, Tuple
+
+from dash import dcc, no_update
+from dash.dependencies import ALL, ClientsideFunction, Input, Output, State
+
+
+def get_prior_delta_stores() -> List[dcc.Store]:
+    """Create stores of changed prior inputs, server updates and the input snapshot."""
+    return [
+        dcc.Store(id="prior-delta"),
+        dcc.Store(id="prior-sync"),
+        dcc.Store(id="prior-snapshot"),
+    ]
+
+
+def apply_prior_delta(
+    values: Dict[str, Any], delta: Optional[Dict[str, Any]]
+) -> Tuple[List[Dict[str, str]], List[Any]]:
+    """Apply changed prior inputs to the input values and return all ids and values.
+
+    Changes of inputs which are not in `values` (e.g., inputs of a previous prior
+    structure) are ignored.
+
+    Arguments:
+        values: Values of all prior inputs by input name; updated in place.
+        delta: Data of the ``prior-delta`` store.
+    """
+    changes = (delta or {}).get("changes", {})
+    values.update((name, val) for name, val in changes.items() if name in values)
+    ids = [{"type": "prior", "name": name} for name in values]
+    return ids, list(values.values())
+
+
+def get_prior_sync(names: List[str], values: List[Any]) -> Any:
+    """Return data of the ``prior-sync`` store given updated prior input values."""
+    updated = {
+        name: value for name, value in zip(names, values) if value is not no_update
+    }
+    return {"values": updated} if updated else no_update
+
+
+PRIOR_DELTA_CALLBACK_ARGS = (
+    ClientsideFunction(namespace="lsqfitgui", function_name="trackPriorChanges"),
+    [
+        Output({"type": "prior", "name": ALL}, "value"),
+        Output("prior-snapshot", "data"),
+        Output("prior-delta", "data"),
+    ],
+    [
+        Input({"type": "prior", "name": ALL}, "value"),
+        Input("prior-sync", "data"),
+    ],
+    [
+        State({"type": "prior", "name": ALL}, "id"),
+        State("prior-snapshot", "data"),
+        State("prior-delta", "data"),
+    ],
+)
+"""Arguments of the clientside callback which tracks changed prior inputs."""
+
+PRIOR_DELTA_INPUT = ("prior-delta", "data")
+PRIOR_SYNC_OUTPUT = ("prior-sync", "data")
@@ -0,0 +1,137 @@
+"""Widget for editing large priors in a paginated table."""
+from typing import Dict, List, Optional, Tuple
+
+from fnmatch import fnmatchcase
+
+import gvar as gv
+
+from dash import html, dash_table
+from dash.dependencies import ALL, Input, Output
+
+import dash_bootstrap_components as dbc
+
+from lsqfitgui.backend.sidebar import get_prior_index, get_prior_structure
+
+PRIOR_TABLE_THRESHOLD = 200
+"""Priors with more entries are edited in a paginated table instead of inputs."""
+
+PRIOR_TABLE_PAGE_SIZE = 100
+"""Number of prior entries per page of the table."""
+
+
+def use_prior_table(n_entries: int) -> bool:
+    """Return if a prior with `n_entries` entries is edited in the prior table."""
+    return n_entries > PRIOR_TABLE_THRESHOLD
+
+
+def get_prior_rows(prior: gv.BufferDict) -> Dict[str, Dict[str, str]]:
+    """Return the table rows of the prior entries by entry name.
+
+    Entry names match the sidebar inputs, i.e., ``{key}__array_{n}`` for array valued
+    priors and ``{key}`` for scalar priors (see
+    :class:`lsqfitgui.backend.sidebar.PriorIndex`).
+    """
+    index = get_prior_index(get_prior_structure(prior))
+    values = index.encode(prior)
+    names = [name.rsplit("-", 1)[0] for name in index.slots if name.endswith("-mean")]
+    return {
+        name: {"name": name, "mean": mean, "sdev": sdev}
+        for name, mean, sdev in zip(names, values[::2], values[1::2])
+    }
+
+
+def get_prior_inputs(
+    rows: Dict[str, Dict[str, str]]
+) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Return ids and values of the prior inputs represented by the table rows."""
+    ids, values = [], []
+    for name, row in rows.items():
+        for kind in ("mean", "sdev"):
+            ids.append({"type": "prior", "name": f"{name}-{kind}"})
+            values.append(row[kind])
+    return ids, values
+
+
+def filter_prior_rows(
+    rows: List[Dict[str, str]], pattern: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """Return rows whose name matches the pattern.
+
+    Patterns containing ``*``, ``?`` or ``[`` are matched as shell-style wildcards
+    against the full name; other patterns match parts of the name.
+    """
+    if not pattern:
+        return rows
+    if any(char in pattern for char in "*?["):
+        return [row for row in rows if fnmatchcase(row["name"], pattern)]
+    return [row for row in rows if pattern in row["name"]]
+
+
+def get_prior_page(
+    rows: Dict[str, Dict[str, str]],
+    page_current: Optional[int] = 0,
+    page_size: int = PRIOR_TABLE_PAGE_SIZE,
+    pattern: Optional[str] = None,
+) -> Tuple[List[Dict[str, str]], int]:
+    """Return the rows of the current page of the filtered rows and the number of pages."""
+    filtered = filter_prior_rows(list(rows.values()), pattern)
+    page_count = max(-(-len(filtered) // page_size), 1)
+    start = min(page_current or 0, page_count - 1) * page_size
+    return filtered[slice(start, start + page_size)], page_count
+
+
+def get_prior_table_widget(
+    prior: gv.BufferDict, page_size: int = PRIOR_TABLE_PAGE_SIZE
+) -> html.Div:
+    """Create a paginated table of prior means and standard deviations.
+
+    Only the current page is sent to the browser. Pages and filtering by entry name are
+    provided by the prior table callback; edits of the page trigger refits.
+    """
+    rows = get_prior_rows(prior)
+    data, page_count = get_prior_page(rows, page_size=page_size)
+    return html.Div(
+        [
+            dbc.Input(
+                id={"type": "prior-table-filter", "index": 0},
+                placeholder="Filter names, e.g., a__array_1*",
+                debounce=True,
+                className="form-control-sm mb-2",
+            ),
+            dash_table.DataTable(
+                id={"type": "prior-table", "index": 0},
+                columns=[
+                    {"name": "name", "id": "name", "editable": False},
+                    {"name": "mean", "id": "mean"},
+                    {"name": "sdev", "id": "sdev"},
+                ],
+                data=data,
+                editable=True,
+                page_action="custom",
+                page_current=0,
+                page_size=page_size,
+                page_count=page_count,
+                virtualization=True,
+                fixed_rows={"headers": True},
+                style_table={"maxHeight": "60vh", "overflowY": "auto"},
+                style_cell={"fontSize": "small", "textAlign": "left"},
+            ),
+            html.Small(f"{len(rows)} prior entries", className="text-muted"),
+        ]
+    )
+
+
+PRIOR_TABLE_CALLBACK_ARGS = (
+    [
+        Output({"type": "prior-table", "index": ALL}, "data"),
+        Output({"type": "prior-table", "index": ALL}, "page_count"),
+    ],
+    [
+        Input({"type": "prior-table", "index": ALL}, "page_current"),
+        Input({"type": "prior-table", "index": ALL}, "page_size"),
+        Input({"type": "prior-table-filter", "index": ALL}, "value"),
+    ],
+)
+
+PRIOR_TABLE_INPUT = ({"type": "prior-table", "index": ALL}, "data_timestamp")
+PRIOR_TABLE_STATE = ({"type": "prior-table", "index": ALL}, "data")
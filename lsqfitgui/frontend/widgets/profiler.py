@@ -0,0 +1,133 @@
+"""Widget for profiling GUI updates with ``cProfile``."""
+from typing import Dict, List, Any
+
+from dash import html, dcc
+from dash.dependencies import Input, Output, State
+
+import dash_bootstrap_components as dbc
+
+
+def get_profile_status(remaining: int, n_profiled: int) -> str:
+    """Return the status text of the profiler."""
+    status = f"{n_profiled} update(s) profiled"
+    return status + (f", profiling next {remaining}" if remaining > 0 else "")
+
+
+def get_profile_table(rows: List[Dict[str, Any]]) -> html.Base:
+    """Create table of the top functions (see :meth:`lsqfitgui.util.profiling.CallbackProfiler.get_top_functions`)."""  # noqa: E501
+    if not rows:
+        return html.P("No updates profiled yet.", className="text-muted small mb-0")
+    return dbc.Table(
+        [
+            html.Thead(
+                html.Tr(
+                    [html.Th(col) for col in ["Function", "Calls", "Own", "Cumulative"]]
+                )
+            ),
+            html.Tbody(
+                [
+                    html.Tr(
+                        [
+                            html.Td(html.Code(row["function"]), className="text-break"),
+                            html.Td(row["ncalls"]),
+                            html.Td(f"{1000 * row['tottime']:.1f} ms"),
+                            html.Td(f"{1000 * row['cumtime']:.1f} ms"),
+                        ]
+                    )
+                    for row in rows
+                ]
+            ),
+        ],
+        size="sm",
+        className="mb-0 small",
+    )
+
+
+def get_profiler_widget(
+    n_calls: int = 1, armed: bool = False, interval: int = 1000
+) -> html.Div:
+    """Create collapsible panel which profiles the next updates.
+
+    Arguments:
+        n_calls: Initial number of updates which are profiled once switched on.
+        armed: Initial value of the switch.
+        interval: Time in milliseconds between table updates while profiling.
+    """
+    return html.Div(
+        [
+            html.Button(
+                "Profiler",
+                id="profiler-button",
+                n_clicks=0,
+                className="btn btn-outline-secondary btn-sm",
+            ),
+            dbc.Collapse(
+                dbc.Card(
+                    dbc.CardBody(
+                        [
+                            dbc.Row(
+                                [
+                                    dbc.Col(
+                                        dbc.Switch(
+                                            id="profile-switch",
+                                            label="Profile next updates",
+                                            value=armed,
+                                        )
+                                    ),
+                                    dbc.Col(
+                                        dbc.Input(
+                                            id="profile-calls",
+                                            type="number",
+                                            min=1,
+                                            step=1,
+                                            value=n_calls,
+                                            size="sm",
+                                        ),
+                                        width=3,
+                                    ),
+                                ]
+                            ),
+                            html.Div(id="profile-status", className="small text-muted"),
+                            html.Div(id="profile-table", className="my-2"),
+                            html.Button(
+                                "Download .prof",
+                                id="profile-download-btn",
+                                n_clicks=0,
+                                className="btn btn-outline-success btn-sm",
+                            ),
+                            dcc.Download(id="profile-download"),
+                        ],
+                        className="p-2",
+                    ),
+                    style={
+                        "maxWidth": "40rem",
+                        "maxHeight": "60vh",
+                        "overflowY": "auto",
+                    },
+                ),
+                id="profiler-collapse",
+                is_open=False,
+                className="mt-2",
+            ),
+            dcc.Interval(id="profile-interval", interval=interval, disabled=True),
+        ],
+    )
+
+
+PROFILER_CALLBACK_ARGS = (
+    [
+        Output("profiler-collapse", "is_open"),
+        Output("profile-status", "children"),
+        Output("profile-table", "children"),
+        Output("profile-download", "data"),
+        Output("profile-interval", "disabled"),
+    ],
+    [
+        Input("profiler-button", "n_clicks"),
+        Input("profile-switch", "value"),
+        Input("profile-calls", "value"),
+        Input("profile-download-btn", "n_clicks"),
+        Input("profile-interval", "n_intervals"),
+    ],
+    [State("profiler-collapse", "is_open")],
+)
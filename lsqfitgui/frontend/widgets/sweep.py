@@ -0,0 +1,50 @@
+"""Widget for computing fits for all combinations of meta values."""
+from typing import Tuple
+
+from dash import html, dcc
+from dash.dependencies import Input, Output
+
+import dash_bootstrap_components as dbc
+
+
+def get_sweep_widget(n_points: int, interval: int = 500) -> html.Div:
+    """Create button and progress bar for sweeping the meta grid.
+
+    Arguments:
+        n_points: Number of points of the meta grid.
+        interval: Time in milliseconds between progress updates.
+    """
+    return html.Div(
+        [
+            html.Button(
+                f"Sweep meta grid ({n_points} fits)",
+                id="sweep-button",
+                n_clicks=0,
+                className="btn btn-outline-primary btn-sm",
+            ),
+            dbc.Progress(id="sweep-progress", value=0, className="mt-2"),
+            dcc.Interval(id="sweep-interval", interval=interval, disabled=True),
+        ],
+        className="position-fixed bottom-0 end-0 m-3",
+        style={"minWidth": "12rem", "zIndex": 1030},
+    )
+
+
+def get_sweep_progress(
+    n_done: int, n_total: int, n_failed: int = 0
+) -> Tuple[float, str]:
+    """Return progress bar value and label for the sweep state."""
+    value = 100 * n_done / n_total if n_total else 0
+    label = f"{n_done}/{n_total}" + (f" ({n_failed} failed)" if n_failed else "")
+    return value, label
+
+
+SWEEP_CALLBACK_ARGS = (
+    [
+        Output("sweep-progress", "value"),
+        Output("sweep-progress", "label"),
+        Output("sweep-interval", "disabled"),
+        Output("sweep-button", "disabled"),
+    ],
+    [Input("sweep-button", "n_clicks"), Input("sweep-interval", "n_intervals")],
+)
@@ -0,0 +1,78 @@
+"""Widget for displaying durations of the stages of GUI updates."""
+from typing import Optional, Dict, List, Any
+
+from dash import html, dcc
+from dash.dependencies import Input, Output, State
+
+import dash_bootstrap_components as dbc
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{1000 * seconds:.1f} ms"
+
+
+def get_timing_table(stats: List[Dict[str, Any]]) -> html.Base:
+    """Create table of stage durations (see :meth:`lsqfitgui.util.timing.StageTimer.get_stats`)."""  # noqa: E501
+    if not stats:
+        return html.P("No updates timed yet.", className="text-muted small mb-0")
+    return dbc.Table(
+        [
+            html.Thead(
+                html.Tr(
+                    [html.Th(col) for col in ["Stage", "Latest", "p50", "p95", "n"]]
+                )
+            ),
+            html.Tbody(
+                [
+                    html.Tr(
+                        [
+                            html.Td(row["stage"]),
+                            html.Td(_format_seconds(row["latest"])),
+                            html.Td(_format_seconds(row["p50"])),
+                            html.Td(_format_seconds(row["p95"])),
+                            html.Td(row["count"]),
+                        ]
+                    )
+                    for row in stats
+                ]
+            ),
+        ],
+        size="sm",
+        className="mb-0 small",
+    )
+
+
+def get_timing_widget(interval: int = 1000) -> html.Div:
+    """Create collapsible panel which displays stage durations.
+
+    Arguments:
+        interval: Time in milliseconds between table updates while the panel is open.
+    """
+    return html.Div(
+        [
+            html.Button(
+                "Timings",
+                id="timing-button",
+                n_clicks=0,
+                className="btn btn-outline-secondary btn-sm",
+            ),
+            dbc.Collapse(
+                dbc.Card(dbc.CardBody(id="timing-table", className="p-2")),
+                id="timing-collapse",
+                is_open=False,
+                className="mt-2",
+            ),
+            dcc.Interval(id="timing-interval", interval=interval, disabled=True),
+        ],
+    )
+
+
+TIMING_CALLBACK_ARGS = (
+    [
+        Output("timing-collapse", "is_open"),
+        Output("timing-table", "children"),
+        Output("timing-interval", "disabled"),
+    ],
+    [Input("timing-button", "n_clicks"), Input("timing-interval", "n_intervals")],
+    [State("timing-collapse", "is_open")],
+)
@@ -3,31 +3,93 @@
 The :class:`FitGUI` class provides the interface to `lsqfit` providing dynamic html elements which can be embedded into a dash (flask) app.
 The :func:`run_server` method provides a convinient interafce which also starts the Dash app which is accessible by any (local) browser.
 """  # noqa: E501
-from typing import Optional, Callable, Dict, List, Any
+from typing import Optional, Callable, Dict, List, Any, Union, Sequence
 
+import json
+from os import path
 from tempfile import NamedTemporaryFile
+from concurrent.futures import ProcessPoolExecutor
 
-from numpy import eye, allclose
-from gvar import dumps, evalcorr
+from gvar import dumps
 from lsqfit import nonlinear_fit
-from lsqfit._extras import unchained_nonlinear_fit
+from lsqfit._extras import unchained_nonlinear_fit, chained_nonlinear_fit
 
-from dash import Dash, html, dcc
+from dash import Dash, html, dcc, no_update
+from plotly.utils import PlotlyJSONEncoder
 
 from lsqfitgui.frontend.dashboard import (
     get_layout,
+    get_layout_update,
+    get_empty_layout_update,
+    get_updated_values,
+    get_n_prior_value_inputs,
     update_layout_from_prior,
     update_layout_from_meta,
-    toggle_prior_widget,
+    toggle_export_prior_widget,
+    get_plot_index,
+    get_prior_rows,
+    get_prior_inputs,
+    get_prior_page,
     EXTERNAL_STYLESHEETS,
     EXTERNAL_SCRIPTS,
     ASSETS,
     UPDATE_LAYOUT_CALLBACK_ARGS,
+    UPDATE_LAYOUT_BACKGROUND_CALLBACK_ARGS,
+    UPDATE_LAYOUT_DELTA_CALLBACK_ARGS,
+    UPDATE_LAYOUT_BACKGROUND_DELTA_CALLBACK_ARGS,
+    get_fit_status_widgets,
+    get_fit_status,
     SAVE_FIT_CALLBACK_ARGS,
     EXPORT_PRIOR_CALLBACK_ARGS,
+    PRIOR_TABLE_CALLBACK_ARGS,
     FCN_SOURCE_CALLBACK,
+    CONTENT_TABS_CALLBACK_ARGS,
+    FUNCTION_EXPRESSION_CALLBACK_ARGS,
+    get_pending_fit_documentation,
     DEFAULT_PLOTS,
+    FigureCache,
 )
+from lsqfitgui.frontend.widgets.prior_delta import (
+    get_prior_delta_stores,
+    get_prior_sync,
+    apply_prior_delta,
+    PRIOR_DELTA_CALLBACK_ARGS,
+)
+from lsqfitgui.frontend.widgets.sweep import (
+    get_sweep_widget,
+    get_sweep_progress,
+    SWEEP_CALLBACK_ARGS,
+)
+from lsqfitgui.frontend.widgets.timing import (
+    get_timing_widget,
+    get_timing_table,
+    TIMING_CALLBACK_ARGS,
+)
+from lsqfitgui.frontend.widgets.profiler import (
+    get_profiler_widget,
+    get_profile_status,
+    get_profile_table,
+    PROFILER_CALLBACK_ARGS,
+)
+from lsqfitgui.backend.cache import FitCache, get_fit_fingerprint, cache_fit_by_prior
+from lsqfitgui.backend.sidebar import (
+    process_meta,
+    get_fit_setup,
+    parse_priors,
+    get_prior_index,
+    get_prior_structure,
+    get_flat_prior,
+    get_prior_from_flat,
+)
+from lsqfitgui.backend.preview import LinearResponsePreview
+from lsqfitgui.backend.prefetch import MetaPrefetcher
+from lsqfitgui.backend.executor import LatestTaskExecutor, ProcessFitSetup
+from lsqfitgui.backend.sweep import MetaSweep, get_meta_grid
+from lsqfitgui.backend.metrics import ServerMetrics
+from lsqfitgui.backend.blocks import decompose_fit, DecomposedFitSetup, FitProblem
+from lsqfitgui.util.gvar import is_uncorrelated
+from lsqfitgui.util.timing import StageTimer
+from lsqfitgui.util.profiling import CallbackProfiler
 from lsqfitgui.util.models import (
     lsqfit_from_multi_model_fit,
     lsqfit_from_multi_model_fit_wrapper,
@@ -44,6 +106,25 @@ class FitGUI:
         fit_setup_kwargs: Optional[Dict] = None,
         meta_config: Optional[List[Dict]] = None,
         use_default_content: bool = True,
+        warm_start: bool = False,
+        fit_cache_size: int = 0,
+        fit_cache_memory: Optional[int] = None,
+        background: bool = False,
+        fit_setup_processes: int = 0,
+        prefetch_depth: int = 0,
+        prefetch_workers: int = 1,
+        preview: bool = False,
+        incremental_refit: bool = False,
+        decompose: Union[bool, Sequence[Sequence[Any]]] = False,
+        decompose_processes: int = 0,
+        sweep: bool = False,
+        sweep_processes: int = 0,
+        sweep_file: Optional[str] = None,
+        timing: bool = False,
+        metrics: bool = False,
+        profiler: bool = False,
+        profile_calls: int = 0,
+        delta_priors: bool = False,
     ):
         """Initialize the fit gui.
 
@@ -58,6 +139,46 @@ class FitGUI:
             meta_config: Configuration for the fit_setup_kwargs represented in the GUI.
                 These must match `dcc.Input <https://dash.plotly.com/dash-core-components/input#input-properties>`_ arguments.
             use_default_content: Add default elements like the function documentation and plot tabs to the GUI.
+            warm_start: Seed refits after prior changes with the posterior and optimizer state of the current fit.
+                This speeds up refits for small changes of the prior.
+            fit_cache_size: Number of fits kept in a least-recently-used cache keyed by meta setup, prior and fit function.
+                Returning to a cached state does not trigger a refit. The cache is disabled if zero.
+            fit_cache_memory: Estimated memory budget of the fit cache in bytes. Unlimited if ``None``.
+            background: Run refits in a background thread instead of the request thread.
+                The GUI displays a status badge while fitting and swaps in results once ready.
+                Superseded requests are cancelled such that only the latest prior/meta state is fitted.
+            fit_setup_processes: Number of worker processes which run the `fit_setup_function` on meta changes.
+                Results are returned pickled by ``gvar.dumps``; thus, the setup function and the fit function must be picklable.
+                The setup function runs in the server process if zero.
+            prefetch_depth: Number of steps of each meta value (``step`` for numbers, entries for ``options``) for which fits are precomputed after each meta change.
+                Precomputed fits are stored in the fit cache (requires `fit_cache_size > 0`). Disabled if zero.
+            prefetch_workers: Number of threads precomputing fits, which bounds the CPU usage of prefetching.
+                Combine with `fit_setup_processes` to prefetch on multiple cores.
+            preview: Instantly render a linear-response approximation of the refit after prior changes (see :class:`lsqfitgui.backend.preview.LinearResponsePreview`).
+                The approximation is labeled and replaced by the exact refit once it finished. Implies `background=True`.
+            incremental_refit: Decompose fits into independent blocks of data and prior keys (see :func:`lsqfitgui.backend.blocks.get_fit_blocks`) and only refit blocks affected by prior changes.
+                Blocks are linked if data depends on a prior key through the fit function or if data keys are correlated.
+            decompose: Solve fits as independent sub-fits which are combined into a :class:`lsqfitgui.backend.blocks.BlockFit` (see :func:`lsqfitgui.backend.blocks.decompose_fit`).
+                Blocks are detected automatically if ``True`` or given as groups of data keys.
+                The `fit` or `fit_setup_function` may provide a :class:`lsqfitgui.backend.blocks.FitProblem` instead of a fit such that the joint fit is never solved.
+                Implies `incremental_refit=True` and can not be combined with `fit_setup_processes`.
+            decompose_processes: Number of worker processes which solve the sub-fits of decomposed fits.
+                The fit function must be picklable. Sub-fits run in the server process if zero.
+            sweep: Add a button which computes fits for all combinations of meta values (see :meth:`FitGUI.run_sweep`).
+                Selecting a grid point afterwards looks up the fit instead of refitting.
+            sweep_processes: Number of worker processes which run the `fit_setup_function` for the sweep.
+                The sweep runs in a background thread if zero (or in the `fit_setup_processes` pool if set).
+            sweep_file: File which stores the fits of the sweep once it finished. Fits are loaded from this file on start if it exists and was created for the same fit setup function.
+            timing: Record durations of the stages of layout updates (refit, figures, fit summary, layout serialization, ...) and display them in a collapsible panel (see :attr:`FitGUI.timer`).
+                The "layout serialization (estimate)" stage does not time the serialization of the Dash response but serializes the updated values once more with the same encoder; thus, timing adds the cost of one more serialization to each layout update.
+            metrics: Register a ``/metrics`` route in the Prometheus text format on the Flask server of the app (see :class:`lsqfitgui.backend.metrics.ServerMetrics`).
+                Exposes callback counts, fit durations, fit cache counters, callback payload sizes, active sessions and the process memory.
+            profiler: Add a panel with a switch which profiles the next layout updates with ``cProfile`` (see :attr:`FitGUI.profiler`).
+                The panel shows the top functions and provides the stats as a ``.prof`` file.
+            profile_calls: Profile the first `profile_calls` layout updates. Implies `profiler=True` if positive.
+            delta_priors: Only send changed prior inputs to the server instead of all prior inputs (see :mod:`lsqfitgui.frontend.widgets.prior_delta`).
+                Changes are applied to the prior inputs of the current fit, which reduces the request size of prior changes for large priors.
+                Requires the assets of the GUI if the app is provided to :meth:`FitGUI.setup_app`.
 
         Example:
             The most basic example just requires a nonlinear_fit object::
@@ -89,6 +210,8 @@ class FitGUI:
         self._fit_setup_kwargs = fit_setup_kwargs or {}
         self._meta_config = meta_config
         self._use_default_content = use_default_content
+        self._warm_start = warm_start
+        self._incremental_refit = incremental_refit or bool(decompose)
         self._layout = None
 
         self.get_additional_content: Callable[[nonlinear_fit], html.Base] = None
@@ -131,33 +254,151 @@ class FitGUI:
         else:
             self._initial_fit = fit
 
-        if isinstance(self._initial_fit, unchained_nonlinear_fit):
+        if isinstance(
+            self._initial_fit, (unchained_nonlinear_fit, chained_nonlinear_fit)
+        ):
             self._initial_fit = lsqfit_from_multi_model_fit(self._initial_fit)
             if self._fit_setup_function is not None:
                 self._fit_setup_function = lsqfit_from_multi_model_fit_wrapper(
                     self._fit_setup_function
                 )
 
-        if not allclose(
-            evalcorr(self.initial_fit.prior.flatten()),
-            eye(len(self.initial_fit.prior.flatten())),
-        ):
+        self._block_pool = None
+        if decompose:
+            if fit_setup_processes > 0:
+                raise ValueError(
+                    "Decomposed fits can not be combined with fit setup processes."
+                )
+            groups = None if decompose is True else decompose
+            if decompose_processes > 0:
+                self._block_pool = ProcessPoolExecutor(max_workers=decompose_processes)
+            self._initial_fit = decompose_fit(
+                self._initial_fit, groups=groups, pool=self._block_pool
+            )
+            if self._fit_setup_function is not None:
+                self._fit_setup_function = DecomposedFitSetup(
+                    self._fit_setup_function, groups=groups, pool=self._block_pool
+                )
+        elif isinstance(self._initial_fit, FitProblem):
+            raise ValueError("Fit problems require decomposing fits.")
+
+        if fit_setup_processes > 0 and self._fit_setup_function is not None:
+            self._fit_setup_function = ProcessFitSetup(
+                self._fit_setup_function, max_workers=fit_setup_processes
+            )
+
+        if not is_uncorrelated(self.initial_fit.prior):
             raise NotImplementedError("Prior of original fit contains correlations.")
 
+        self._preview = preview
+        self._executor = LatestTaskExecutor() if background or preview else None
+        self._submitted_state = None
+        self._showing_preview = False
+        self._delta_priors = delta_priors
+        if self._executor is not None:
+            update_layout_callback = (
+                self._update_layout_background_delta_callback
+                if delta_priors
+                else self._update_layout_background_callback
+            )
+        else:
+            update_layout_callback = (
+                self._update_layout_delta_callback
+                if delta_priors
+                else self._update_layout_callback
+            )
         self._callbacks = [
-            self._update_layout_callback,
+            update_layout_callback,
             self._save_fit_callback,
             self._export_prior_callback,
+            self._prior_table_callback,
         ]
+        self._figure_cache = None
         if self._use_default_content:
-            self._callbacks += [FCN_SOURCE_CALLBACK]
+            self._figure_cache = FigureCache()
+            self._callbacks += [
+                FCN_SOURCE_CALLBACK,
+                self._content_tabs_callback,
+                self._function_expression_callback,
+            ]
 
         self._setup_old = list(self._fit_setup_kwargs.values())
+        self._meta_values = self._fit_setup_kwargs
         self._prior_keys_old = None
         self._prior_values_old = None
+        self._prior_rows = None
+        self._prior_inputs = None
+        self._prior_flat = None
+        self._prior_flat_old = None
+        self._prior_delta_n = None
         self._fit = self.initial_fit
         self._app = None
 
+        self._fit_cache = (
+            FitCache(max_size=fit_cache_size, max_memory=fit_cache_memory)
+            if fit_cache_size > 0
+            else None
+        )
+        if self._fit_cache is not None:
+            if self._fit_setup_function is not None:
+                key = get_fit_fingerprint(
+                    setup=self._fit_setup_kwargs, fcn=self._fit_setup_function
+                )
+                self._fit_cache[key] = self.initial_fit
+            meta_values = (
+                process_meta(
+                    [self._fit_setup_kwargs[config["name"]] for config in meta_config],
+                    meta_config,
+                )
+                if meta_config
+                else None
+            )
+            cache_fit_by_prior(self._fit_cache, self.initial_fit, meta_values)
+
+        self._prefetcher = None
+        if prefetch_depth > 0:
+            if self._fit_cache is None or self._fit_setup_function is None:
+                raise ValueError(
+                    "Prefetching requires a fit setup function and a fit cache."
+                )
+            self._prefetcher = MetaPrefetcher(
+                self._fit_setup_function,
+                self._fit_cache,
+                self._meta_config or [],
+                depth=prefetch_depth,
+                max_workers=prefetch_workers,
+            )
+            self._prefetcher.prefetch(self._fit_setup_kwargs)
+
+        self._sweep_widget = sweep
+        self._sweep_processes = sweep_processes
+        self._sweep_file = sweep_file
+        self._sweep_clicks = 0
+        self._sweep_dumped = True
+        self._meta_sweep = None
+        if sweep_file is not None and path.exists(sweep_file):
+            self.meta_sweep.load(sweep_file)
+        if sweep:
+            self._callbacks.append(self._sweep_callback)
+
+        self._timing = timing
+        self._timer = StageTimer() if timing or metrics else None
+        self._timing_clicks = 0
+        if timing:
+            self._callbacks.append(self._timing_callback)
+        self._metrics = (
+            ServerMetrics(timer=self._timer, get_fit_cache=lambda: self.fit_cache)
+            if metrics
+            else None
+        )
+
+        self._profiler = CallbackProfiler() if profiler or profile_calls > 0 else None
+        self._profiler_clicks = self._profiler_downloads = 0
+        self._profiler_state = (profile_calls > 0, profile_calls or 1)
+        if self._profiler is not None:
+            self._profiler.arm(profile_calls)
+            self._callbacks.append(self._profiler_callback)
+
     @property
     def fit(self) -> nonlinear_fit:
         """Return current fit object."""
@@ -168,18 +409,94 @@ class FitGUI:
         """Return fit object used to initialize the app."""
         return self._initial_fit
 
+    @property
+    def fit_cache(self) -> Optional[FitCache]:
+        """Return the fit cache (``None`` if caching is disabled).
+
+        Use :meth:`lsqfitgui.backend.cache.FitCache.stats` to inspect hit and miss counters.
+        """
+        return self._fit_cache
+
+    @property
+    def timer(self) -> Optional[StageTimer]:
+        """Return the timer of layout update stages (``None`` if timing is disabled).
+
+        Use :meth:`lsqfitgui.util.timing.StageTimer.get_stats` to inspect the latest durations and percentiles.
+        """  # noqa: E501
+        return self._timer
+
+    @property
+    def metrics(self) -> Optional[ServerMetrics]:
+        """Return the collected server metrics or ``None`` if they are disabled."""
+        return self._metrics
+
+    @property
+    def profiler(self) -> Optional[CallbackProfiler]:
+        """Return the profiler of layout updates or ``None`` if it is disabled."""
+        return self._profiler
+
+    @property
+    def meta_sweep(self) -> MetaSweep:
+        """Return the sweep over the meta grid (created on first use).
+
+        Meta changes look up fits in the results of the sweep before refitting.
+        """
+        if self._meta_sweep is None:
+            if self._fit_setup_function is None or not self._meta_config:
+                raise ValueError(
+                    "Sweeping the meta grid requires a fit setup function"
+                    " and a meta config."
+                )
+            self._meta_sweep = MetaSweep(
+                self._fit_setup_function,
+                self._meta_config,
+                processes=self._sweep_processes,
+            )
+        return self._meta_sweep
+
+    def run_sweep(
+        self, wait: bool = False, callback: Optional[Callable] = None
+    ) -> MetaSweep:
+        """Compute fits for all combinations of meta values (the meta grid).
+
+        Grid values are the ``options`` or the range from ``min`` to ``max`` in steps of
+        ``step`` of the meta config (see :func:`lsqfitgui.backend.sweep.get_meta_grid`).
+        Fits are stored in :attr:`MetaSweep.results` such that selecting a grid point looks up the fit.
+
+        Arguments:
+            wait: Block until all fits are computed. Otherwise, fits are computed in the background.
+            callback: Function called with the number of finished and total grid points after each fit.
+        """  # noqa: E501
+        self.meta_sweep.start(self._fit_setup_kwargs, callback=callback)
+        self._sweep_dumped = False
+        if wait:
+            self.meta_sweep.wait()
+            self._dump_sweep()
+        return self.meta_sweep
+
+    def _dump_sweep(self):
+        """Store the sweep results in the sweep file once the sweep finished."""
+        if self._sweep_file is not None and not self._sweep_dumped:
+            self._sweep_dumped = True
+            self.meta_sweep.dump(self._sweep_file)
+
     @property
     def layout(self) -> html.Base:
-        """Return the current layout."""
+        """Return the layout of the current fit.
+
+        Callbacks only update elements of the layout which depend on the fit
+        (see :func:`lsqfitgui.frontend.dashboard.get_layout_update`).
+        """
         if self._layout is None:
             self._layout = get_layout(
-                self.initial_fit,
+                self.fit,
                 name=self.name,
                 meta_config=self._meta_config,
-                meta_values=self._fit_setup_kwargs,
+                meta_values=self._meta_values,
                 use_default_content=self._use_default_content,
                 get_additional_content=self.get_additional_content,
                 plots=self.plots,
+                figure_cache=self._figure_cache,
             )
         return self._layout
 
@@ -207,6 +524,37 @@ class FitGUI:
 
         app.title = self.name
         app.layout = html.Div(children=self.layout, id="body")
+        if self._executor is not None:
+            app.layout = html.Div([app.layout] + get_fit_status_widgets())
+        if self._delta_priors:
+            app.layout = html.Div([app.layout] + get_prior_delta_stores())
+            app.clientside_callback(*PRIOR_DELTA_CALLBACK_ARGS)
+        if self._sweep_widget:
+            n_points = len(get_meta_grid(self._meta_config, self._fit_setup_kwargs))
+            app.layout = html.Div([app.layout, get_sweep_widget(n_points)])
+        tools = []
+        if self._timing:
+            tools.append(get_timing_widget())
+        if self._profiler is not None:
+            tools.append(
+                get_profiler_widget(
+                    n_calls=self._profiler_state[1], armed=self._profiler_state[0]
+                )
+            )
+        if tools:
+            app.layout = html.Div(
+                [
+                    app.layout,
+                    html.Div(
+                        tools,
+                        className="position-fixed bottom-0 start-0 m-3 d-flex gap-2"
+                        " align-items-end",
+                        style={"zIndex": 1030},
+                    ),
+                ]
+            )
+        if self._metrics is not None:
+            self._metrics.register(app.server)
         for callback in self._callbacks:
             kwargs = callback.kwargs if hasattr(callback, "kwargs") else {}
             app.callback(*callback.args, **kwargs)(callback)
@@ -219,18 +567,279 @@ class FitGUI:
         return self._app
 
     def run_server(self, *args, **kwargs):
-        """Wrapper to self.app.run_server."""
+        """Wrapper to self.app.run_server.
+
+        Shuts down the worker pools of the GUI (see :meth:`FitGUI.close`) once the
+        server stops.
+        """
         if not self.app:
             self.setup_app()
-        return self.app.run_server(*args, **kwargs)
+        try:
+            return self.app.run_server(*args, **kwargs)
+        finally:
+            self.close()
+
+    def close(self, wait: bool = True):
+        """Shut down the thread and process pools of background fits.
+
+        This includes the background executor, the prefetcher, the sweep, fit setup
+        processes and the process pool of decomposed fits.
+        The GUI can not compute fits in the background once it is closed.
+
+        Arguments:
+            wait: Wait until running tasks finished.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown(wait=wait)
+        if self._meta_sweep is not None:
+            self._meta_sweep.shutdown(wait=wait)
+        if isinstance(self._fit_setup_function, ProcessFitSetup):
+            self._fit_setup_function.shutdown(wait=wait)
+        if self._block_pool is not None:
+            self._block_pool.shutdown(wait=wait)
 
     # Callbacks
 
-    def _update_layout_callback(self, prior_ids, prior_values, setup):
+    def _update_layout_callback(
+        self, prior_ids, prior_values, setup, table_timestamps=None, table_data=None
+    ):
         """Update the layout given new prior input."""
+        prior_ids, prior_values = self._get_prior_inputs(
+            prior_ids, prior_values, table_data
+        )
+        return self._update_layout(prior_ids, prior_values, setup)
+
+    _update_layout_callback.args = UPDATE_LAYOUT_CALLBACK_ARGS
+    _update_layout_callback.kwargs = {"prevent_initial_call": True}
+
+    def _update_layout_background_callback(
+        self,
+        prior_ids,
+        prior_values,
+        setup,
+        n_intervals,
+        table_timestamps=None,
+        table_data=None,
+        prior_flat=None,
+    ):
+        """Submit new prior input to the background executor or poll for results.
+
+        New form values submit a refit; otherwise, the callback was triggered by the
+        status interval and the layout is swapped in once the latest refit finished.
+        If the flat prior of changed inputs is given (see
+        :meth:`FitGUI._apply_prior_delta`), new deltas submit a refit instead.
+        """
+        if prior_flat is None:
+            prior_ids, prior_values = self._get_prior_inputs(
+                prior_ids, prior_values, table_data
+            )
+            state = (prior_ids, prior_values, setup)
+        else:
+            state = (self._prior_delta_n, setup)
+        if state != self._submitted_state:
+            self._submitted_state = state
+            self._executor.submit(
+                self._update_layout, prior_ids, prior_values, setup, prior_flat
+            )
+            preview = (
+                self._get_preview_layout(prior_ids, prior_values, setup, prior_flat)
+                if self._preview
+                else None
+            )
+            self._showing_preview = preview is not None
+            if preview is None:
+                preview = self._get_empty_layout_update(prior_ids)
+            return (
+                *preview,
+                get_fit_status(preview=self._showing_preview),
+                False,
+            )
+
+        done, update, error = self._executor.poll()
+        if not done:
+            return (
+                *self._get_empty_layout_update(prior_ids),
+                get_fit_status(preview=self._showing_preview),
+                False,
+            )
+        elif error is not None:
+            return (
+                *self._get_empty_layout_update(prior_ids),
+                get_fit_status(error),
+                True,
+            )
+        return (*update, None, True)
+
+    _update_layout_background_callback.args = UPDATE_LAYOUT_BACKGROUND_CALLBACK_ARGS
+    _update_layout_background_callback.kwargs = {"prevent_initial_call": True}
+
+    def _update_layout_delta_callback(
+        self, delta, setup, table_timestamps=None, table_data=None
+    ):
+        """Update the layout given changed prior inputs."""
+        prior_ids, prior_values, prior_flat = self._apply_prior_delta(delta, table_data)
+        if prior_flat is None:
+            update = self._update_layout_callback(
+                prior_ids, prior_values, setup, table_timestamps, table_data
+            )
+        else:
+            update = self._update_layout(prior_ids, prior_values, setup, prior_flat)
+        return self._get_delta_update(prior_ids, update)
+
+    _update_layout_delta_callback.args = UPDATE_LAYOUT_DELTA_CALLBACK_ARGS
+    _update_layout_delta_callback.kwargs = {"prevent_initial_call": True}
+
+    def _update_layout_background_delta_callback(
+        self, delta, setup, n_intervals, table_timestamps=None, table_data=None
+    ):
+        """Submit changed prior inputs to the background executor or poll for results."""
+        prior_ids, prior_values, prior_flat = self._apply_prior_delta(delta, table_data)
+        *update, status, disabled = self._update_layout_background_callback(
+            prior_ids,
+            prior_values,
+            setup,
+            n_intervals,
+            table_timestamps,
+            table_data,
+            prior_flat=prior_flat,
+        )
+        return (*self._get_delta_update(prior_ids, update), status, disabled)
+
+    _update_layout_background_delta_callback.args = (
+        UPDATE_LAYOUT_BACKGROUND_DELTA_CALLBACK_ARGS
+    )
+    _update_layout_background_delta_callback.kwargs = {"prevent_initial_call": True}
+
+    def _apply_prior_delta(self, delta, table_data=None):
+        """Return ids and values of all prior inputs after applying changed inputs.
+
+        Changes are applied to the inputs of the current fit once per delta.
+        Also returns the flat prior means and standard deviations of the inputs
+        (see :func:`lsqfitgui.backend.sidebar.get_flat_prior`), for which only changed
+        inputs are parsed, or ``None`` if the prior table provides inputs.
+        The flat prior is replaced only if inputs changed such that the layout update
+        compares it by identity.
+        """
+        index = get_prior_index(get_prior_structure(self.fit.prior))
+        if self._prior_inputs is None:
+            self._prior_inputs = dict(zip(index.slots, index.encode(self.fit.prior)))
+            self._prior_flat = self._prior_flat_old = get_flat_prior(self.fit.prior)
+        n_delta = (delta or {}).get("n")
+        if n_delta == self._prior_delta_n:
+            delta = None
+        self._prior_delta_n = n_delta
+        changes = {
+            name: value
+            for name, value in (delta or {}).get("changes", {}).items()
+            if self._prior_inputs.get(name, value) != value
+        }
+        if changes:
+            self._prior_flat = index.update(self._prior_flat, changes)
+        prior_ids, prior_values = apply_prior_delta(self._prior_inputs, delta)
+        return prior_ids, prior_values, None if table_data else self._prior_flat
+
+    @staticmethod
+    def _get_delta_update(prior_ids, update) -> List[Any]:
+        """Replace the prior input values of the update by the prior sync store."""
+        names = [idx["name"] for idx in prior_ids]
+        return [update[0], get_prior_sync(names, update[1]), *update[2:]]
+
+    def _get_empty_layout_update(self, prior_ids) -> List[Any]:
+        """Return values of the layout outputs which do not change the layout."""
+        return get_empty_layout_update(
+            self._use_default_content,
+            self.plots,
+            get_n_prior_value_inputs([idx["name"] for idx in prior_ids]),
+        )
+
+    def _get_prior_inputs(self, prior_ids, prior_values, table_data=None):
+        """Return ids and values of all prior inputs including the prior table.
+
+        Rows of the current table page replace the rows of the current prior.
+        """
+        if not table_data:
+            return prior_ids, prior_values
+        rows = dict(self._get_prior_rows())
+        for data in table_data:
+            rows.update({row["name"]: row for row in data or []})
+        self._prior_rows = rows
+        return get_prior_inputs(rows)
+
+    def _get_prior_rows(self) -> Dict[str, Dict[str, str]]:
+        if self._prior_rows is None:
+            self._prior_rows = get_prior_rows(self.fit.prior)
+        return self._prior_rows
+
+    def _get_preview_layout(self, prior_ids, prior_values, setup, prior_flat=None):
+        """Return the layout update of the linear-response preview for prior changes.
+
+        Returns ``None`` if the meta setup changed or the preview cannot be computed.
+        """
+        if setup != self._setup_old:
+            return None
+        try:
+            prior_keys = [idx["name"] for idx in prior_ids]
+            prior = (
+                parse_priors(dict(zip(prior_keys, prior_values)), self.fit.prior)
+                if prior_flat is None
+                else get_prior_from_flat(prior_flat, self.fit.prior)
+            )
+            preview = LinearResponsePreview(self.fit, prior)
+        except Exception:
+            return None
+        return get_layout_update(
+            preview,
+            meta_config=self._meta_config,
+            meta_values=process_meta(setup, self._meta_config) if setup else None,
+            use_default_content=self._use_default_content,
+            get_additional_content=self.get_additional_content,
+            plots=self.plots,
+            figure_cache=self._figure_cache,
+            sidebar=False,
+            prior_inputs=prior_keys,
+        )
+
+    def _update_layout(self, prior_ids, prior_values, setup, prior_flat=None):
+        """Refit and update the layout if prior or meta input changed.
+
+        If the flat prior of changed inputs is given (see
+        :meth:`FitGUI._apply_prior_delta`), the prior input values are neither
+        compared nor parsed.
+        """
+        if self._profiler is not None:
+            return self._profiler.call(
+                self._update_layout_timed, prior_ids, prior_values, setup, prior_flat
+            )
+        return self._update_layout_timed(prior_ids, prior_values, setup, prior_flat)
+
+    def _update_layout_timed(self, prior_ids, prior_values, setup, prior_flat=None):
+        if self._timer is None:
+            return self._update_layout_stages(
+                prior_ids, prior_values, setup, prior_flat
+            )
+
+        self._timer.start_update()
+        try:
+            with self._timer.stage("total"):
+                update = self._update_layout_stages(
+                    prior_ids, prior_values, setup, prior_flat
+                )
+                if self._timing:
+                    with self._timer.stage("layout serialization (estimate)"):
+                        json.dumps(get_updated_values(update), cls=PlotlyJSONEncoder)
+        finally:
+            self._timer.finish_update()
+        return update
+
+    def _update_layout_stages(self, prior_ids, prior_values, setup, prior_flat=None):
         prior_keys = [idx["name"] for idx in prior_ids]
         if setup != self._setup_old:
-            self._layout, self._fit = update_layout_from_meta(
+            fit_setup = get_fit_setup(setup, self._meta_config, self._fit_setup_kwargs)
+            if self._prefetcher is not None:
+                self._prefetcher.wait(fit_setup)
+            update, self._fit = update_layout_from_meta(
                 setup,
                 self._fit_setup_function,
                 self._fit_setup_kwargs,
@@ -239,13 +848,25 @@ class FitGUI:
                 use_default_content=self._use_default_content,
                 get_additional_content=self.get_additional_content,
                 plots=self.plots,
+                figure_cache=self._figure_cache,
+                fit_cache=self._fit_cache,
+                timer=self._timer,
+                partial=True,
+                prior_inputs=prior_keys,
+                meta_sweep=self._meta_sweep,
             )
             self._setup_old = setup
-        elif (
-            prior_keys != self._prior_keys_old or prior_values != self._prior_values_old
-        ):
-            self._layout, self._fit = update_layout_from_prior(
-                dict(zip(prior_keys, prior_values)),
+            self._meta_values = fit_setup
+            self._prior_rows = self._prior_inputs = self._prior_flat = None
+            if self._prefetcher is not None:
+                self._prefetcher.prefetch(fit_setup)
+        elif self._prior_changed(prior_keys, prior_values, prior_flat):
+            update, self._fit = update_layout_from_prior(
+                (
+                    prior_flat
+                    if prior_flat is not None
+                    else dict(zip(prior_keys, prior_values))
+                ),
                 self.fit,
                 setup=setup,
                 name=self.name,
@@ -253,13 +874,87 @@ class FitGUI:
                 use_default_content=self._use_default_content,
                 get_additional_content=self.get_additional_content,
                 plots=self.plots,
+                figure_cache=self._figure_cache,
+                warm_start=self._warm_start,
+                fit_cache=self._fit_cache,
+                incremental_refit=self._incremental_refit,
+                timer=self._timer,
+                partial=True,
+                prior_inputs=prior_keys,
             )
             self._prior_keys_old = prior_keys
             self._prior_values_old = prior_values
-        return self.layout
+            self._prior_flat_old = prior_flat
+        else:
+            return self._get_empty_layout_update(prior_ids)
+        self._layout = None
+        return update
 
-    _update_layout_callback.args = UPDATE_LAYOUT_CALLBACK_ARGS
-    _update_layout_callback.kwargs = {"prevent_initial_call": True}
+    def _prior_changed(self, prior_keys, prior_values, prior_flat=None) -> bool:
+        """Return if the prior inputs differ from the inputs of the current fit.
+
+        Flat priors of changed inputs are replaced on changes and compared by identity.
+        """
+        if prior_flat is not None:
+            return prior_flat is not self._prior_flat_old
+        return (
+            prior_keys != self._prior_keys_old or prior_values != self._prior_values_old
+        )
+
+    def _sweep_callback(self, n_clicks, n_intervals):
+        """Start the sweep on button clicks and report its progress."""
+        if n_clicks != self._sweep_clicks:
+            self._sweep_clicks = n_clicks
+            self.run_sweep()
+        sweep = self.meta_sweep
+        running = sweep.running
+        if not running:
+            self._dump_sweep()
+        value, label = get_sweep_progress(sweep.n_done, sweep.n_total, sweep.n_failed)
+        return value, label, not running, running
+
+    _sweep_callback.args = SWEEP_CALLBACK_ARGS
+    _sweep_callback.kwargs = {"prevent_initial_call": True}
+
+    def _timing_callback(self, n_clicks, n_intervals, is_open):
+        """Toggle the timing panel on button clicks and refresh its table."""
+        if n_clicks != self._timing_clicks:
+            self._timing_clicks = n_clicks
+            is_open = not is_open
+        table = get_timing_table(self._timer.get_stats()) if is_open else no_update
+        return is_open, table, not is_open
+
+    _timing_callback.args = TIMING_CALLBACK_ARGS
+    _timing_callback.kwargs = {"prevent_initial_call": True}
+
+    def _profiler_callback(
+        self, n_clicks, armed, n_calls, download_clicks, n_intervals, is_open
+    ):
+        """Toggle the profiler panel, arm the profiler and download its stats."""
+        if n_clicks != self._profiler_clicks:
+            self._profiler_clicks = n_clicks
+            is_open = not is_open
+        if (armed, n_calls) != self._profiler_state:
+            self._profiler_state = (armed, n_calls)
+            self._profiler.arm(n_calls if armed else 0)
+
+        download = no_update
+        if download_clicks != self._profiler_downloads:
+            self._profiler_downloads = download_clicks
+            if self._profiler.has_stats:
+                download = dcc.send_bytes(self._profiler.dump(), "lsqfitgui.prof")
+
+        profiler = self._profiler
+        return (
+            is_open,
+            get_profile_status(profiler.remaining, profiler.n_profiled),
+            get_profile_table(profiler.get_top_functions()) if is_open else no_update,
+            download,
+            not (is_open and profiler.remaining > 0),
+        )
+
+    _profiler_callback.args = PROFILER_CALLBACK_ARGS
+    _profiler_callback.kwargs = {"prevent_initial_call": True}
 
     def _save_fit_callback(self, *args, **kwargs):
         with NamedTemporaryFile() as out:
@@ -270,11 +965,38 @@ class FitGUI:
     _save_fit_callback.kwargs = {"prevent_initial_call": True}
 
     def _export_prior_callback(self, *args, **kwargs):
-        return toggle_prior_widget(*args, **kwargs)
+        return toggle_export_prior_widget(self.fit.prior, *args, **kwargs)
 
     _export_prior_callback.args = EXPORT_PRIOR_CALLBACK_ARGS
     _export_prior_callback.kwargs = {"prevent_initial_call": True}
 
+    def _prior_table_callback(self, pages, page_sizes, patterns):
+        """Return the rows of the selected page of the filtered prior table."""
+        rows = self._get_prior_rows()
+        pages = [
+            get_prior_page(rows, page, page_size, pattern)
+            for page, page_size, pattern in zip(pages, page_sizes, patterns)
+        ]
+        return [data for data, _ in pages], [count for _, count in pages]
+
+    _prior_table_callback.args = PRIOR_TABLE_CALLBACK_ARGS
+    _prior_table_callback.kwargs = {"prevent_initial_call": True}
+
+    def _content_tabs_callback(self, tab_value):
+        """Create the figure of the selected tab for the current fit if needed."""
+        self._figure_cache.active = get_plot_index(tab_value)
+        return self._figure_cache.get_figures(self.fit, self.plots, default=no_update)
+
+    _content_tabs_callback.args = CONTENT_TABS_CALLBACK_ARGS
+    _content_tabs_callback.kwargs = {"prevent_initial_call": "initial_duplicate"}
+
+    def _function_expression_callback(self, n_intervals):
+        """Refresh the documentation once the function expression is parsed."""
+        return get_pending_fit_documentation(self.fit)
+
+    _function_expression_callback.args = FUNCTION_EXPRESSION_CALLBACK_ARGS
+    _function_expression_callback.kwargs = {"prevent_initial_call": True}
+
 
 def run_server(
     fit: Optional[nonlinear_fit] = None,
@@ -285,6 +1007,23 @@ def run_server(
     use_default_content: Optional[bool] = True,
     get_additional_content: Optional[Callable[[nonlinear_fit], html.Base]] = None,
     additional_plots: Optional[Dict[str, Callable]] = None,
+    warm_start: bool = False,
+    background: bool = False,
+    fit_setup_processes: int = 0,
+    fit_cache_size: int = 0,
+    prefetch_depth: int = 0,
+    preview: bool = False,
+    incremental_refit: bool = False,
+    decompose: Union[bool, Sequence[Sequence[Any]]] = False,
+    decompose_processes: int = 0,
+    sweep: bool = False,
+    sweep_processes: int = 0,
+    sweep_file: Optional[str] = None,
+    timing: bool = False,
+    metrics: bool = False,
+    profiler: bool = False,
+    profile_calls: int = 0,
+    delta_priors: bool = False,
     run_app: bool = True,
     debug: bool = True,
     host: str = "localhost",
@@ -308,6 +1047,23 @@ def run_server(
             Must contain at least the `name: str` and `fcn:Callable[[nonlinear_fit], Figure]` items.
             This populates :attr:`FitGUI.plots`.
             See also the :attr:`lsqfitgui.frontend.content.DEFAULT_PLOTS`.
+        warm_start: Seed refits after prior changes with the posterior of the current fit.
+        background: Run refits in a background thread and swap in results once ready.
+        fit_setup_processes: Number of worker processes which run the `fit_setup_function` on meta changes.
+        fit_cache_size: Number of fits kept in a least-recently-used cache.
+        prefetch_depth: Number of steps of each meta value for which fits are precomputed (requires a fit cache).
+        preview: Render a linear-response approximation while refitting after prior changes. Implies `background=True`.
+        incremental_refit: Only refit independent blocks of the fit affected by prior changes.
+        decompose: Solve fits as independent sub-fits (``True`` for automatic detection or groups of data keys).
+        decompose_processes: Number of worker processes which solve the sub-fits of decomposed fits.
+        sweep: Add a button which computes fits for all combinations of meta values.
+        sweep_processes: Number of worker processes which compute the fits of the sweep.
+        sweep_file: File which stores and restores the fits of the sweep.
+        timing: Display durations of the stages of layout updates in a collapsible panel.
+        metrics: Register a ``/metrics`` route in the Prometheus text format on the server.
+        profiler: Add a panel which profiles the next layout updates with ``cProfile``.
+        profile_calls: Profile the first `profile_calls` layout updates. Implies `profiler=True` if positive.
+        delta_priors: Only send changed prior inputs to the server.
         run_app: Call run server on the dash app.
         debug: Run the dash app in debug mode. Only used if `run_app=True`.
         host: The hosting address of the dash app. Only used if `run_app=True`.
@@ -340,6 +1096,23 @@ def run_server(
         fit_setup_kwargs=fit_setup_kwargs,
         meta_config=meta_config,
         use_default_content=use_default_content,
+        warm_start=warm_start,
+        background=background,
+        fit_setup_processes=fit_setup_processes,
+        fit_cache_size=fit_cache_size,
+        prefetch_depth=prefetch_depth,
+        preview=preview,
+        incremental_refit=incremental_refit,
+        decompose=decompose,
+        decompose_processes=decompose_processes,
+        sweep=sweep,
+        sweep_processes=sweep_processes,
+        sweep_file=sweep_file,
+        timing=timing,
+        metrics=metrics,
+        profiler=profiler,
+        profile_calls=profile_calls,
+        delta_priors=delta_priors,
     )
     fit_gui.name = name
     fit_gui.get_additional_content = get_additional_content
@@ -1,46 +1,131 @@
 """Entrypoint script for launching dash apps."""
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
 
-from gvar import load
-
 from lsqfitgui import run_server
 from lsqfitgui.util.function import parse_function
+from lsqfitgui.backend.store import open_fit
+from lsqfitgui.scripts.render import render_files, FORMATS
+
+
+class DefaultCommandGroup(click.Group):
+    """Group which runs the default command if no command name is given.
+
+    Keeps ``lsqfitgui fit.p`` working next to ``lsqfitgui render ...``.
+    """
+
+    default_command = "serve"
+
+    def parse_args(self, ctx, args):
+        """Prepend the default command if the first argument is not a command."""
+        if args and args[0] not in self.commands and args[0] != "--help":
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
 
+@click.group(cls=DefaultCommandGroup)
+def main():
+    """Run the lsqfitgui server (default command) or render fits."""
 
-@click.command()
+
+@main.command()
 @click.argument("fit-file", type=str)
 @click.option("--function", "-f", help="Python module/function used for fit.")
 @click.option(
     "--host", help="Address to host the app on.", default="localhost", type=str
 )
 @click.option("--port", help="Port to host the app on.", default=8000, type=int)
-def main(
+@click.option(
+    "--profile",
+    help="Profile the first N layout updates with cProfile.",
+    default=0,
+    type=int,
+)
+def serve(
     fit_file: str,
     function: Optional[str] = None,
     host: str = "localhost",
     port: int = 8000,
+    profile: int = 0,
 ):
-    """Run lsqfitgui server importing a pickle file.
+    """Run lsqfitgui server importing a pickle file or a fit store directory.
 
     Arguments:
-        fit_file: Pickle file pointing to a fit.
+        fit_file: Pickle file or fit store directory pointing to a fit.
         function: Module/function string to use.
+        profile: Number of layout updates which are profiled.
     """
-    fit = load(fit_file)
-
-    if function is not None:
-        function = parse_function(function)
-        fit.fcn = function
+    fit = open_fit(
+        fit_file, fcn=parse_function(function) if function is not None else None
+    )
 
-    if not hasattr(fit, "fcn"):
+    if getattr(fit, "fcn", None) is None:
         raise ValueError(
             "Fit function not present in pickle file."
             " You may provide an external function using the flag."
         )
 
-    run_server(fit, host=host, port=port)
+    run_server(fit, host=host, port=port, profile_calls=profile)
+
+
+@main.command()
+@click.argument("fit-files", type=str, nargs=-1, required=True)
+@click.option(
+    "--output", "-o", help="Output directory.", default="lsqfitgui-render", type=str
+)
+@click.option("--function", "-f", help="Python module/function used for fit.")
+@click.option("--plots", help="Python module/list of additional plots.")
+@click.option(
+    "--format",
+    "formats",
+    help="Figure format (repeatable).",
+    type=click.Choice(FORMATS),
+    multiple=True,
+    default=FORMATS,
+)
+@click.option(
+    "--processes", "-j", help="Number of worker processes.", default=0, type=int
+)
+@click.option("--force", help="Render unchanged fit files.", is_flag=True)
+def render(
+    fit_files: Tuple[str, ...],
+    output: str = "lsqfitgui-render",
+    function: Optional[str] = None,
+    plots: Optional[str] = None,
+    formats: Tuple[str, ...] = FORMATS,
+    processes: int = 0,
+    force: bool = False,
+):
+    """Render figures and summaries of fit files without starting a server.
+
+    Fit files which did not change since their last rendering are skipped.
+
+    Arguments:
+        fit_files: Pickle files or fit store directories pointing to fits.
+        output: Output directory which contains one directory per fit file.
+        function: Module/function string to use.
+        plots: Module/variable string pointing to a list of additional plots.
+        formats: Figure formats.
+        processes: Number of worker processes.
+        force: Render fit files even if they did not change.
+    """
+    results = render_files(
+        fit_files,
+        output,
+        processes=processes,
+        function=function,
+        plots=plots,
+        formats=formats,
+        force=force,
+    )
+    for result in results:
+        click.echo(
+            f"{result['status']:>8}  {result['input']}"
+            + (f"  ({result['error']})" if result["error"] else "")
+        )
+    if any(result["status"] == "failed" for result in results):
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+"""Headless rendering of fit figures and summaries for batches of fit files."""
+from typing import Optional, List, Dict, Any, Sequence
+
+import os
+import re
+import json
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from lsqfitgui.backend.store import open_fit
+from lsqfitgui.frontend.content import DEFAULT_PLOTS, get_figures
+from lsqfitgui.util.function import parse_function
+from lsqfitgui.version import __version__
+
+FORMATS = ("json", "html")
+SUMMARY_FILE = "summary.json"
+
+
+def _update_file_hash(fingerprint, path: str):
+    files = (
+        sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+        if os.path.isdir(path)
+        else [path]
+    )
+    for name in files:
+        fingerprint.update(os.path.relpath(name, path).encode())
+        with open(name, "rb") as inp:
+            for chunk in iter(lambda: inp.read(1 << 20), b""):
+                fingerprint.update(chunk)
+
+
+def get_input_hash(path: str, *options: Any, sources: Sequence[str] = ()) -> str:
+    """Compute a content hash of a fit file (or fit store directory) and options.
+
+    Arguments:
+        path: The fit file or fit store directory.
+        *options: Further values which change the output (e.g., the plot reference).
+        sources: Files referenced by the options (e.g., the plot script). Their content
+            is part of the hash; missing files are ignored.
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(repr((__version__,) + options).encode())
+    _update_file_hash(fingerprint, path)
+    for source in sources:
+        if os.path.isfile(source):
+            _update_file_hash(fingerprint, source)
+    return fingerprint.hexdigest()
+
+
+def get_output_directory(path: str, output: str) -> str:
+    """Return the output directory of a fit file."""
+    name = os.path.basename(os.path.normpath(path))
+    return os.path.join(output, os.path.splitext(name)[0] or name)
+
+
+def get_output_directories(paths: Sequence[str], output: str) -> List[str]:
+    """Return unique output directories of fit files.
+
+    Directories are named after the file (see :func:`get_output_directory`). If names
+    of different files collide (e.g., ``a/fit.p`` and ``b/fit.p``), the names are
+    suffixed by a hash of the absolute path.
+    """
+    directories = [get_output_directory(path, output) for path in paths]
+    counts = Counter(
+        {os.path.abspath(path): name for path, name in zip(paths, directories)}.values()
+    )
+    for n, (path, directory) in enumerate(zip(paths, directories)):
+        if counts[directory] > 1:
+            path_hash = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+            directories[n] = f"{directory}-{path_hash[:8]}"
+    return directories
+
+
+def _get_slug(label: str) -> str:
+    return re.sub(r"[^\w-]+", "-", label).strip("-").lower() or "figure"
+
+
+def _get_source(reference: Optional[str]) -> Optional[str]:
+    return reference.rsplit(":", 1)[0] if reference is not None else None
+
+
+def render_fit(
+    fit,
+    output: str,
+    plots: Optional[List[Dict[str, Any]]] = None,
+    formats: Sequence[str] = FORMATS,
+) -> Dict[str, Any]:
+    """Write the figures and the summary of a fit to the output directory.
+
+    Writes one file per figure and format (named after the label; repeated labels are
+    suffixed by an index), the output of ``fit.format`` to
+    ``summary.txt`` and returns the content of ``summary.json`` (fit statistics and
+    file names).
+
+    Arguments:
+        fit: The fit.
+        output: The output directory. Created if it does not exist.
+        plots: Plots in addition to :data:`lsqfitgui.frontend.content.DEFAULT_PLOTS`
+            (same format as the ``additional_plots`` of :func:`lsqfitgui.run_server`).
+        formats: Figure formats. Allowed values are ``"json"`` and ``"html"``.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats {unknown}. Choose from {FORMATS}.")
+    os.makedirs(output, exist_ok=True)
+
+    figures = []
+    slugs = Counter()
+    for data in get_figures(fit, DEFAULT_PLOTS + (plots or [])):
+        slug = _get_slug(data["label"])
+        slugs[slug] += 1
+        if slugs[slug] > 1:
+            slug = f"{slug}-{slugs[slug]}"
+        for fmt in formats:
+            name = os.path.join(output, f"{slug}.{fmt}")
+            if fmt == "json":
+                data["figure"].write_json(name)
+            else:
+                data["figure"].write_html(name, include_plotlyjs="cdn")
+        figures.append(
+            {"label": data["label"], "files": [f"{slug}.{fmt}" for fmt in formats]}
+        )
+
+    with open(os.path.join(output, "summary.txt"), "w") as out:
+        out.write(fit.format(maxline=True))
+
+    return {
+        "chi2": fit.chi2,
+        "dof": fit.dof,
+        "Q": fit.Q,
+        "logGBF": fit.logGBF,
+        "figures": figures,
+    }
+
+
+def render_file(
+    path: str,
+    output: str,
+    function: Optional[str] = None,
+    plots: Optional[str] = None,
+    formats: Sequence[str] = FORMATS,
+    force: bool = False,
+    directory: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Render a fit file unless its output is up to date.
+
+    The output is up to date if the ``summary.json`` file of the output directory
+    stores the content hash of the input, the options and the function and plot
+    scripts (see :func:`get_input_hash`).
+    Arguments are strings such that the function can run in worker processes.
+
+    Arguments:
+        path: The fit file (``gvar.dump``) or fit store directory.
+        output: The output directory of all fits.
+        function: Module/function string of the fit function (``script.py:fcn``).
+        plots: Module/variable string of a list of additional plots
+            (``script.py:PLOTS``).
+        formats: Figure formats.
+        force: Render even if the output is up to date.
+        directory: The output directory of the fit. Defaults to
+            :func:`get_output_directory`.
+
+    Returns:
+        Dictionary with the input path, the output directory, the status
+        (``"rendered"``, ``"skipped"`` or ``"failed"``) and the error message.
+    """
+    directory = directory or get_output_directory(path, output)
+    result = {"input": path, "output": directory, "status": "rendered", "error": None}
+    try:
+        sources = [_get_source(reference) for reference in (function, plots)]
+        input_hash = get_input_hash(
+            path,
+            function,
+            plots,
+            tuple(formats),
+            sources=[source for source in sources if source is not None],
+        )
+        summary_file = os.path.join(directory, SUMMARY_FILE)
+        if not force and os.path.exists(summary_file):
+            with open(summary_file) as inp:
+                if json.load(inp).get("hash") == input_hash:
+                    result["status"] = "skipped"
+                    return result
+
+        fcn = parse_function(function) if function is not None else None
+        fit = open_fit(path, fcn=fcn)
+        if getattr(fit, "fcn", None) is None:
+            raise ValueError("Fit function not present in fit file.")
+        additional_plots = parse_function(plots) if plots is not None else None
+        if plots is not None and additional_plots is None:
+            raise ValueError(f"Could not import plots from {plots!r}.")
+
+        summary = render_fit(fit, directory, plots=additional_plots, formats=formats)
+        summary.update(input=path, hash=input_hash)
+        with open(summary_file, "w") as out:
+            json.dump(summary, out, indent=2)
+    except Exception as error:
+        result.update(status="failed", error=f"{type(error).__name__}: {error}")
+    return result
+
+
+def render_files(
+    paths: Sequence[str],
+    output: str,
+    processes: int = 0,
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """Render fit files in a process pool (see :func:`render_file`).
+
+    Files are written to unique directories (see :func:`get_output_directories`) and
+    repeated paths are rendered once such that workers do not write the same files.
+
+    Arguments:
+        paths: The fit files or fit store directories.
+        output: The output directory of all fits.
+        processes: Number of worker processes. Renders in the current process if zero.
+        **kwargs: Further arguments of :func:`render_file`.
+    """
+    paths = list({os.path.abspath(path): path for path in paths}.values())
+    directories = get_output_directories(paths, output)
+    if processes <= 0:
+        return [
+            render_file(path, output, directory=directory, **kwargs)
+            for path, directory in zip(paths, directories)
+        ]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(render_file, path, output, directory=directory, **kwargs)
+            for path, directory in zip(paths, directories)
+        ]
+        return [future.result() for future in futures]
@@ -1,10 +1,24 @@
 """Utilities for parsing and importing functions."""
-from typing import Callable, Dict, Optional, List
+from typing import Callable, Dict, Optional, List, Tuple, Any
 
 import re
 import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError
+from threading import Lock, Thread
+
+import numpy as np
 import sympy
 
+FUNCTION_EXPRESSION_TIMEOUT = 2.0
+"""Seconds :func:`get_function_expression` waits for the expression of a function."""
+
+FUNCTION_EXPRESSION_CACHE_SIZE = 32
+"""Number of function expressions kept by :func:`get_function_expression`."""
+
+_EXPRESSIONS: "OrderedDict[Tuple, Tuple[Callable, Future]]" = OrderedDict()
+_EXPRESSIONS_LOCK = Lock()
+
 
 def parse_function(string: str):
     """Read function string and return function.
@@ -64,3 +78,83 @@ def parse_function_expression(
         s = None
 
     return s
+
+
+def get_parameter_signature(parameters: Dict) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """Return keys and shapes of the parameters, which determine their symbols."""
+    return tuple((key, np.shape(val)) for key, val in parameters.items())
+
+
+def _get_expression_key(
+    fcn: Callable, parameters: Dict, x_dict_keys: Optional[List[str]]
+) -> Tuple:
+    x_keys = tuple(x_dict_keys) if x_dict_keys is not None else None
+    return (id(fcn), get_parameter_signature(parameters), x_keys)
+
+
+def _get_expression_future(key: Tuple, fcn: Callable) -> Optional[Future]:
+    cached = _EXPRESSIONS.get(key)
+    return cached[1] if cached is not None and cached[0] is fcn else None
+
+
+def get_function_expression(
+    fcn: Callable,
+    parameters: Dict,
+    x_dict_keys: Optional[List[str]] = None,
+    timeout: Optional[float] = FUNCTION_EXPRESSION_TIMEOUT,
+) -> Optional[str]:
+    """Return the (cached) latex expression of the fit function.
+
+    Expressions are parsed by :func:`parse_function_expression` once per function,
+    parameter keys and shapes (see :func:`get_parameter_signature`) and x keys.
+    Parsing runs in a background thread; if it does not finish within `timeout`
+    seconds, ``None`` is returned and later calls return the expression once parsed
+    (see :func:`is_function_expression_pending`).
+    Expressions which are still parsed are not evicted from the cache such that
+    every expression is parsed by a single thread.
+    Only the call which starts parsing waits; later calls return ``None`` right away
+    while the expression is still parsed.
+    Parsing threads can not be cancelled: a parse which never finishes keeps its
+    daemon thread and cache entry until the process exits.
+    """
+    key = _get_expression_key(fcn, parameters, x_dict_keys)
+    with _EXPRESSIONS_LOCK:
+        future = _get_expression_future(key, fcn)
+        if future is not None:
+            _EXPRESSIONS.move_to_end(key)
+            if not future.done():
+                timeout = 0
+        else:
+            future = Future()
+            _EXPRESSIONS[key] = (fcn, future)
+            done = [old for old, (_, val) in _EXPRESSIONS.items() if val.done()]
+            for old in done[: len(_EXPRESSIONS) - FUNCTION_EXPRESSION_CACHE_SIZE]:
+                del _EXPRESSIONS[old]
+            Thread(
+                target=_set_function_expression,
+                args=(future, fcn, parameters, x_dict_keys),
+                daemon=True,
+            ).start()
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        return None
+
+
+def is_function_expression_pending(
+    fcn: Callable, parameters: Dict, x_dict_keys: Optional[List[str]] = None
+) -> bool:
+    """Return whether the expression of the fit function is still parsed.
+
+    See :func:`get_function_expression` for the arguments.
+    """
+    key = _get_expression_key(fcn, parameters, x_dict_keys)
+    with _EXPRESSIONS_LOCK:
+        future = _get_expression_future(key, fcn)
+    return future is not None and not future.done()
+
+
+def _set_function_expression(
+    future: Future, fcn: Callable, parameters: Dict, x_dict_keys: Any
+):
+    future.set_result(parse_function_expression(fcn, parameters, x_dict_keys))
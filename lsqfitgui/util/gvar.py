@@ -1,8 +1,8 @@
 """Utility methods with gvars."""
-from typing import Dict
+from typing import Dict, Union
 
-from numpy import concatenate
-from gvar import BufferDict, GVar
+from numpy import concatenate, asarray, ndarray
+from gvar import BufferDict, GVar, evalcov_blocks
 
 
 def flatten_gvars(gvars: BufferDict, flat_label: str = "__array_") -> Dict[str, GVar]:
@@ -22,3 +22,35 @@ def flatten_gvars(gvars: BufferDict, flat_label: str = "__array_") -> Dict[str,
     )
     vals = gvars.flatten()
     return dict(zip(keys, vals))
+
+
+def is_uncorrelated(gvars: Union[BufferDict, ndarray]) -> bool:
+    """Check if gvars are mutually uncorrelated without evaluating their covariance matrix.
+
+    If every gvar depends on a single primary gvar and these primaries are in distinct
+    blocks of gvar's global covariance matrix, the gvars are uncorrelated.
+    Otherwise, this falls back to the sparse block decomposition of
+    ``gvar.evalcov_blocks``.
+    Memory and time scale linearly with the number of uncorrelated gvars.
+
+    Arguments:
+        gvars: BufferDict or array of gvars.
+    """
+    flat = gvars.flatten() if hasattr(gvars, "flatten") else asarray(gvars).flatten()
+    if len(flat) < 2:
+        return True
+
+    blocks = set()
+    for gvar in flat:
+        indices = gvar.internaldata[1].indices()
+        if len(indices) != 1:
+            break
+        block = gvar.cov.blockid(indices[0])
+        if block in blocks:
+            break
+        blocks.add(block)
+    else:
+        return True
+
+    uncorrelated_idx, _ = evalcov_blocks(flat, compress=True)[0]
+    return len(uncorrelated_idx) == len(flat)
@@ -1,36 +1,139 @@
 """Utility functions for converting fit models."""
-from lsqfit._extras import unchained_nonlinear_fit
-from lsqfit import nonlinear_fit
+from typing import Union, Optional
 
+from functools import partial
 
-def lsqfit_from_multi_model_fit(
-    multi_model_fit: unchained_nonlinear_fit,
-) -> nonlinear_fit:
-    """Convert a unchained nonlinear fit object created by ``lsqfit.MultiFitter.lsqfit`` to a nonlinear_fit object."""  # noqa: E501
-    fitter, kwargs, fkwargs = multi_model_fit.fitter_args_kargs
+import gvar as gv
+from lsqfit._extras import unchained_nonlinear_fit, chained_nonlinear_fit
+from lsqfit import nonlinear_fit, MultiFitter
 
-    assert fitter.__name__ == "lsqfit"
 
-    models = kwargs["models"]
-    data = kwargs["data"]
-    prior = kwargs["prior"]
+class MultiModelFitFunction:
+    """Fit function which evaluates the fit functions of ``lsqfit.MultiFitter`` models.
 
-    x_data = {m.datatag: getattr(m, "x", None) for m in models}
-    y_data = {m.datatag: m.builddata(data) for m in models}
+    Like the fit function of ``lsqfit.MultiFitter``, each model is evaluated on the
+    full parameter dictionary and coarse grained if needed.
+    The `x` argument is ignored; the independent variables are stored on the models.
+    Unlike a closure, instances can be pickled if the models can be pickled.
+    """
 
-    def fcn(x, p):
-        return {m.datatag: m.fitfcn(m.buildprior(p)) for m in models}
+    def __init__(self, models):
+        """Store the (flat list of) models."""
+        self.models = models
+        self.datatags = tuple(m.datatag for m in models)
 
-    fit = nonlinear_fit((x_data, y_data), fcn=fcn, prior=prior)
-    fit.models = models
+    def __call__(self, x, p):
+        """Return the fit function of each model, keyed by the model datatag."""
+        out = gv.BufferDict()
+        for tag, m in zip(self.datatags, self.models):
+            out[tag] = (
+                m.fitfcn(p)
+                if getattr(m, "ncg", 1) <= 1
+                else MultiFitter.coarse_grain(m.fitfcn(p), m.ncg)
+            )
+        return out
 
-    return fit
 
+class MultiFitterFit(nonlinear_fit):
+    """Fit created by ``lsqfit.MultiFitter`` (chained or not) in the GUI interface.
 
-def lsqfit_from_multi_model_fit_wrapper(fcn):
-    """Wrap a generate fit function to return a lsqfit_from_multi_model_fit."""
+    Wraps the results of ``MultiFitter.lsqfit`` or ``MultiFitter.chained_lsqfit``
+    without refitting.
+    The fit function takes the GUI signature ``fcn(x, p)`` and evaluates the fit
+    functions of the models directly (see :class:`MultiModelFitFunction`).
+    The processed data of the models (``builddata``) is computed once and reused by
+    refits (see :func:`refit_multi_fitter_fit`).
+    """
+
+    def __init__(
+        self,
+        multi_model_fit: Union[unchained_nonlinear_fit, chained_nonlinear_fit],
+        fcn: Optional[MultiModelFitFunction] = None,
+    ):
+        """Wrap the fit.
+
+        Arguments:
+            multi_model_fit: The fit returned by the ``MultiFitter``.
+            fcn: Fit function of a previous fit of the same models which is reused.
+        """
+        self.__dict__.update(multi_model_fit.__dict__)
+        self.__dict__.pop("fitter_args_kargs", None)
+        self.__dict__.pop("chained_fits", None)
+        for key in ["_chiv", "_chivw", "pdf", "dchi2"]:
+            self.__dict__.setdefault(key, None)
+
+        fitter, args, kwargs = multi_model_fit.fitter_args_kargs
+        self.chained = isinstance(multi_model_fit, chained_nonlinear_fit)
+        """Whether the fit was created by ``MultiFitter.chained_lsqfit``."""
+        self.models = args["models"]
+        """The models of the ``MultiFitter``."""
+        self.multifitter_kwargs = {
+            key: val for key, val in kwargs.items() if key != "fitname"
+        }
+        """Keyword arguments of the ``MultiFitter`` fit."""
+        self.pdata = (
+            args["pdata"]
+            if args["pdata"] is not None
+            else MultiFitter.process_data(args["data"], self.models)
+        )
+        """The data processed by the models (``builddata``)."""
+
+        self.fcn = fcn or MultiModelFitFunction(MultiFitter.flatten_models(self.models))
+        self.x = {m.datatag: getattr(m, "x", None) for m in self.fcn.models}
+        self.y = gv.BufferDict(multi_model_fit.y)
+        self.data = (self.x, self.y)
+
+    def _remove_gvars(self, gvlist):
+        fit = super()._remove_gvars(gvlist)
+        for key in ["_chiv", "_chivw", "pdf", "dchi2"]:
+            fit.__dict__.setdefault(key, None)
+        return fit
+
+
+def refit_multi_fitter_fit(
+    prior: gv.BufferDict, fit: MultiFitterFit, warm_start: bool = False
+) -> MultiFitterFit:
+    """Refit the processed data of a ``MultiFitter`` fit with a new prior.
+
+    Runs ``MultiFitter.lsqfit`` (or ``MultiFitter.chained_lsqfit``) with the settings
+    of the original fit such that marginalization and fitter options are respected.
 
-    def wrapped_lsqfit_from_multi_model_fit(**kwargs):
-        return lsqfit_from_multi_model_fit(fcn(**kwargs))
+    Arguments:
+        prior: The new prior.
+        fit: The previous fit.
+        warm_start: Start the new fit from the posterior mean of the previous fit.
+    """
+    multifitter = MultiFitter(models=fit.models)
+    kwargs = dict(fit.multifitter_kwargs)
+    if warm_start:
+        kwargs["p0"] = fit.pmean
+    fitter = multifitter.chained_lsqfit if fit.chained else multifitter.lsqfit
+    new_fit = MultiFitterFit(
+        fitter(pdata=fit.pdata, prior=prior, **kwargs), fcn=fit.fcn
+    )
+    if hasattr(fit, "meta"):
+        new_fit.meta = fit.meta
+    return new_fit
+
+
+def lsqfit_from_multi_model_fit(
+    multi_model_fit: Union[unchained_nonlinear_fit, chained_nonlinear_fit],
+) -> MultiFitterFit:
+    """Convert a fit object created by ``lsqfit.MultiFitter`` to a :class:`MultiFitterFit` object."""  # noqa: E501
+    fitter, kwargs, fkwargs = multi_model_fit.fitter_args_kargs
+
+    assert fitter.__name__ in ("lsqfit", "chained_lsqfit")
+
+    return MultiFitterFit(multi_model_fit)
+
+
+def _lsqfit_from_multi_model_fit_setup(fcn, **kwargs):
+    return lsqfit_from_multi_model_fit(fcn(**kwargs))
+
+
+def lsqfit_from_multi_model_fit_wrapper(fcn):
+    """Wrap a generate fit function to return a lsqfit_from_multi_model_fit.
 
-    return wrapped_lsqfit_from_multi_model_fit
+    The wrapped function can be pickled if `fcn` can be pickled.
+    """
+    return partial(_lsqfit_from_multi_model_fit_setup, fcn)
@@ -0,0 +1,112 @@
+"""Utilities for profiling GUI updates with ``cProfile``."""
+from typing import Callable, Dict, List, Any, Optional
+
+import os
+import pstats
+import cProfile
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+
+class CallbackProfiler:
+    """Profile the next invocations of a function with ``cProfile``.
+
+    Stats of all profiled invocations are accumulated until :meth:`clear` is called.
+
+    Example:
+        Profile the next three updates::
+
+            profiler = CallbackProfiler()
+            profiler.arm(3)
+            layout = profiler.call(update_layout, *args)
+            profiler.get_top_functions()
+    """
+
+    def __init__(self):
+        """Initialize the profiler without armed invocations."""
+        self.remaining = 0
+        """Number of invocations which will be profiled."""
+        self.n_profiled = 0
+        """Number of profiled invocations in the accumulated stats."""
+        self._stats: Optional[pstats.Stats] = None
+        self._lock = Lock()
+
+    def arm(self, n_calls: int):
+        """Profile the next `n_calls` invocations (disarms if not positive)."""
+        self.remaining = max(int(n_calls or 0), 0)
+
+    def clear(self):
+        """Remove accumulated stats."""
+        with self._lock:
+            self._stats = None
+            self.n_profiled = 0
+
+    def call(self, fcn: Callable, *args, **kwargs) -> Any:
+        """Call the function and profile it if invocations are armed.
+
+        Profiled invocations run one at a time since only one profiler can be active.
+        """
+        if self.remaining <= 0:
+            return fcn(*args, **kwargs)
+
+        with self._lock:
+            if self.remaining <= 0:
+                return fcn(*args, **kwargs)
+            self.remaining -= 1
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler is active
+                return fcn(*args, **kwargs)
+            try:
+                return fcn(*args, **kwargs)
+            finally:
+                profile.disable()
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+                self.n_profiled += 1
+
+    @property
+    def has_stats(self) -> bool:
+        """Return if stats were collected."""
+        return self._stats is not None
+
+    def dump(self) -> bytes:
+        """Return the accumulated stats in the ``.prof`` format (see ``pstats``)."""
+        if self._stats is None:
+            raise ValueError("No profiled invocations.")
+        with NamedTemporaryFile(suffix=".prof", delete=False) as out:
+            name = out.name
+        try:
+            with self._lock:
+                self._stats.dump_stats(name)
+            with open(name, "rb") as inp:
+                return inp.read()
+        finally:
+            os.remove(name)
+
+    def get_top_functions(
+        self, n: int = 20, sort: str = "cumulative"
+    ) -> List[Dict[str, Any]]:
+        """Return the functions with the largest times.
+
+        Arguments:
+            n: Number of functions.
+            sort: Sort by ``"cumulative"`` or ``"tottime"``.
+        """
+        if self._stats is None:
+            return []
+        key = {"cumulative": "cumtime", "tottime": "tottime"}[sort]
+        with self._lock:
+            rows = [
+                {
+                    "function": pstats.func_std_string(func),
+                    "ncalls": nc,
+                    "tottime": tt,
+                    "cumtime": ct,
+                }
+                for func, (_, nc, tt, ct, _) in self._stats.stats.items()
+            ]
+        return sorted(rows, key=lambda row: row[key], reverse=True)[:n]
@@ -0,0 +1,212 @@
+"""Generators of reproducible synthetic fits for scale tests and benchmarks."""
+from typing import Optional, Dict, Tuple, List, Any
+
+import numpy as np
+import gvar as gv
+import lsqfit
+
+CORRELATIONS = ("none", "key", "global")
+"""Allowed correlation structures of the data."""
+
+
+def get_parameter_keys(
+    n_params: int, data_keys: List[str], shared: bool = True, array: bool = False
+) -> Dict[str, List[Tuple[str, Optional[int]]]]:
+    """Return the prior keys (and array indices) of the coefficients of each data key.
+
+    Arguments:
+        n_params: Number of polynomial coefficients per data key.
+        data_keys: The data keys.
+        shared: All data keys share the same coefficients.
+        array: Coefficients are stored in one array-valued prior entry (``c``)
+            instead of scalar entries (``c0``, ``c1``, ...).
+    """
+    out = {}
+    for key in data_keys:
+        suffix = "" if shared else f"_{key}"
+        out[key] = [
+            (f"c{suffix}", n) if array else (f"c{n}{suffix}", None)
+            for n in range(n_params)
+        ]
+    return out
+
+
+class SyntheticFunction:
+    """Polynomial fit function for synthetic fits.
+
+    Evaluates ``sum_n c_n x**n`` for each data key with the coefficients given by
+    :func:`get_parameter_keys`.
+    Unlike a closure, instances can be pickled.
+    """
+
+    def __init__(self, parameter_keys: Dict[str, List[Tuple[str, Optional[int]]]]):
+        """Store the prior keys of the coefficients of each data key."""
+        self.parameter_keys = parameter_keys
+
+    def __call__(self, x, p):
+        """Return the polynomials for each data key."""
+        out = {}
+        for key, coeffs in self.parameter_keys.items():
+            xx = x[key]
+            out[key] = sum(
+                (p[name] if idx is None else p[name][idx]) * xx**n
+                for n, (name, idx) in enumerate(coeffs)
+            )
+        return out
+
+
+def get_data_covariance(
+    sdev: np.ndarray, n_keys: int, correlation: float, structure: str
+) -> np.ndarray:
+    """Return the covariance of the flat data with exponentially decaying correlations.
+
+    Data points ``i`` and ``j`` have the correlation ``correlation ** |i - j|``.
+
+    Arguments:
+        sdev: Standard deviations of the flat data (keys are concatenated).
+        n_keys: Number of data keys. Each key has the same number of points.
+        correlation: Correlation of neighboring data points.
+        structure: ``"none"`` for uncorrelated data, ``"key"`` for correlations
+            within each key and ``"global"`` for correlations across keys.
+    """
+    if structure not in CORRELATIONS:
+        raise ValueError(f"Unknown correlation structure {structure!r}.")
+    if structure == "none" or correlation == 0:
+        return np.diag(sdev**2)
+
+    index = np.arange(sdev.size)
+    corr = correlation ** np.abs(index[:, None] - index[None, :])
+    if structure == "key":
+        key_index = index // (sdev.size // n_keys)
+        corr = np.where(key_index[:, None] == key_index[None, :], corr, 0)
+    return corr * sdev[:, None] * sdev[None, :]
+
+
+def make_synthetic_data(
+    n_params: int = 5,
+    n_data: int = 20,
+    n_keys: int = 1,
+    correlation: float = 0.0,
+    correlation_structure: str = "key",
+    shared_params: bool = True,
+    array_prior: bool = False,
+    noise: float = 0.05,
+    prior_width: float = 2.0,
+    seed: int = 0,
+) -> Tuple[Dict[str, np.ndarray], gv.BufferDict, gv.BufferDict, SyntheticFunction]:
+    """Create independent data, dependent data, prior and fit function of a synthetic fit.
+
+    Data of each key are polynomials of random coefficients evaluated on ``n_data``
+    points between -1 and 1 with (correlated) Gaussian noise.
+    Results only depend on the arguments.
+
+    Arguments:
+        n_params: Number of polynomial coefficients per data key.
+        n_data: Number of data points per key.
+        n_keys: Number of data keys (``d0``, ``d1``, ...).
+        correlation: Correlation of neighboring data points (see :func:`get_data_covariance`).
+        correlation_structure: One of ``"none"``, ``"key"`` and ``"global"``.
+        shared_params: All data keys share the same coefficients. Otherwise, every data key has its own coefficients and the fit decomposes into independent blocks.
+        array_prior: Store coefficients in array-valued prior entries.
+        noise: Relative standard deviation of the data (plus ``noise / 10`` absolute).
+        prior_width: Standard deviation of the prior (centered at zero).
+        seed: Seed of the random numbers.
+    """  # noqa: E501
+    rng = np.random.default_rng(seed)
+    data_keys = [f"d{k}" for k in range(n_keys)]
+    parameter_keys = get_parameter_keys(
+        n_params, data_keys, shared=shared_params, array=array_prior
+    )
+    fcn = SyntheticFunction(parameter_keys)
+
+    prior = gv.BufferDict()
+    for coeffs in parameter_keys.values():
+        for name, _ in coeffs:
+            if name not in prior:
+                prior[name] = (
+                    gv.gvar(np.zeros(n_params), np.full(n_params, prior_width))
+                    if array_prior
+                    else gv.gvar(0, prior_width)
+                )
+    p_true = gv.BufferDict(prior, buf=rng.normal(0, prior_width / 2, prior.size))
+
+    x = {
+        key: np.linspace(-1, 1, n_data) + 0.1 * n / max(n_keys, 1)
+        for n, key in enumerate(data_keys)
+    }
+    y_true = np.concatenate([fcn(x, p_true)[key] for key in data_keys])
+    sdev = noise * np.abs(y_true) + noise / 10
+    cov = get_data_covariance(sdev, n_keys, correlation, correlation_structure)
+    y_mean = y_true + np.linalg.cholesky(cov) @ rng.normal(size=y_true.size)
+
+    y = gv.BufferDict(zip(data_keys, np.split(gv.gvar(y_mean, cov), n_keys)))
+    return x, y, prior, fcn
+
+
+def make_synthetic_fit(**kwargs) -> lsqfit.nonlinear_fit:
+    """Create and solve a synthetic fit.
+
+    Keyword arguments are passed to :func:`make_synthetic_data`; the fit stores them in
+    ``fit.meta`` such that the function can be used as a fit setup function.
+
+    Example:
+        Start the GUI for a fit with 1000 correlated data points::
+
+            run_server(
+                fit_setup_function=make_synthetic_fit,
+                fit_setup_kwargs={"n_params": 10, "n_data": 100, "n_keys": 10, "correlation": 0.5},
+            )
+    """  # noqa: E501
+    x, y, prior, fcn = make_synthetic_data(**kwargs)
+    fit = lsqfit.nonlinear_fit(data=(x, y), fcn=fcn, prior=prior)
+    fit.meta = kwargs
+    return fit
+
+
+class SyntheticModel(lsqfit.MultiFitterModel):
+    """``lsqfit.MultiFitter`` model of one data key of a synthetic fit."""
+
+    def __init__(self, datatag: str, x: np.ndarray, coeffs: List[Tuple[str, Any]]):
+        """Initialize the model.
+
+        Arguments:
+            datatag: The data key.
+            x: The independent data of the key.
+            coeffs: Prior keys (and array indices) of the coefficients.
+        """
+        super().__init__(datatag)
+        self.x = np.array(x)
+        self.coeffs = coeffs
+
+    def fitfcn(self, p):
+        """Return the polynomial of the data key."""
+        return SyntheticFunction({self.datatag: self.coeffs})(
+            {self.datatag: self.x}, p
+        )[self.datatag]
+
+    def buildprior(self, prior, mopt=None):
+        """Extract the coefficients of the model from the prior."""
+        names = dict.fromkeys(name for name, _ in self.coeffs)
+        return gv.BufferDict([(name, prior[name]) for name in names])
+
+    def builddata(self, data):
+        """Extract the data of the model."""
+        return data[self.datatag]
+
+
+def make_synthetic_multi_fitter_fit(chained: bool = False, **kwargs):
+    """Create and solve a synthetic fit with ``lsqfit.MultiFitter`` (one model per data key).
+
+    Keyword arguments are passed to :func:`make_synthetic_data`.
+
+    Arguments:
+        chained: Use ``MultiFitter.chained_lsqfit`` instead of ``MultiFitter.lsqfit``.
+    """  # noqa: E501
+    x, y, prior, fcn = make_synthetic_data(**kwargs)
+    models = [
+        SyntheticModel(key, x[key], coeffs)
+        for key, coeffs in fcn.parameter_keys.items()
+    ]
+    return lsqfit.MultiFitter(models=models).lsqfit(
+        data=y, prior=prior, chained=chained
+    )
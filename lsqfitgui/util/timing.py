@@ -0,0 +1,117 @@
+"""Utilities for timing stages of GUI updates."""
+from typing import Optional, Dict, List, Any, Iterator
+
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+import numpy as np
+
+
+class StageTimer:
+    """Record durations of named stages of GUI updates.
+
+    Keeps the durations of the latest update and a rolling history of durations per
+    stage from which percentiles are computed.
+    Stages which run several times per update are summed up.
+
+    Example:
+        Time the stages of an update::
+
+            timer = StageTimer()
+            timer.start_update()
+            with timer.stage("refit"):
+                fit = refit_with_prior(prior, fit)
+            timer.get_stats()
+    """
+
+    def __init__(self, history: int = 100):
+        """Initialize the timer.
+
+        Arguments:
+            history: Number of durations per stage used for percentiles.
+        """
+        self.history = history
+        self.latest: Dict[str, float] = OrderedDict()
+        """Durations in seconds of the stages of the latest update."""
+        self._history: Dict[str, deque] = OrderedDict()
+        self.totals: Dict[str, List[float]] = OrderedDict()
+        """Number of runs and total duration in seconds of each stage since creation."""
+        self._lock = Lock()
+        self._updating = False
+
+    def start_update(self):
+        """Start a new update such that the latest durations are reset."""
+        with self._lock:
+            self._updating = True
+            self.latest = OrderedDict()
+
+    def finish_update(self):
+        """Finish the current update and add its durations to the history."""
+        with self._lock:
+            for name, seconds in self.latest.items():
+                self._history.setdefault(name, deque(maxlen=self.history)).append(
+                    seconds
+                )
+            self._updating = False
+
+    def record(self, name: str, seconds: float):
+        """Add the duration of a stage.
+
+        Durations outside of updates are directly added to the history.
+        """
+        with self._lock:
+            self.latest[name] = self.latest.get(name, 0.0) + seconds
+            total = self.totals.setdefault(name, [0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+            if not self._updating:
+                self._history.setdefault(name, deque(maxlen=self.history)).append(
+                    seconds
+                )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Context manager which records the duration of the enclosed code."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def get_totals(self) -> Dict[str, List[float]]:
+        """Return a copy of the number of runs and total duration of each stage."""
+        with self._lock:
+            return OrderedDict((name, list(total)) for name, total in self.totals.items())
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return the latest duration, p50, p95 and count of each stage in seconds."""
+        with self._lock:
+            names = list(self._history) + [
+                name for name in self.latest if name not in self._history
+            ]
+            return [
+                {
+                    "stage": name,
+                    "latest": self.latest.get(name),
+                    "p50": _percentile(self._history.get(name), 50),
+                    "p95": _percentile(self._history.get(name), 95),
+                    "count": len(self._history.get(name, ())),
+                }
+                for name in names
+            ]
+
+
+def _percentile(values: Optional[deque], q: float) -> Optional[float]:
+    return float(np.percentile(values, q)) if values else None
+
+
+@contextmanager
+def timed(timer: Optional[StageTimer], name: str) -> Iterator[None]:
+    """Record the duration of the enclosed code if a timer is provided."""
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
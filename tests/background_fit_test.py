@@ -0,0 +1,138 @@
+"""Tests for running fits in the background."""
+
+from threading import Event
+from time import sleep
+
+import pytest
+
+from dash import no_update
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.executor import LatestTaskExecutor
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+
+def test_01_superseded_tasks_are_cancelled():
+    """Checks that only the running and the latest task are executed."""
+    executor = LatestTaskExecutor()
+    started, release = Event(), Event()
+    calls = []
+
+    def task(n):
+        started.set()
+        release.wait(timeout=5)
+        calls.append(n)
+        return n
+
+    for n in range(4):
+        executor.submit(task, n)
+        started.wait(timeout=5)
+    release.set()
+
+    while executor.busy:
+        sleep(0.01)
+
+    assert executor.poll() == (True, 3, None)
+    assert calls == [0, 3]
+    assert executor.n_cancelled == 2
+
+
+def test_02_background_callback_swaps_in_latest_fit():
+    """Checks that the background callback returns the update of the latest state."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        background=True,
+    )
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{k}"}
+        for n in range(2)
+        for k in ("mean", "sdev")
+    ]
+
+    for sdev in ["3", "4", "5"]:
+        *update, status, disabled = gui._update_layout_background_callback(
+            prior_ids, ["0", "1", "0", sdev], [2], None
+        )
+        assert update == gui._get_empty_layout_update(prior_ids)
+        assert status is not None and not disabled
+
+    for n_intervals in range(1, 100):
+        *update, status, disabled = gui._update_layout_background_callback(
+            prior_ids, ["0", "1", "0", "5"], [2], n_intervals
+        )
+        if disabled:
+            break
+        sleep(0.05)
+
+    sidebar, _, content, figures, _ = update
+    assert sidebar is no_update
+    assert content[0] is no_update and len(figures) == len(gui.plots)
+    assert status is None
+    assert gui.fit.prior["a1"].sdev == 5
+
+
+def test_03_background_callback_reports_errors():
+    """Checks that fit errors are displayed instead of raised."""
+    gui = FitGUI(fit=generate_fit(n_poly=1), background=True)
+    prior_ids = [
+        {"type": "prior", "name": "a0-mean"},
+        {"type": "prior", "name": "a0-sdev"},
+    ]
+
+    gui._update_layout_background_callback(prior_ids, ["0", "-1"], [], None)
+    while gui._executor.busy:
+        sleep(0.01)
+    *update, status, disabled = gui._update_layout_background_callback(
+        prior_ids, ["0", "-1"], [], 1
+    )
+
+    assert update == gui._get_empty_layout_update(prior_ids) and disabled
+    assert "Standard deviations" in status.children
+
+
+def test_04_background_callback_matches_mounted_inputs():
+    """Checks that meta changes recreate the sidebar of the polled inputs."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        background=True,
+    )
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{k}"}
+        for n in range(2)
+        for k in ("mean", "sdev")
+    ]
+
+    gui._update_layout_background_callback(prior_ids, ["0", "1"] * 2, [3], None)
+    while gui._executor.busy:
+        sleep(0.01)
+    sidebar, values, *_, status, disabled = gui._update_layout_background_callback(
+        prior_ids, ["0", "1"] * 2, [3], 1
+    )
+
+    assert "a2-sdev" in str(sidebar) and values == [no_update] * 4
+    assert status is None and disabled
+
+
+def test_05_close_shuts_down_pools():
+    """Checks that closing the GUI shuts down its thread pools."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        background=True,
+        fit_cache_size=4,
+        prefetch_depth=1,
+    )
+    gui.run_sweep(wait=False)
+    gui.close()
+
+    for pool in (gui._executor._pool, gui._prefetcher._pool, gui.meta_sweep._pool):
+        with pytest.raises(RuntimeError):
+            pool.submit(print)
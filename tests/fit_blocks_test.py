@@ -0,0 +1,229 @@
+"""Tests for the decomposition of fits into independent blocks."""
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import gvar as gv
+from lsqfit import nonlinear_fit
+
+from example.fit import generate_fit
+from example.lsqfit_stability_example import generate_fit as generate_stability_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.blocks import (
+    get_fit_blocks,
+    get_blocks_from_groups,
+    get_prior_dependencies,
+    refit_blocks,
+    decompose_fit,
+    BlockFit,
+    FitProblem,
+    POSTERIOR_FITTER,
+)
+from lsqfitgui.plot.fit import plot_fit, plot_residuals
+from lsqfitgui.backend.sidebar import (
+    refit_with_prior,
+    get_prior_index,
+    get_prior_structure,
+)
+
+
+def shift_prior_entry(prior, key, mean_shift=0.1):
+    """Shift the mean of a single prior entry by a fraction of its sdev."""
+    prior = gv.BufferDict(prior)
+    prior[key] = gv.gvar(
+        gv.mean(prior[key]) + mean_shift * gv.sdev(prior[key]), gv.sdev(prior[key])
+    )
+    return prior
+
+
+def generate_stability_problem(prior_width=0.4):
+    """Return the stability fit problem with rescaled prior widths."""
+    fit = generate_stability_fit()
+    prior = gv.BufferDict(
+        fit.prior,
+        buf=gv.gvar(gv.mean(fit.prior.buf), prior_width / 0.4 * gv.sdev(fit.prior.buf)),
+    )
+    return FitProblem(data=fit.data, fcn=fit.fcn, prior=prior)
+
+
+def test_01_detect_blocks():
+    """Checks that every (t_min, t_max, n_exp) sub-problem is its own block."""
+    fit = generate_stability_fit()
+    blocks = get_fit_blocks(fit)
+
+    assert len(blocks) == len(fit.y)
+    for block in blocks:
+        assert len(block.data_keys) == 1
+        assert sorted(block.prior_keys) == sorted(
+            [f"{block.data_keys[0]}, key={key}" for key in ("a", "E")]
+        )
+
+
+def test_02_single_block_for_joint_fits():
+    """Checks that fits with shared parameters are not decomposed."""
+    fit = generate_fit(n_poly=4)
+    assert len(get_fit_blocks(fit)) == 1
+
+
+def test_03_refit_blocks_matches_full_refit():
+    """Checks that combining sub-fits reproduces the refit of the full fit."""
+    fit = generate_stability_fit()
+    key = list(fit.prior.keys())[0]
+    prior = shift_prior_entry(fit.prior, key)
+
+    exact = refit_with_prior(prior, fit)
+    block_fit = refit_blocks(prior, fit)
+
+    assert isinstance(block_fit, BlockFit)
+    assert np.allclose(gv.mean(block_fit.p.buf), gv.mean(exact.p.buf), atol=1e-4)
+    assert np.allclose(gv.sdev(block_fit.p.buf), gv.sdev(exact.p.buf), rtol=1e-3)
+    assert np.isclose(block_fit.chi2, exact.chi2, rtol=1e-4)
+    assert block_fit.dof == exact.dof
+    assert np.isclose(block_fit.logGBF, exact.logGBF, rtol=1e-6)
+    assert list(block_fit.prior.keys()) == list(fit.prior.keys())
+    assert block_fit.format(maxline=True)
+
+
+def test_04_only_affected_block_is_refitted():
+    """Checks that later prior changes only refit the affected sub-fit."""
+    fit = generate_stability_fit()
+    key = list(fit.prior.keys())[-1]
+    block_fit = refit_blocks(shift_prior_entry(fit.prior, key), fit)
+    new_fit = refit_blocks(shift_prior_entry(block_fit.prior, key), block_fit)
+
+    refitted = [new is not old for new, old in zip(new_fit.subfits, block_fit.subfits)]
+    assert refitted == [key in block.prior_keys for block in new_fit.blocks]
+    assert sum(refitted) == 1
+
+
+def test_05_block_fit_round_trip():
+    """Checks that combined fits can be saved and loaded."""
+    fit = generate_stability_fit()
+    key = list(fit.prior.keys())[0]
+    block_fit = refit_blocks(shift_prior_entry(fit.prior, key), fit)
+    loaded = gv.loads(gv.dumps(block_fit))
+
+    assert np.isclose(loaded.chi2, block_fit.chi2)
+    assert np.allclose(gv.mean(loaded.p.buf), gv.mean(block_fit.p.buf))
+
+
+def test_06_gui_incremental_refit():
+    """Checks that the GUI refits blocks for prior updates if enabled."""
+    fit = generate_stability_fit()
+    gui = FitGUI(fit, incremental_refit=True)
+    index = get_prior_index(get_prior_structure(fit.prior))
+    names = list(index.slots)
+    values = [
+        str(gv.mean(fit.prior.buf[pos]) if kind == 0 else gv.sdev(fit.prior.buf[pos]))
+        for kind, pos in index.slots.values()
+    ]
+    values[0] = str(float(values[0]) + 0.05)
+    prior_ids = [{"type": "prior", "name": name} for name in names]
+
+    gui._update_layout_callback(prior_ids, values, [])
+    assert isinstance(gui.fit, BlockFit)
+    assert np.isclose(gv.mean(gui.fit.prior.buf[0]), float(values[0]))
+
+
+def test_07_decompose_problem_in_processes():
+    """Checks that sub-fits solved in worker processes reproduce the joint fit."""
+    problem = generate_stability_problem()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        block_fit = decompose_fit(problem, pool=pool)
+    exact = problem.fit()
+
+    assert isinstance(block_fit, BlockFit)
+    assert len(block_fit.subfits) == len(problem.y)
+    assert np.allclose(gv.mean(block_fit.p.buf), gv.mean(exact.p.buf), atol=1e-4)
+    assert np.isclose(block_fit.chi2, exact.chi2, rtol=1e-4)
+    assert plot_fit(block_fit) is not None
+    assert plot_residuals(block_fit) is not None
+
+
+def test_08_blocks_from_groups():
+    """Checks user defined groups of data keys."""
+    problem = generate_stability_problem()
+    keys = list(problem.y.keys())
+    half = len(keys) // 2
+    groups = [keys[:half], keys[half:]]
+    blocks = get_blocks_from_groups(problem, groups)
+
+    assert [block.data_keys for block in blocks] == [tuple(group) for group in groups]
+    assert sum(len(block.prior_keys) for block in blocks) == len(problem.prior)
+
+    block_fit = decompose_fit(problem, groups=groups)
+    assert len(block_fit.subfits) == 2
+    assert np.isclose(block_fit.chi2, problem.fit().chi2, rtol=1e-4)
+
+    with pytest.raises(ValueError):
+        get_blocks_from_groups(problem, [keys[:-1]])
+
+
+def test_09_gui_decomposes_fit_setup():
+    """Checks that the GUI decomposes fits of the setup function on meta changes."""
+    gui = FitGUI(
+        fit_setup_function=generate_stability_problem,
+        fit_setup_kwargs={"prior_width": 0.4},
+        meta_config=[
+            {"name": "prior_width", "type": "number", "min": 0.1, "step": 0.1}
+        ],
+        decompose=True,
+    )
+    assert isinstance(gui.initial_fit, BlockFit)
+
+    gui._update_layout_callback([], [], [0.5])
+    assert isinstance(gui.fit, BlockFit)
+    assert np.isclose(gv.sdev(gui.fit.prior.buf[0]), 0.5)
+
+
+def test_10_dependencies_with_vanishing_derivatives():
+    """Checks that dependencies are found if derivatives vanish at the prior mean."""
+    prior = gv.BufferDict(a=gv.gvar(1, 1), b=gv.gvar(0, 1), c=gv.gvar(1, 1))
+    y = gv.BufferDict(y1=gv.gvar([1, 2], [1, 1]), y2=gv.gvar(1, 1))
+
+    def fcn(x, p):
+        return {"y1": x * p["a"] * p["b"], "y2": p["c"]}
+
+    problem = FitProblem(data=(np.arange(1, 3), y), fcn=fcn, prior=prior)
+    assert get_prior_dependencies(problem) == {"y1": {"a", "b"}, "y2": {"c"}}
+    assert len(get_fit_blocks(problem)) == 2
+
+
+def test_11_unaffected_blocks_are_seeded_from_joint_fit():
+    """Checks that the first call only fits blocks affected by the prior change."""
+    fit = generate_stability_fit()
+    key = list(fit.prior.keys())[-1]
+    block_fit = refit_blocks(shift_prior_entry(fit.prior, key), fit)
+
+    affected = [key in block.prior_keys for block in block_fit.blocks]
+    assert [subfit.nit > 0 for subfit in block_fit.subfits] == affected
+    seeded = block_fit.subfits[0]
+    assert not affected[0] and seeded.fitter == fit.fitter
+    for prior_key in block_fit.blocks[0].prior_keys:
+        assert np.allclose(gv.mean(seeded.p[prior_key]), gv.mean(fit.p[prior_key]))
+        assert np.allclose(
+            gv.sdev(seeded.p[prior_key]), gv.sdev(fit.p[prior_key]), rtol=1e-3
+        )
+
+    refit = refit_blocks(shift_prior_entry(block_fit.prior, key, -0.1), block_fit)
+    assert refit.subfits[0] is seeded
+
+
+def test_12_posterior_fitter_is_not_registered():
+    """Checks that seeding sub-fits does not leave a fitter in lsqfit."""
+    fit = generate_stability_fit()
+    refit_blocks(shift_prior_entry(fit.prior, list(fit.prior.keys())[0]), fit)
+    assert POSTERIOR_FITTER not in nonlinear_fit.FITTERS
+
+
+def test_13_joint_fits_are_decomposed_once(monkeypatch):
+    """Checks that fits which can not be decomposed are not probed on every edit."""
+    fit = generate_fit(n_poly=4)
+    new_fit = refit_blocks(shift_prior_entry(fit.prior, "a0"), fit)
+    assert not isinstance(new_fit, BlockFit) and len(new_fit.blocks) == 1
+
+    monkeypatch.setattr("lsqfitgui.backend.blocks.get_fit_blocks", None)
+    newer_fit = refit_blocks(shift_prior_entry(new_fit.prior, "a0"), new_fit)
+    assert newer_fit.blocks == new_fit.blocks
@@ -0,0 +1,79 @@
+"""Tests for caching fits in the GUI."""
+
+import pytest
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.cache import FitCache, get_fit_fingerprint, estimate_fit_memory
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+
+@pytest.fixture
+def fits():
+    """Provide fits for different numbers of polynomials."""
+    return {n_poly: generate_fit(n_poly=n_poly) for n_poly in range(1, 5)}
+
+
+def test_01_lru_eviction(fits):
+    """Checks that least recently used fits are evicted."""
+    cache = FitCache(max_size=2)
+    cache[1], cache[2] = fits[1], fits[2]
+    assert cache.get(1) is fits[1]
+    cache[3] = fits[3]
+
+    assert 2 not in cache
+    assert 1 in cache and 3 in cache
+    assert cache.get(2) is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+
+def test_02_memory_budget(fits):
+    """Checks that the memory budget limits the cache but keeps the latest fit."""
+    cache = FitCache(max_size=10, max_memory=estimate_fit_memory(fits[4]))
+    for n_poly, fit in fits.items():
+        cache[n_poly] = fit
+
+    assert list(cache._fits) == [4]
+    assert cache.memory <= cache.max_memory
+
+
+def test_03_fingerprint(fits):
+    """Checks that the fingerprint depends on setup, prior and function."""
+    fit = fits[2]
+    key = get_fit_fingerprint({"n_poly": 2}, fit.prior, fit.fcn)
+
+    assert key == get_fit_fingerprint({"n_poly": 2}, dict(fit.prior), fit.fcn)
+    assert key != get_fit_fingerprint({"n_poly": 3}, fit.prior, fit.fcn)
+    assert key != get_fit_fingerprint({"n_poly": 2}, fits[3].prior, fit.fcn)
+    assert key != get_fit_fingerprint({"n_poly": 2}, fit.prior, generate_fit)
+
+
+def test_04_gui_toggle_meta_and_prior():
+    """Checks that toggling meta and prior values hits the cache."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        fit_cache_size=8,
+    )
+    initial_fit = gui.fit
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(2)
+        for kind in ("mean", "sdev")
+    ]
+
+    gui._update_layout_callback(prior_ids, ["0", "1", "0", "3"], [2])
+    changed_fit = gui.fit
+    assert changed_fit is not initial_fit
+    gui._update_layout_callback(prior_ids, ["0", "1", "0", "2"], [2])
+    assert gui.fit is initial_fit
+
+    gui._update_layout_callback(prior_ids, ["0", "1", "0", "2"], [3])
+    assert len(gui.fit.prior) == 3
+    gui._update_layout_callback(prior_ids, ["0", "1", "0", "2"], [2])
+    assert gui.fit is initial_fit
+
+    assert gui.fit_cache.stats()["hits"] == 2
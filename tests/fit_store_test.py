@@ -0,0 +1,87 @@
+"""Tests for storing fits in memory-mapped fit stores."""
+import numpy as np
+import gvar as gv
+
+from example.fit import generate_fit, fcn
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.sidebar import refit_with_prior
+from lsqfitgui.backend.store import (
+    FitStore,
+    StoredFit,
+    save_fit_store,
+    open_fit,
+    get_function_reference,
+    resolve_function_reference,
+)
+
+
+def test_01_store_round_trip(tmp_path):
+    """Checks that means, covariances and statistics are restored."""
+    fit = generate_fit(n_poly=3)
+    save_fit_store(fit, str(tmp_path), setup={"n_poly": 3})
+    store = FitStore(str(tmp_path))
+
+    assert store.setup == {"n_poly": 3}
+    assert store.fcn_reference == "example.fit:fcn"
+    assert np.isclose(store.summary["chi2"], fit.chi2)
+    assert np.isclose(store.summary["logGBF"], fit.logGBF)
+    assert isinstance(store.get_mean_buffer("p"), np.memmap)
+
+    loaded = store.load_fit()
+    assert isinstance(loaded, StoredFit) and loaded.fcn is fcn
+    assert loaded.meta == {"n_poly": 3}
+    assert np.allclose(loaded.pmean.buf, gv.mean(fit.p.buf))
+    assert np.allclose(gv.evalcov(loaded.p.buf), gv.evalcov(fit.p.buf))
+    assert np.allclose(loaded.cov, gv.evalcov(fit.p.buf))
+    assert np.allclose(store.get_cov("y"), gv.evalcov(fit.y))
+    assert np.allclose(gv.evalcov(loaded.y), gv.evalcov(fit.y))
+    assert np.allclose(loaded.x, fit.x)
+    assert "Least Squares Fit" in loaded.format(maxline=True)
+
+
+def test_02_refit_and_gui(tmp_path):
+    """Checks that stored fits can be refitted and opened in the GUI."""
+    fit = generate_fit(n_poly=3)
+    save_fit_store(fit, str(tmp_path))
+    loaded = open_fit(str(tmp_path))
+
+    prior = gv.BufferDict(loaded.prior)
+    prior["a0"] = gv.gvar(1, 2)
+    expected = refit_with_prior(prior, fit)
+    new_fit = refit_with_prior(prior, loaded)
+    assert np.allclose(gv.mean(new_fit.p.buf), gv.mean(expected.p.buf), atol=1e-6)
+
+    gui = FitGUI(fit=loaded)
+    assert gui.fit is loaded
+
+
+def test_03_function_references():
+    """Checks that local functions are not referenced."""
+    assert resolve_function_reference(get_function_reference(fcn)) is fcn
+    assert get_function_reference(lambda x, p: p) is None
+    assert resolve_function_reference("example.fit:missing") is None
+
+
+def test_04_open_store_lazily(tmp_path, monkeypatch):
+    """Checks that opening a store does not read covariance blocks or buffers."""
+    save_fit_store(generate_fit(n_poly=3), str(tmp_path))
+    reads = []
+    for name in ["iter_cov_blocks", "get_mean_buffer", "get_sdev_buffer"]:
+        method = getattr(FitStore, name)
+        monkeypatch.setattr(
+            FitStore,
+            name,
+            lambda self, group, method=method, name=name: (
+                reads.append((name, group)) or method(self, group)
+            ),
+        )
+
+    loaded = open_fit(str(tmp_path))
+    assert reads == [] and loaded.chi2 > 0
+
+    assert loaded.pmean.size == 3
+    assert reads == [("get_mean_buffer", "p")]
+    assert len(loaded.p) == 3
+    assert ("iter_cov_blocks", "p") in reads
+    assert ("iter_cov_blocks", "y") not in reads
@@ -0,0 +1,116 @@
+"""Tests for the cached latex expressions of fit functions."""
+from time import sleep, perf_counter
+from functools import partial
+
+import numpy as np
+import gvar as gv
+import lsqfit
+from dash import dcc, html, no_update
+
+from lsqfitgui import FitGUI
+from lsqfitgui.frontend import content
+from lsqfitgui.frontend.content import get_fit_documentation
+from lsqfitgui.util.function import (
+    get_function_expression,
+    is_function_expression_pending,
+    parse_function_expression,
+    FUNCTION_EXPRESSION_CACHE_SIZE,
+)
+
+
+def make_counting_function(delay: float = 0):
+    """Return a fit function which counts its calls."""
+    calls = []
+
+    def fcn(x, p):
+        calls.append(x)
+        sleep(delay)
+        return p["a"] + p["b"][0] * x + p["b"][1] * x ** 2
+
+    return fcn, calls
+
+
+def wait_for_expression(fcn, parameters, timeout: float = 5):
+    """Wait until the expression of the function is parsed."""
+    start = perf_counter()
+    while is_function_expression_pending(fcn, parameters):
+        assert perf_counter() - start < timeout
+        sleep(0.01)
+
+
+def has_expression(documentation):
+    """Return whether the documentation contains a latex expression."""
+    return any(
+        isinstance(el, html.P) and el.children.startswith("$$") for el in documentation
+    )
+
+
+def test_01_expression_is_cached():
+    """Checks that the function is parsed once per parameter structure."""
+    fcn, calls = make_counting_function()
+    parameters = {"a": 1.0, "b": np.ones(2)}
+
+    expression = get_function_expression(fcn, parameters)
+    assert expression == parse_function_expression(fcn, parameters)
+    assert get_function_expression(fcn, {"a": 2.0, "b": np.zeros(2)}) == expression
+    assert len(calls) == 2
+
+    get_function_expression(fcn, {"a": 1.0, "b": np.ones(3)})
+    assert len(calls) == 3
+
+
+def test_02_expression_timeout():
+    """Checks that slow functions block only once and are available once parsed."""
+    fcn, calls = make_counting_function(delay=0.5)
+    parameters = {"a": 1.0, "b": np.ones(2)}
+
+    assert get_function_expression(fcn, parameters, timeout=0.01) is None
+    start = perf_counter()
+    assert get_function_expression(fcn, parameters, timeout=2) is None
+    assert perf_counter() - start < 0.1
+
+    wait_for_expression(fcn, parameters)
+    assert get_function_expression(fcn, parameters, timeout=0) is not None
+    assert len(calls) == 1
+
+
+def test_03_pending_expressions_are_not_parsed_twice():
+    """Checks that pending expressions are neither evicted nor parsed again."""
+    fcn, calls = make_counting_function(delay=0.5)
+    parameters = {"a": 1.0, "b": np.ones(2)}
+
+    assert get_function_expression(fcn, parameters, timeout=0) is None
+    for size in range(4, 4 + FUNCTION_EXPRESSION_CACHE_SIZE):
+        other, _ = make_counting_function()
+        get_function_expression(other, {"a": 1.0, "b": np.ones(size)})
+    assert is_function_expression_pending(fcn, parameters)
+    assert get_function_expression(fcn, parameters, timeout=0) is None
+    wait_for_expression(fcn, parameters)
+    assert get_function_expression(fcn, parameters, timeout=0) is not None
+    assert len(calls) == 1
+
+
+def test_04_gui_refreshes_documentation(monkeypatch):
+    """Checks that the documentation is refreshed once the expression is parsed."""
+    monkeypatch.setattr(
+        content, "get_function_expression", partial(get_function_expression, timeout=0)
+    )
+    fcn, _ = make_counting_function()
+    x = np.arange(1, 4)
+    y = gv.gvar(1 + 2 * x + 3 * x ** 2, np.ones(3))
+    prior = gv.BufferDict(a=gv.gvar(0, 10), b=gv.gvar([0, 0], [10, 10]))
+    fit = lsqfit.nonlinear_fit(data=(x, y), fcn=fcn, prior=prior)
+    fit.fcn, _ = make_counting_function(delay=0.5)
+
+    gui = FitGUI(fit=fit)
+    pending = get_fit_documentation(gui.fit)
+    assert not has_expression(pending)
+    assert not [el for el in pending if isinstance(el, dcc.Interval)][0].disabled
+    assert is_function_expression_pending(fit.fcn, fit.p)
+    assert gui._function_expression_callback(1) is no_update
+
+    sleep(1)
+    documentation = gui._function_expression_callback(2)
+    assert has_expression(documentation)
+    interval = [el for el in documentation if isinstance(el, dcc.Interval)]
+    assert interval[0].disabled
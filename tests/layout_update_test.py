@@ -0,0 +1,99 @@
+"""Tests for targeted layout updates."""
+import json
+
+from dash import no_update
+from plotly.utils import PlotlyJSONEncoder
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.frontend.dashboard import get_updated_values
+from lsqfitgui.util.synthetic import make_synthetic_fit
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+
+def get_prior_ids(n_poly):
+    """Return the ids of the prior inputs."""
+    return [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(n_poly)
+        for kind in ("mean", "sdev")
+    ]
+
+
+def test_01_prior_change_only_updates_fit_results():
+    """Checks that prior changes do not resend the sidebar and documentation."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+    )
+    layout_size = len(json.dumps(gui.layout, cls=PlotlyJSONEncoder))
+
+    update = gui._update_layout_callback(get_prior_ids(2), ["0", "1", "0", "3"], [2])
+    sidebar, values, content, figures, add = update
+    assert sidebar is no_update and add is no_update
+    assert values == [no_update] * 4
+    assert content[0] is no_update and content[1] == str(gui.fit)
+    assert len(figures) == len(gui.plots)
+
+    update_size = len(json.dumps(get_updated_values(update), cls=PlotlyJSONEncoder))
+    assert update_size < layout_size
+
+    update = gui._update_layout_callback(get_prior_ids(2), ["0", "1", "0", "3"], [2])
+    assert update == gui._get_empty_layout_update(get_prior_ids(2))
+
+
+def test_02_meta_change_updates_sidebar():
+    """Checks that meta changes of the prior structure recreate the sidebar."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+    )
+    update = gui._update_layout_callback(get_prior_ids(2), ["0", "1", "0", "3"], [3])
+    sidebar, values, content, figures, _ = update
+    assert "a2-sdev" in str(sidebar)
+    assert values == [no_update] * 4
+    assert content[0] is not no_update
+    assert "a2-sdev" in str(gui.layout)
+
+    update = gui._update_layout_callback(get_prior_ids(3), ["0", "1"] * 3, [3])
+    assert update[1] == [no_update] * 6
+
+
+def test_03_meta_change_keeps_sidebar_mounted():
+    """Checks that meta changes of prior values only update the prior inputs."""
+    gui = FitGUI(
+        fit_setup_function=make_synthetic_fit,
+        fit_setup_kwargs={"n_params": 3, "prior_width": 2},
+        meta_config=[{"name": "prior_width", "type": "number", "min": 1, "step": 1}],
+    )
+    prior_ids = [
+        {"type": "prior", "name": f"c{n}-{kind}"}
+        for n in range(3)
+        for kind in ("mean", "sdev")
+    ]
+    update = gui._update_layout_callback(prior_ids, ["0.0", "2.0"] * 3, [3])
+    sidebar, values, content, _, _ = update
+    assert sidebar is no_update
+    assert values == ["0.0", "3.0"] * 3
+    assert content[0] is not no_update
+
+
+def test_04_no_default_content():
+    """Checks that wildcard outputs are empty without the default content."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), use_default_content=False)
+    update = gui._update_layout_callback(get_prior_ids(2), ["0", "1", "0", "3"], [])
+    assert update[2:4] == [[], []]
+    assert gui._get_empty_layout_update(get_prior_ids(2))[2:4] == [[], []]
+
+
+def test_05_export_prior_on_open():
+    """Checks that export strings are created for the current fit once opened."""
+    gui = FitGUI(fit=generate_fit(n_poly=2))
+    gui._update_layout_callback(get_prior_ids(2), ["0", "1", "0", "3"], [])
+    is_open, export_json, *_ = gui._export_prior_callback(1, 0, False)
+    assert is_open and json.loads(export_json)["a1"] == "0 ± 3.0"
+    assert gui._export_prior_callback(1, 1, True)[1:] == [no_update] * 3
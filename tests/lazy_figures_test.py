@@ -0,0 +1,59 @@
+"""Tests for creating figures of content tabs once they are selected."""
+from dash import no_update
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.frontend.content import get_plot_index
+from lsqfitgui.plot.fit import plot_fit, plot_residuals
+
+
+def get_counting_plots(counts):
+    """Return plots which count how often their figures are created."""
+
+    def count(fcn, name):
+        def plot(fit):
+            counts[name] = counts.get(name, 0) + 1
+            return fcn(fit)
+
+        return plot
+
+    return [
+        {"name": "Fit", "fcn": count(plot_fit, "fit")},
+        {"name": "Residuals", "fcn": count(plot_residuals, "residuals")},
+    ]
+
+
+def test_01_plot_index():
+    """Checks that tab values are mapped to plot indices."""
+    assert get_plot_index("figure-1") == 1
+    assert get_plot_index("tab-details") is None and get_plot_index(None) is None
+
+
+def test_02_only_active_figure_is_created():
+    """Checks that figures are created once their tab is selected."""
+    counts = {}
+    gui = FitGUI(fit=generate_fit(n_poly=2))
+    gui.plots = get_counting_plots(counts)
+    gui.setup_app()
+    assert counts == {"fit": 1}
+
+    figures = gui._content_tabs_callback("figure-1")
+    assert figures[0] is no_update and figures[1] is not no_update
+    assert gui._content_tabs_callback("figure-0")[0] is not no_update
+    assert gui._content_tabs_callback("figure-1")[0] is no_update
+    assert gui._content_tabs_callback("tab-details") == [no_update] * 2
+    assert counts == {"fit": 1, "residuals": 1}
+
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(2)
+        for kind in ("mean", "sdev")
+    ]
+    gui._content_tabs_callback("figure-1")
+    *_, figures, _ = gui._update_layout_callback(prior_ids, ["0", "1", "0", "3"], [])
+    assert figures[0] is no_update and figures[1] is not no_update
+    assert counts == {"fit": 1, "residuals": 2}
+
+    gui._content_tabs_callback("figure-0")
+    assert counts == {"fit": 2, "residuals": 2}
@@ -0,0 +1,130 @@
+"""Tests for the metrics route of the GUI server."""
+import json
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.metrics import get_callback_output
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+UPDATE_LAYOUT_OUTPUT = (
+    "..sticky-sidebar.children"
+    '...{"name":["ALL"],"type":"prior"}.value'
+    '...{"name":["ALL"],"type":"fit-content"}.children'
+    '...{"index":["ALL"],"type":"fit-figure"}.figure'
+    "...additional-content.children.."
+)
+
+
+def get_callback_request(n_poly):
+    """Return the body of a Dash request for the layout update callback."""
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(2)
+        for kind in ("mean", "sdev")
+    ]
+    return {
+        "output": UPDATE_LAYOUT_OUTPUT,
+        "outputs": [
+            {"id": "sticky-sidebar", "property": "children"},
+            [{"id": idx, "property": "value"} for idx in prior_ids],
+            [
+                {"id": {"type": "fit-content", "name": name}, "property": "children"}
+                for name in ("documentation", "summary", "details")
+            ],
+            [
+                {"id": {"type": "fit-figure", "index": n}, "property": "figure"}
+                for n in range(2)
+            ],
+            {"id": "additional-content", "property": "children"},
+        ],
+        "inputs": [
+            [{"id": idx, "property": "id", "value": idx} for idx in prior_ids],
+            [
+                {"id": idx, "property": "value", "value": val}
+                for idx, val in zip(prior_ids, ["0", "2", "0", "3"])
+            ],
+            [
+                {
+                    "id": {"type": "meta", "name": "n_poly"},
+                    "property": "value",
+                    "value": n_poly,
+                }
+            ],
+            [],
+        ],
+        "state": [[]],
+        "changedPropIds": ['{"name":"n_poly","type":"meta"}.value'],
+    }
+
+
+def test_01_metrics_route():
+    """Checks that callbacks, fit durations and cache counters are exposed."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        fit_cache_size=4,
+        metrics=True,
+    )
+    gui.setup_app()
+    client = gui.app.server.test_client()
+
+    for n_poly in (3, 2, 3):
+        response = client.post(
+            "/_dash-update-component",
+            data=json.dumps(get_callback_request(n_poly)),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    lines = response.get_data(as_text=True).splitlines()
+
+    label = 'output="' + UPDATE_LAYOUT_OUTPUT.replace('"', '\\"') + '"'
+    assert f"lsqfitgui_callbacks_total{{{label}}} 3" in lines
+    assert 'lsqfitgui_fit_seconds_count{stage="fit setup"} 1' in lines
+    assert "lsqfitgui_fit_cache_hits_total 2" in lines
+    assert "lsqfitgui_active_sessions 1" in lines
+    assert any(
+        line.startswith(f"lsqfitgui_callback_response_bytes_sum{{{label}}}")
+        for line in lines
+    )
+    assert any(
+        line.startswith("lsqfitgui_process_resident_memory_bytes") for line in lines
+    )
+
+
+def test_02_cache_totals_survive_clear():
+    """Checks that cache counters of the metrics do not decrease if it is cleared."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        fit_cache_size=4,
+        metrics=True,
+    )
+    gui.setup_app()
+    client = gui.app.server.test_client()
+    for n_poly in (3, 2):
+        client.post(
+            "/_dash-update-component",
+            data=json.dumps(get_callback_request(n_poly)),
+            content_type="application/json",
+        )
+
+    gui.fit_cache.clear()
+    assert gui.fit_cache.hits == 0
+    lines = client.get("/metrics").get_data(as_text=True).splitlines()
+    assert "lsqfitgui_fit_cache_hits_total 1" in lines
+    assert "lsqfitgui_fit_cache_misses_total 1" in lines
+
+
+def test_03_output_from_request_prefix():
+    """Checks that the output id is read from the start of the request body."""
+    body = json.dumps(get_callback_request(2)).encode()
+    assert get_callback_output(body) == UPDATE_LAYOUT_OUTPUT
+    assert get_callback_output(b'{"inputs": []}') == "unknown"
@@ -0,0 +1,87 @@
+"""Tests for fits created by ``lsqfit.MultiFitter``."""
+import pytest
+
+import numpy as np
+import gvar as gv
+import lsqfit
+
+from example.lsqfit_multi_fitter_example import (
+    make_models,
+    make_data,
+    make_prior,
+    make_fitter,
+)
+
+from lsqfitgui import FitGUI
+from lsqfitgui.util.models import lsqfit_from_multi_model_fit, MultiFitterFit
+from lsqfitgui.backend.sidebar import refit_with_prior
+
+
+@pytest.mark.parametrize("chained", [False, True])
+def test_01_convert_without_refit(chained):
+    """Checks that converted fits keep the results of the MultiFitter fit."""
+    multi_model_fit = lsqfit.MultiFitter(models=make_models()).lsqfit(
+        data=make_data(), prior=make_prior(), chained=chained
+    )
+    fit = lsqfit_from_multi_model_fit(multi_model_fit)
+
+    assert isinstance(fit, MultiFitterFit) and fit.chained == chained
+    assert fit.chi2 == multi_model_fit.chi2
+    assert np.allclose(gv.mean(fit.p.buf), gv.mean(multi_model_fit.p.buf))
+    assert list(fit.pdata.keys()) == ["d1", "d2", "d3", "d4"]
+    assert np.allclose(
+        gv.mean(fit.fcn(fit.x, fit.p)["d1"]), gv.mean(multi_model_fit.fcn(fit.p)["d1"])
+    )
+
+
+@pytest.mark.parametrize("chained", [False, True])
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_02_refit_with_multi_fitter(chained, warm_start):
+    """Checks that prior updates refit via the MultiFitter and keep the fit function."""
+    fit = lsqfit_from_multi_model_fit(
+        lsqfit.MultiFitter(models=make_models()).lsqfit(
+            data=make_data(), prior=make_prior(), chained=chained
+        )
+    )
+    prior = gv.BufferDict(fit.prior)
+    prior["a"] = gv.gvar(0.5, 1)
+
+    new_fit = refit_with_prior(prior, fit, warm_start=warm_start)
+    expected = lsqfit.MultiFitter(models=make_models()).lsqfit(
+        data=make_data(), prior=prior, chained=chained
+    )
+
+    assert isinstance(new_fit, MultiFitterFit) and new_fit.chained == chained
+    assert new_fit.fcn is fit.fcn
+    assert np.allclose(gv.mean(new_fit.p.buf), gv.mean(expected.p.buf), atol=1e-6)
+    assert np.isclose(new_fit.chi2, expected.chi2)
+
+
+def test_03_round_trip():
+    """Checks that converted fits can be saved and loaded."""
+    fit = lsqfit_from_multi_model_fit(make_fitter())
+    loaded = gv.loads(gv.dumps(fit))
+
+    assert isinstance(loaded, MultiFitterFit)
+    assert np.allclose(gv.mean(loaded.p.buf), gv.mean(fit.p.buf))
+    assert np.allclose(
+        gv.mean(loaded.fcn(loaded.x, loaded.p).buf), gv.mean(fit.fcn(fit.x, fit.p).buf)
+    )
+
+
+def test_04_gui_prior_update():
+    """Checks that the GUI refits MultiFitter fits with warm starts."""
+    gui = FitGUI(fit_setup_function=make_fitter, warm_start=True)
+    assert isinstance(gui.fit, MultiFitterFit)
+
+    keys = list(gui.fit.prior.keys())
+    prior_ids = [
+        {"type": "prior", "name": f"{key}-{kind}"}
+        for key in keys
+        for kind in ("mean", "sdev")
+    ]
+    values = [val for key in keys for val in ("0", "2")]
+    gui._update_layout_callback(prior_ids, values, [])
+
+    assert isinstance(gui.fit, MultiFitterFit)
+    assert gui.fit.prior["a"].sdev == 2
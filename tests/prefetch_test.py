@@ -0,0 +1,81 @@
+"""Tests for prefetching fits of neighbouring meta values."""
+
+from concurrent.futures import wait
+from threading import Event
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.cache import FitCache
+from lsqfitgui.backend.prefetch import get_neighbouring_setups, MetaPrefetcher
+from lsqfitgui.backend.sweep import get_meta_values
+
+META_CONFIG = [
+    {"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1},
+    {"name": "kind", "options": [{"label": k, "value": k} for k in "abcd"]},
+]
+
+
+def test_01_neighbouring_setups():
+    """Checks that neighbours respect bounds, options and are ordered by distance."""
+    setups = get_neighbouring_setups(
+        {"n_poly": 2, "kind": "a", "other": 0}, META_CONFIG, depth=2
+    )
+    assert setups == [
+        {"n_poly": 3, "kind": "a", "other": 0},
+        {"n_poly": 1, "kind": "a", "other": 0},
+        {"n_poly": 2, "kind": "b", "other": 0},
+        {"n_poly": 4, "kind": "a", "other": 0},
+        {"n_poly": 2, "kind": "c", "other": 0},
+    ]
+
+
+def test_02_gui_meta_update_hits_prefetched_fit():
+    """Checks that stepping a meta value uses the prefetched fit."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 3},
+        meta_config=META_CONFIG[:1],
+        fit_cache_size=8,
+        prefetch_depth=1,
+        prefetch_workers=2,
+    )
+    wait(gui._prefetcher._futures.values(), timeout=10)
+    assert gui._prefetcher.n_prefetched == 2
+
+    gui._update_layout_callback([], [], [4])
+    assert len(gui.fit.prior) == 4
+    assert gui.fit_cache.hits == 1 and gui.fit_cache.misses == 0
+
+    wait(gui._prefetcher._futures.values(), timeout=10)
+    assert gui._prefetcher.n_prefetched == 3
+    gui._prefetcher.shutdown()
+
+
+def test_03_float_steps_match_typed_values():
+    """Checks that neighbours of float steps equal typed and sweep values."""
+    config = {"name": "x", "type": "number", "min": 0, "max": 1, "step": 0.1}
+    setups = get_neighbouring_setups({"x": 0.2}, [config], depth=2)
+    assert [setup["x"] for setup in setups] == [0.3, 0.1, 0.4, 0.0]
+    assert all(setup["x"] in get_meta_values(config) for setup in setups)
+
+
+def test_04_wait_cancels_queued_prefetch():
+    """Checks that waiting for a queued prefetch cancels it instead of waiting."""
+    release = Event()
+    calls = []
+
+    def fit_setup(n_poly):
+        calls.append(n_poly)
+        release.wait(10)
+        return generate_fit(n_poly=n_poly)
+
+    prefetcher = MetaPrefetcher(fit_setup, FitCache(), META_CONFIG[:1], max_workers=1)
+    running, queued = prefetcher.prefetch({"n_poly": 3})
+    prefetcher.wait({"n_poly": 2}, timeout=1)
+    assert queued.cancelled() and not running.done()
+
+    release.set()
+    prefetcher.wait({"n_poly": 4})
+    assert running.done() and calls == [4]
+    prefetcher.shutdown()
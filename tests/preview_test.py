@@ -0,0 +1,79 @@
+"""Tests for linear-response previews of prior changes."""
+
+from time import sleep
+
+import numpy as np
+import gvar as gv
+
+from dash import no_update
+
+from example.fit import generate_fit
+from example.lsqfit_stability_example import generate_fit as generate_stability_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.preview import LinearResponsePreview, PREVIEW_LABEL
+from lsqfitgui.backend.sidebar import refit_with_prior
+
+
+def shift_prior(prior, mean_shift=0.1, sdev_scale=1.2):
+    """Shift prior means by a fraction of the sdev and rescale the sdevs."""
+    return gv.BufferDict(
+        {
+            key: gv.gvar(
+                gv.mean(val) + mean_shift * gv.sdev(val), gv.sdev(val) * sdev_scale
+            )
+            for key, val in prior.items()
+        }
+    )
+
+
+def test_01_preview_is_exact_for_linear_fits():
+    """Checks that the preview reproduces refits of fits linear in parameters."""
+    fit = generate_fit(n_poly=4)
+    prior = shift_prior(fit.prior)
+    exact = refit_with_prior(prior, fit)
+    preview = LinearResponsePreview(fit, prior)
+
+    assert np.allclose(gv.mean(preview.p.buf), gv.mean(exact.p.buf))
+    assert np.allclose(gv.sdev(preview.p.buf), gv.sdev(exact.p.buf), rtol=1e-3)
+    assert np.isclose(preview.chi2, exact.chi2)
+    assert np.isclose(preview.logGBF, exact.logGBF)
+    assert str(preview).startswith(PREVIEW_LABEL)
+
+
+def test_02_preview_approximates_nonlinear_fits():
+    """Checks that the preview approximates refits for small prior changes."""
+    fit = generate_stability_fit()
+    prior = shift_prior(fit.prior, mean_shift=0.05, sdev_scale=1.05)
+    exact = refit_with_prior(prior, fit)
+    preview = LinearResponsePreview(fit, prior)
+
+    pull = (gv.mean(preview.p.buf) - gv.mean(exact.p.buf)) / gv.sdev(exact.p.buf)
+    assert np.max(np.abs(pull)) < 0.1
+    assert np.isclose(preview.chi2, exact.chi2, rtol=1e-2)
+
+
+def test_03_gui_renders_preview_before_refit():
+    """Checks that the GUI first renders the preview and swaps in the exact fit."""
+    gui = FitGUI(fit=generate_fit(n_poly=1), preview=True)
+    prior_ids = [
+        {"type": "prior", "name": "a0-mean"},
+        {"type": "prior", "name": "a0-sdev"},
+    ]
+
+    *update, status, _ = gui._update_layout_background_callback(
+        prior_ids, ["0.5", "2"], [], None
+    )
+    sidebar, _, content, figures, _ = update
+    assert sidebar is no_update and PREVIEW_LABEL in content[1]
+    assert len(figures) == len(gui.plots)
+    assert "preview" in status.children
+
+    while gui._executor.busy:
+        sleep(0.01)
+    *update, status, disabled = gui._update_layout_background_callback(
+        prior_ids, ["0.5", "2"], [], 1
+    )
+    assert PREVIEW_LABEL not in update[2][1] and status is None and disabled
+    assert not isinstance(gui.fit, LinearResponsePreview)
+    assert gui.fit.prior["a0"].sdev == 2
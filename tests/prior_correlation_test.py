@@ -0,0 +1,67 @@
+"""Tests for checking correlations of priors."""
+
+import pytest
+
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+import gvar as gv
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.util.gvar import is_uncorrelated
+
+
+def test_01_detect_correlations():
+    """Checks that correlated and uncorrelated gvars are identified."""
+    correlated = gv.gvar([0, 0], [[1, 0.5], [0.5, 1]])
+    uncorrelated = gv.gvar([0, 0, 0], [1, 2, 3])
+
+    assert is_uncorrelated(uncorrelated)
+    assert is_uncorrelated(gv.BufferDict(a=uncorrelated, b=2 * gv.gvar(1, 1)))
+    assert is_uncorrelated([uncorrelated[0] + uncorrelated[1], uncorrelated[2]])
+    assert not is_uncorrelated(correlated)
+    assert not is_uncorrelated(gv.BufferDict(a=uncorrelated, b=uncorrelated[0]))
+    assert not is_uncorrelated([uncorrelated[0] + uncorrelated[1], uncorrelated[1]])
+
+
+def test_02_gui_rejects_correlated_priors():
+    """Checks that the GUI raises an error for correlated priors."""
+    fit = generate_fit(n_poly=2)
+    fit.prior["a1"] = fit.prior["a0"] + gv.gvar(0, 1)
+    with pytest.raises(NotImplementedError):
+        FitGUI(fit)
+
+
+def test_03_large_prior_check_scales_linearly(record_property):
+    """Checks and reports time and peak memory for large priors.
+
+    The report is printed (see ``pytest -rP``) and recorded as test properties.
+    """
+    n_entries = 50000
+    prior = gv.BufferDict(
+        {
+            f"key{n}": gv.gvar(np.zeros(1000), np.ones(1000))
+            for n in range(n_entries // 1000)
+        }
+    )
+
+    tracemalloc.start()
+    start = perf_counter()
+    assert is_uncorrelated(prior)
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    dense_memory = 8 * n_entries**2
+    report = (
+        f"Correlation check of {n_entries} prior entries:"
+        f" {elapsed:.3f}s, peak memory {peak / 1024 ** 2:.1f}MB"
+        f" (dense correlation matrix: {dense_memory / 1024 ** 3:.1f}GB)"
+    )
+    print(report)
+    record_property("elapsed", elapsed)
+    record_property("peak_memory", peak)
+    assert peak < dense_memory / 1000, report
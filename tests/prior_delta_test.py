@@ -0,0 +1,170 @@
+"""Tests for sending only changed prior inputs."""
+import json
+from time import sleep
+
+import numpy as np
+import pytest
+from dash import no_update
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.sidebar import (
+    get_flat_prior,
+    get_prior_from_flat,
+    get_prior_index,
+    get_prior_structure,
+)
+from lsqfitgui.frontend.widgets.prior_delta import apply_prior_delta, get_prior_sync
+from lsqfitgui.util.synthetic import make_synthetic_fit
+
+UPDATE_LAYOUT_OUTPUT = (
+    "..sticky-sidebar.children"
+    "...prior-sync.data"
+    '...{"name":["ALL"],"type":"fit-content"}.children'
+    '...{"index":["ALL"],"type":"fit-figure"}.figure'
+    "...additional-content.children.."
+)
+
+
+def test_01_apply_delta():
+    """Checks that only known inputs are changed and synced values are collected."""
+    values = {"a-mean": "0", "a-sdev": "1"}
+    ids, vals = apply_prior_delta(values, {"n": 1, "changes": {"a-sdev": "2", "b": 1}})
+    assert ids == [{"type": "prior", "name": "a-mean"}, {"type": "prior", "name": "a-sdev"}]
+    assert vals == ["0", "2"] and values == {"a-mean": "0", "a-sdev": "2"}
+
+    assert get_prior_sync(["a-mean", "a-sdev"], [no_update, no_update]) is no_update
+    assert get_prior_sync(["a-mean", "a-sdev"], ["1", "2"]) == {
+        "values": {"a-mean": "1", "a-sdev": "2"}
+    }
+
+
+def test_02_delta_refits_once():
+    """Checks that changes are applied to the current prior inputs once per delta."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), delta_priors=True)
+    delta = {"n": 1, "changes": {"a1-sdev": "5"}}
+
+    sidebar, sync, content, figures, _ = gui._update_layout_delta_callback(delta, [])
+    assert sidebar is no_update and sync is no_update
+    assert content[1] == str(gui.fit) and len(figures) == len(gui.plots)
+    assert gui.fit.prior["a1"].sdev == 5 and gui.fit.prior["a0"].sdev == 1
+
+    update = gui._update_layout_delta_callback(delta, [])
+    assert update[2] == [no_update] * 3
+
+
+def test_03_meta_change_syncs_prior_inputs():
+    """Checks that meta changes update the prior inputs through the sync store."""
+    gui = FitGUI(
+        fit_setup_function=make_synthetic_fit,
+        fit_setup_kwargs={"n_params": 2, "prior_width": 2},
+        meta_config=[{"name": "prior_width", "type": "number", "min": 1, "step": 1}],
+        delta_priors=True,
+    )
+    sidebar, sync, *_ = gui._update_layout_delta_callback(None, [3])
+    assert sidebar is no_update
+    assert sync["values"] == {
+        f"c{n}-{kind}": val
+        for n in range(2)
+        for kind, val in (("mean", "0.0"), ("sdev", "3.0"))
+    }
+
+    delta = {"n": 1, "changes": {"c1-sdev": "4"}}
+    gui._update_layout_delta_callback(delta, [3])
+    assert gui.fit.prior["c0"].sdev == 3 and gui.fit.prior["c1"].sdev == 4
+
+
+def test_04_request_only_contains_changes():
+    """Checks that the server accepts requests which only contain changed inputs."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), delta_priors=True)
+    gui.setup_app()
+    assert "prior-delta" in str(gui.app.layout)
+    assert any(
+        "trackPriorChanges" in str(callback.get("clientside_function"))
+        for callback in gui.app._callback_list
+    )
+
+    client = gui.app.server.test_client()
+    response = client.post(
+        "/_dash-update-component",
+        json={
+            "output": UPDATE_LAYOUT_OUTPUT,
+            "outputs": [
+                {"id": "sticky-sidebar", "property": "children"},
+                {"id": "prior-sync", "property": "data"},
+                [
+                    {"id": {"type": "fit-content", "name": name}, "property": "children"}
+                    for name in ("documentation", "summary", "details")
+                ],
+                [
+                    {"id": {"type": "fit-figure", "index": n}, "property": "figure"}
+                    for n in range(2)
+                ],
+                {"id": "additional-content", "property": "children"},
+            ],
+            "inputs": [
+                {
+                    "id": "prior-delta",
+                    "property": "data",
+                    "value": {"n": 1, "changes": {"a0-mean": "1"}},
+                },
+                [],
+                [],
+            ],
+            "state": [[]],
+            "changedPropIds": ["prior-delta.data"],
+        },
+    )
+    assert response.status_code == 200
+    assert "prior-sync" not in json.loads(response.data)["response"]
+    assert gui.fit.prior["a0"].mean == 1
+
+
+def test_05_flat_prior_parses_changes():
+    """Checks that only changed inputs update the flat prior."""
+    prior = generate_fit(n_poly=2).prior
+    index = get_prior_index(get_prior_structure(prior))
+    flat = get_flat_prior(prior)
+
+    updated = index.update(flat, {"a1-sdev": "5", "unknown": "1"})
+    assert updated is not flat and flat[1, 1] == 2
+    new_prior = get_prior_from_flat(updated, prior)
+    assert new_prior["a1"].sdev == 5 and new_prior["a0"].sdev == 1
+
+    assert np.isnan(index.update(flat, {"a0-mean": "x"})[0, 0])
+    with pytest.raises(ValueError):
+        get_prior_from_flat(index.update(flat, {"a0-mean": "x"}), prior)
+    with pytest.raises(ValueError):
+        get_prior_from_flat(index.update(flat, {"a0-sdev": "0"}), prior)
+
+
+def test_06_delta_update_parses_changes_only(monkeypatch):
+    """Checks that delta updates neither compare nor parse all prior inputs."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), delta_priors=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("All prior inputs were parsed.")
+
+    monkeypatch.setattr("lsqfitgui.frontend.dashboard.parse_priors", fail)
+    monkeypatch.setattr(gui, "_prior_values_old", fail)
+
+    update = gui._update_layout_delta_callback({"n": 1, "changes": {"a0-mean": "0.0"}}, [])
+    assert update[2] == [no_update] * 3
+
+    gui._update_layout_delta_callback({"n": 2, "changes": {"a0-sdev": "4"}}, [])
+    assert gui.fit.prior["a0"].sdev == 4 and gui.fit.prior["a1"].sdev == 2
+
+
+def test_07_background_delta_submits_new_deltas():
+    """Checks that background delta updates submit refits only for new deltas."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), delta_priors=True, background=True)
+    delta = {"n": 1, "changes": {"a1-sdev": "3"}}
+
+    *_, status, disabled = gui._update_layout_background_delta_callback(delta, [], 0)
+    assert status is not None and not disabled
+    while gui._executor.busy:
+        sleep(0.01)
+    *_, status, disabled = gui._update_layout_background_delta_callback(delta, [], 1)
+    assert status is None and disabled
+    assert gui._executor.n_submitted == 1 and gui.fit.prior["a1"].sdev == 3
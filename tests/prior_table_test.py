@@ -0,0 +1,84 @@
+"""Tests for the prior table of large priors."""
+import json
+
+import numpy as np
+import gvar as gv
+
+from dash import no_update
+from plotly.utils import PlotlyJSONEncoder
+
+from lsqfitgui import FitGUI
+from lsqfitgui.frontend.sidebar import get_sidebar
+from lsqfitgui.frontend.widgets.prior_table import (
+    get_prior_rows,
+    get_prior_inputs,
+    get_prior_page,
+    PRIOR_TABLE_THRESHOLD,
+)
+from lsqfitgui.util.synthetic import make_synthetic_fit
+
+PRIOR = gv.BufferDict(a=gv.gvar(np.zeros(250), np.ones(250)), b=gv.gvar(1, 2))
+
+
+def test_01_rows_and_inputs():
+    """Checks that table rows correspond to the prior inputs of the sidebar."""
+    rows = get_prior_rows(PRIOR)
+    assert len(rows) == 251
+    assert rows["a__array_3"] == {"name": "a__array_3", "mean": "0.0", "sdev": "1.0"}
+    assert rows["b"] == {"name": "b", "mean": "1.0", "sdev": "2.0"}
+
+    ids, values = get_prior_inputs(rows)
+    assert ids[:2] == [
+        {"type": "prior", "name": "a__array_0-mean"},
+        {"type": "prior", "name": "a__array_0-sdev"},
+    ]
+    assert values[-2:] == ["1.0", "2.0"]
+
+
+def test_02_pages_and_filters():
+    """Checks pagination and filtering by name patterns."""
+    rows = get_prior_rows(PRIOR)
+    page, count = get_prior_page(rows, 2, 100)
+    assert count == 3 and [row["name"] for row in page[-2:]] == ["a__array_249", "b"]
+
+    page, count = get_prior_page(rows, 0, 100, "array_24")
+    assert count == 1 and len(page) == 11
+    page, _ = get_prior_page(rows, 5, 100, "a__array_1?")
+    assert [row["name"] for row in page] == [f"a__array_1{n}" for n in range(10)]
+
+
+def test_03_sidebar_uses_table_for_large_priors():
+    """Checks that large priors do not mount one input per entry."""
+    small = gv.BufferDict(a=PRIOR["a"][:PRIOR_TABLE_THRESHOLD])
+    assert "a__array_0-mean" in str(get_sidebar(small))
+
+    prior = gv.BufferDict(a=gv.gvar(np.zeros(20000), np.ones(20000)))
+    sidebar = json.dumps(get_sidebar(prior), cls=PlotlyJSONEncoder)
+    assert '"type": "prior-table"' in sidebar and "a__array_0-mean" not in sidebar
+    assert len(sidebar) < 50000
+
+
+def test_04_table_edit_refits():
+    """Checks that edits of the table page refit and keep the table state."""
+    gui = FitGUI(
+        fit=make_synthetic_fit(
+            n_params=25, n_data=30, n_keys=10, shared_params=False, array_prior=True
+        )
+    )
+    assert '"type": "prior-table"' in json.dumps(gui.layout, cls=PlotlyJSONEncoder)
+
+    data, counts = gui._prior_table_callback([0], [100], ["c_d9*"])
+    assert counts == [1] and len(data[0]) == 25
+    data[0][3]["sdev"] = "5"
+
+    update = gui._update_layout_callback([], [], [], [1], data)
+    sidebar, values, content, _, _ = update
+    assert sidebar is no_update and values == []
+    assert content[1] == str(gui.fit)
+    assert gui.fit.prior["c_d9"][3].sdev == 5
+
+    (page,), _ = gui._prior_table_callback([0], [100], ["c_d9*"])
+    assert page[3]["sdev"] == "5"
+    assert gui._update_layout_callback([], [], [], [1], data) == (
+        gui._get_empty_layout_update([])
+    )
@@ -0,0 +1,79 @@
+"""Tests for running the fit setup function in worker processes."""
+
+import pytest
+
+import numpy as np
+import gvar as gv
+
+from example.fit import generate_fit
+from example.lsqfit_multi_fitter_example import make_fitter
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.executor import ProcessFitSetup
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+
+def test_01_fit_from_process_matches_local_fit():
+    """Checks that fits created in worker processes match local fits."""
+    fit_setup = ProcessFitSetup(generate_fit, max_workers=2)
+    try:
+        fit = fit_setup(n_poly=3)
+    finally:
+        fit_setup.shutdown()
+    expected = generate_fit(n_poly=3)
+
+    assert fit.meta == {"n_poly": 3}
+    assert np.allclose(gv.mean(fit.p.buf), gv.mean(expected.p.buf))
+    assert np.allclose(gv.sdev(fit.p.buf), gv.sdev(expected.p.buf))
+    assert np.allclose(
+        gv.mean(fit.fcn(fit.x, fit.p)), gv.mean(expected.fcn(fit.x, fit.p))
+    )
+
+
+def test_02_unpicklable_fit_function_raises():
+    """Checks that fits with fit functions which cannot be pickled are rejected."""
+    fit_setup = ProcessFitSetup(_generate_lambda_fit, max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            fit_setup()
+    finally:
+        fit_setup.shutdown()
+
+
+def _generate_lambda_fit():
+    fit = generate_fit(n_poly=1)
+    fit.fcn = lambda x, p: p["a0"] + 0 * x
+    return fit
+
+
+@pytest.mark.parametrize(
+    "kwargs, prior_size",
+    [
+        (
+            dict(
+                fit_setup_function=generate_fit,
+                fit_setup_kwargs={"n_poly": 2},
+                meta_config=META_CONFIG,
+            ),
+            3,
+        ),
+        (
+            dict(
+                fit_setup_function=make_fitter,
+                fit_setup_kwargs={"n": 1},
+                meta_config=[{"name": "n", "type": "number"}],
+            ),
+            5,
+        ),
+    ],
+)
+def test_03_gui_meta_update_in_process(kwargs, prior_size):
+    """Checks that meta changes in the GUI run the setup function in a process."""
+    gui = FitGUI(fit_setup_processes=1, **kwargs)
+    try:
+        gui._update_layout_callback([], [], [3])
+        assert isinstance(gui._fit_setup_function, ProcessFitSetup)
+        assert len(gui.fit.prior) == prior_size
+    finally:
+        gui._fit_setup_function.shutdown()
@@ -0,0 +1,90 @@
+"""Tests for parsing sidebar prior values into fits."""
+
+import pytest
+
+from time import perf_counter
+
+import numpy as np
+import gvar as gv
+
+from example.lsqfit_stability_example import generate_fit
+
+from lsqfitgui.backend.sidebar import process_priors, parse_priors
+from lsqfitgui.util.gvar import flatten_gvars
+
+
+@pytest.fixture(scope="module")
+def stability_fit():
+    """Provide the fit of the stability example."""
+    return generate_fit()
+
+
+def get_prior_flat(prior, mean_scale=1.0, sdev_scale=1.0):
+    """Convert prior into sidebar form values."""
+    prior_flat = {}
+    for key, val in flatten_gvars(prior).items():
+        prior_flat[f"{key}-mean"] = str(val.mean * mean_scale)
+        prior_flat[f"{key}-sdev"] = str(val.sdev * sdev_scale)
+    return prior_flat
+
+
+@pytest.mark.parametrize("sdev_scale", [1.0, 1.1])
+def test_01_warm_start_matches_cold_start(stability_fit, sdev_scale):
+    """Checks that warm started refits converge faster to the same posterior."""
+    prior_flat = get_prior_flat(
+        stability_fit.prior, mean_scale=1.01, sdev_scale=sdev_scale
+    )
+    cold_fit = process_priors(prior_flat, stability_fit)
+    warm_fit = process_priors(prior_flat, stability_fit, warm_start=True)
+
+    assert warm_fit.nit < cold_fit.nit
+    assert np.allclose(gv.sdev(warm_fit.prior.buf), gv.sdev(cold_fit.prior.buf))
+    assert np.allclose(
+        gv.mean(warm_fit.p.buf), gv.mean(cold_fit.p.buf), atol=0, rtol=1e-4
+    )
+    assert np.allclose(gv.sdev(warm_fit.p.buf), gv.sdev(cold_fit.p.buf), rtol=1e-3)
+
+
+def test_02_negative_sdev_raises(stability_fit):
+    """Checks that non-positive standard deviations are rejected."""
+    prior_flat = get_prior_flat(stability_fit.prior, sdev_scale=-1)
+    with pytest.raises(ValueError):
+        process_priors(prior_flat, stability_fit, warm_start=True)
+
+
+def test_03_parse_priors_round_trip(stability_fit):
+    """Checks that parsing form values reproduces the prior."""
+    prior = parse_priors(get_prior_flat(stability_fit.prior), stability_fit.prior)
+
+    assert list(prior.keys()) == list(stability_fit.prior.keys())
+    assert np.allclose(gv.mean(prior.buf), gv.mean(stability_fit.prior.buf))
+    assert np.allclose(gv.sdev(prior.buf), gv.sdev(stability_fit.prior.buf))
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"t_min=0, t_max=8, n_exp=2, key=a__array_0-sdev": "0"},
+        {"t_min=0, t_max=8, n_exp=2, key=a__array_0-mean": None},
+        {"unknown-mean": "1"},
+    ],
+)
+def test_04_parse_priors_rejects_invalid_values(stability_fit, update):
+    """Checks that invalid form values raise value errors."""
+    prior_flat = get_prior_flat(stability_fit.prior)
+    prior_flat.update(update)
+    with pytest.raises(ValueError):
+        parse_priors(prior_flat, stability_fit.prior)
+
+
+def test_05_parse_large_priors():
+    """Checks that parsing large array valued priors does not scale quadratically."""
+    prior = gv.BufferDict(
+        {f"key{n}": gv.gvar(np.zeros(1000), np.ones(1000)) for n in range(20)}
+    )
+    prior_flat = get_prior_flat(prior, sdev_scale=2.0)
+
+    start = perf_counter()
+    parsed = parse_priors(prior_flat, prior)
+    assert perf_counter() - start < 1.0
+    assert np.allclose(gv.sdev(parsed.buf), 2.0)
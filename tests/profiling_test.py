@@ -0,0 +1,57 @@
+"""Tests for profiling layout updates."""
+import pstats
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+
+
+def get_prior_inputs(width):
+    """Return prior ids and values for the prior widths."""
+    ids = [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(2)
+        for kind in ("mean", "sdev")
+    ]
+    return ids, ["0", str(width), "0", str(width)]
+
+
+def test_01_profile_next_updates(tmp_path):
+    """Checks that only armed updates are profiled and stats can be downloaded."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), profiler=True)
+    gui._update_layout_callback(*get_prior_inputs(1), [])
+    assert not gui.profiler.has_stats
+
+    is_open, status, table, download, disabled = gui._profiler_callback(
+        1, True, 2, 0, None, False
+    )
+    assert (
+        is_open and not disabled and status == "0 update(s) profiled, profiling next 2"
+    )
+
+    for width in (2, 3, 4):
+        gui._update_layout_callback(*get_prior_inputs(width), [])
+    assert gui.profiler.n_profiled == 2 and gui.profiler.remaining == 0
+
+    is_open, status, table, download, disabled = gui._profiler_callback(
+        1, True, 2, 1, None, True
+    )
+    assert disabled and status == "2 update(s) profiled"
+    assert len(table.children[1].children) == 20
+    functions = [row["function"] for row in gui.profiler.get_top_functions()]
+    assert any("update_layout_from_prior" in function for function in functions)
+    assert download["filename"] == "lsqfitgui.prof"
+
+    path = tmp_path / "stats.prof"
+    path.write_bytes(gui.profiler.dump())
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "_update_layout_timed" for func in stats.stats)
+
+
+def test_02_profile_initial_updates():
+    """Checks that profile calls arm the profiler from the start."""
+    gui = FitGUI(fit=generate_fit(n_poly=2), profile_calls=1)
+    gui._update_layout_callback(*get_prior_inputs(2), [])
+    gui._update_layout_callback(*get_prior_inputs(3), [])
+    assert gui.profiler.n_profiled == 1
+    assert gui.profiler.get_top_functions(n=3)[0]["cumtime"] > 0
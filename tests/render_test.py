@@ -0,0 +1,107 @@
+"""Tests for the headless render command."""
+import os
+import json
+
+import gvar as gv
+from click.testing import CliRunner
+
+from example.fit import generate_fit
+
+from lsqfitgui.backend.store import save_fit_store
+from lsqfitgui.scripts.entrypoint import main
+from lsqfitgui.scripts.render import render_files
+
+PLOTS_SCRIPT = '''
+from lsqfitgui import plot_gvar
+
+PLOTS = [
+    {"name": "Posterior a0", "fcn": lambda fit: plot_gvar(fit.x, fit.x * fit.p["a0"])}
+]
+'''
+
+
+def test_01_render_files_skips_unchanged(tmp_path):
+    """Checks that outputs are written and unchanged fit files are skipped."""
+    paths = []
+    for n_poly in (2, 3):
+        path = str(tmp_path / f"fit-{n_poly}.p")
+        gv.dump(generate_fit(n_poly=n_poly), path)
+        paths.append(path)
+    save_fit_store(generate_fit(n_poly=4), str(tmp_path / "store"))
+    paths.append(str(tmp_path / "store"))
+
+    plots = tmp_path / "plots.py"
+    plots.write_text(PLOTS_SCRIPT)
+    output = str(tmp_path / "out")
+    kwargs = {"plots": f"{plots}:PLOTS", "processes": 2}
+
+    results = render_files(paths, output, **kwargs)
+    assert [result["status"] for result in results] == ["rendered"] * 3
+
+    with open(os.path.join(output, "fit-2", "summary.json")) as inp:
+        summary = json.load(inp)
+    assert [fig["label"] for fig in summary["figures"]] == [
+        "Fit",
+        "Residuals",
+        "Posterior a0",
+    ]
+    for name in ["fit.json", "fit.html", "posterior-a0.json", "summary.txt"]:
+        assert os.path.exists(os.path.join(output, "fit-2", name))
+    assert os.path.exists(os.path.join(output, "store", "residuals.html"))
+
+    gv.dump(generate_fit(n_poly=5), paths[0])
+    results = render_files(paths, output, **kwargs)
+    assert [result["status"] for result in results] == [
+        "rendered",
+        "skipped",
+        "skipped",
+    ]
+
+
+def test_02_render_command(tmp_path):
+    """Checks the render command and that failures set the exit code."""
+    path = str(tmp_path / "fit.p")
+    gv.dump(generate_fit(n_poly=2), path)
+    output = str(tmp_path / "out")
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["render", path, "-o", output, "--format", "json"])
+    assert result.exit_code == 0, result.output
+    assert "rendered" in result.output
+    assert os.path.exists(os.path.join(output, "fit", "fit.json"))
+    assert not os.path.exists(os.path.join(output, "fit", "fit.html"))
+
+    result = runner.invoke(main, ["render", str(tmp_path / "missing.p"), "-o", output])
+    assert result.exit_code == 1
+    assert "failed" in result.output
+
+
+def test_03_unique_outputs_and_script_hash(tmp_path):
+    """Checks unique directories and figure names and that script changes rerender."""
+    paths = []
+    for name in ("a", "b"):
+        os.makedirs(tmp_path / name)
+        paths.append(str(tmp_path / name / "fit.p"))
+        gv.dump(generate_fit(n_poly=2), paths[-1])
+
+    plots = tmp_path / "plots.py"
+    plots.write_text(PLOTS_SCRIPT.replace('"Posterior a0"', '"Fit"'))
+    output = str(tmp_path / "out")
+    kwargs = {"plots": f"{plots}:PLOTS", "processes": 2}
+
+    results = render_files(paths + paths[:1], output, **kwargs)
+    assert [result["status"] for result in results] == ["rendered"] * 2
+    assert len({result["output"] for result in results}) == 2
+    with open(os.path.join(results[0]["output"], "summary.json")) as inp:
+        summary = json.load(inp)
+    assert [fig["files"][0] for fig in summary["figures"]] == [
+        "fit.json",
+        "residuals.json",
+        "fit-2.json",
+    ]
+
+    results = render_files(paths, output, **kwargs)
+    assert [result["status"] for result in results] == ["skipped"] * 2
+    plots.write_text(PLOTS_SCRIPT)
+    results = render_files(paths, output, **kwargs)
+    assert [result["status"] for result in results] == ["rendered"] * 2
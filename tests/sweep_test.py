@@ -0,0 +1,94 @@
+"""Tests for sweeping fits over the meta grid."""
+import pytest
+
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.sweep import MetaSweep, get_meta_grid, get_meta_values
+
+META_CONFIG = [
+    {"name": "n_poly", "type": "number", "min": 1, "max": 4, "step": 1},
+]
+
+
+def test_01_meta_grid():
+    """Checks that the grid contains all combinations of options and ranges."""
+    assert get_meta_values({"min": 0.1, "max": 0.3, "step": 0.1}) == [0.1, 0.2, 0.3]
+    assert get_meta_values({"type": "number"}, 2) == [2]
+
+    grid = get_meta_grid(
+        META_CONFIG
+        + [{"name": "kind", "options": [{"label": "A", "value": "a"}, "b"]}],
+        {"n_poly": 2, "kind": "a", "other": 0},
+    )
+    assert len(grid) == 8
+    assert grid[0] == {"n_poly": 1, "kind": "a", "other": 0}
+    assert grid[-1] == {"n_poly": 4, "kind": "b", "other": 0}
+
+
+def test_02_sweep_stores_results_and_restores_from_file(tmp_path):
+    """Checks progress reporting and that dumped sweeps are not recomputed."""
+    progress = []
+    sweep = MetaSweep(generate_fit, META_CONFIG)
+    sweep.start({"n_poly": 2}, callback=lambda *args: progress.append(args))
+    sweep.wait()
+
+    assert not sweep.running and sweep.progress == 1.0
+    assert sorted(progress) == [(n, 4) for n in range(1, 5)]
+    assert len(sweep.results) == 4
+    assert len(sweep.get({"n_poly": 3}).prior) == 3
+    assert sweep.get({"n_poly": 5}) is None
+
+    sweep.dump(str(tmp_path / "sweep.p"))
+    sweep.shutdown()
+
+    restored = MetaSweep(generate_fit, META_CONFIG)
+    restored.load(str(tmp_path / "sweep.p"))
+    assert restored.start({"n_poly": 2}) == []
+    assert restored.n_done == 4
+    restored.shutdown()
+
+
+def test_03_gui_meta_update_after_sweep_is_lookup(tmp_path):
+    """Checks that selecting a grid point after a sweep does not refit."""
+    sweep_file = tmp_path / "sweep.p"
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        sweep=True,
+        sweep_processes=2,
+        sweep_file=str(sweep_file),
+    )
+    gui.run_sweep(wait=True)
+    assert gui.meta_sweep.n_failed == 0
+    assert sweep_file.exists()
+
+    value, label, interval_disabled, button_disabled = gui._sweep_callback(0, 1)
+    assert value == 100 and label == "4/4"
+    assert interval_disabled and not button_disabled
+
+    gui._update_layout_callback([], [], [4])
+    assert len(gui.fit.prior) == 4
+    assert gui.fit is gui.meta_sweep.get({"n_poly": 4})
+    assert gui.fit_cache is None
+    gui.meta_sweep.shutdown()
+
+
+def test_04_load_checks_fit_setup_function(tmp_path):
+    """Checks that fits of a different fit setup function are not loaded."""
+
+    def other_fit(**kwargs):
+        return generate_fit(**kwargs)
+
+    sweep = MetaSweep(generate_fit, META_CONFIG)
+    sweep.start({"n_poly": 2})
+    sweep.wait()
+    sweep.dump(str(tmp_path / "sweep.p"))
+    sweep.shutdown()
+
+    other = MetaSweep(other_fit, META_CONFIG)
+    with pytest.raises(ValueError):
+        other.load(str(tmp_path / "sweep.p"))
+    assert other.results == {}
+    other.shutdown()
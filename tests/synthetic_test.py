@@ -0,0 +1,60 @@
+"""Tests for the synthetic fit generators."""
+import pytest
+
+import numpy as np
+import gvar as gv
+
+from lsqfitgui import FitGUI
+from lsqfitgui.backend.blocks import get_fit_blocks
+from lsqfitgui.util.models import MultiFitterFit
+from lsqfitgui.util.synthetic import (
+    make_synthetic_data,
+    make_synthetic_fit,
+    make_synthetic_multi_fitter_fit,
+)
+
+
+def test_01_reproducible_data():
+    """Checks sizes and that data only depend on the arguments."""
+    x, y, prior, fcn = make_synthetic_data(n_params=4, n_data=10, n_keys=3, seed=1)
+    _, y2, _, _ = make_synthetic_data(n_params=4, n_data=10, n_keys=3, seed=1)
+
+    assert list(y.keys()) == ["d0", "d1", "d2"] and y.size == 30
+    assert list(prior.keys()) == ["c0", "c1", "c2", "c3"]
+    assert np.array_equal(gv.mean(y.buf), gv.mean(y2.buf))
+    assert set(fcn(x, prior).keys()) == set(y.keys())
+
+
+@pytest.mark.parametrize("structure", ["none", "key", "global"])
+def test_02_correlation_structure(structure):
+    """Checks that data keys are only correlated for global correlations."""
+    _, y, _, _ = make_synthetic_data(
+        n_data=5, n_keys=2, correlation=0.5, correlation_structure=structure
+    )
+    corr = gv.evalcorr(y.buf)
+    assert np.isclose(corr[0, 1], 0 if structure == "none" else 0.5)
+    assert np.isclose(corr[4, 5], 0.5 if structure == "global" else 0)
+
+
+def test_03_array_prior_and_blocks():
+    """Checks array-valued priors and that unshared coefficients decompose."""
+    fit = make_synthetic_fit(
+        n_params=3, n_data=10, n_keys=3, shared_params=False, array_prior=True
+    )
+    assert fit.meta["n_keys"] == 3
+    assert list(fit.prior.keys()) == ["c_d0", "c_d1", "c_d2"]
+    assert fit.prior["c_d0"].shape == (3,)
+    assert len(get_fit_blocks(fit)) == 3
+
+
+@pytest.mark.parametrize("chained", [False, True])
+def test_04_multi_fitter_fit(chained):
+    """Checks that MultiFitter fits match the direct fit and open in the GUI."""
+    kwargs = {"n_params": 3, "n_data": 10, "n_keys": 2}
+    multi_fit = make_synthetic_multi_fitter_fit(chained=chained, **kwargs)
+    gui = FitGUI(multi_fit)
+    assert isinstance(gui.fit, MultiFitterFit)
+
+    if not chained:
+        fit = make_synthetic_fit(**kwargs)
+        assert np.allclose(gv.mean(gui.fit.p.buf), gv.mean(fit.p.buf), atol=1e-6)
@@ -0,0 +1,57 @@
+"""Tests for timing the stages of layout updates."""
+from example.fit import generate_fit
+
+from lsqfitgui import FitGUI
+from lsqfitgui.util.timing import StageTimer
+
+META_CONFIG = [{"name": "n_poly", "type": "number", "min": 1, "max": 10, "step": 1}]
+
+
+def test_01_stage_timer_percentiles():
+    """Checks that updates sum up stages and percentiles use the rolling history."""
+    timer = StageTimer(history=3)
+    for seconds in [1.0, 2.0, 3.0, 4.0]:
+        timer.start_update()
+        timer.record("refit", seconds)
+        timer.record("refit", seconds)
+        timer.finish_update()
+
+    (stats,) = timer.get_stats()
+    assert stats["stage"] == "refit" and stats["latest"] == 8.0
+    assert stats["count"] == 3 and stats["p50"] == 6.0
+    assert 6.0 < stats["p95"] < 8.0
+
+    totals = timer.get_totals()
+    assert totals == {"refit": [8, 20.0]}
+    totals["refit"][0] = 0
+    assert timer.totals["refit"][0] == 8
+
+
+def test_02_gui_records_stages():
+    """Checks that prior and meta updates record their stages."""
+    gui = FitGUI(
+        fit_setup_function=generate_fit,
+        fit_setup_kwargs={"n_poly": 2},
+        meta_config=META_CONFIG,
+        timing=True,
+    )
+    prior_ids = [
+        {"type": "prior", "name": f"a{n}-{kind}"}
+        for n in range(2)
+        for kind in ("mean", "sdev")
+    ]
+    gui._update_layout_callback(prior_ids, ["0", "2", "0", "3"], [2])
+    assert {"parse priors", "refit", "figures", "fit format", "total"}.issubset(
+        gui.timer.latest
+    )
+    assert "layout serialization (estimate)" in gui.timer.latest
+
+    gui._update_layout_callback(prior_ids, ["0", "2", "0", "3"], [3])
+    assert "fit setup" in gui.timer.latest and "refit" not in gui.timer.latest
+
+    is_open, table, interval_disabled = gui._timing_callback(1, None, False)
+    assert is_open and not interval_disabled
+    assert "fit setup" in str(table)
+
+    stats = {row["stage"]: row for row in gui.timer.get_stats()}
+    assert stats["total"]["count"] == 2 and stats["refit"]["count"] == 1